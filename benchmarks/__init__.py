@@ -0,0 +1,3 @@
+"""
+效能量測腳本集合，以 `python -m benchmarks.<name>` 執行。
+"""
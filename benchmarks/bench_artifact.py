@@ -0,0 +1,91 @@
+"""
+比較 joblib 與精簡格式模型的冷啟動載入時間與常駐記憶體增量。
+
+每種格式皆於獨立子程序量測，先匯入相依套件再計時載入，避免匯入成本混入結果。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import PROJECT_ROOT, best_of, load_corpus
+from src.spam_email.artifact import CompactPredictor
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+_PROBE = """
+import gc, json, os, sys, time
+sys.path.insert(0, {root!r})
+def rss_kb():
+    # Linux 上讀取目前常駐記憶體；其他平台以峰值近似
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+import joblib, numpy, sklearn.pipeline, sklearn.feature_extraction.text, sklearn.linear_model
+from src.spam_email.artifact import CompactPredictor
+gc.collect()
+before = rss_kb()
+start = time.perf_counter()
+model = {loader}
+elapsed = time.perf_counter() - start
+model.predict(["warm up"])
+gc.collect()
+after = rss_kb()
+print(json.dumps({{"load_ms": elapsed * 1e3, "rss_kb": after - before}}))
+"""
+
+
+def _probe(loader: str) -> dict:
+    code = _PROBE.format(root=str(PROJECT_ROOT), loader=loader)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _disk_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*")) if path.is_dir() else path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="每種格式的子程序量測次數。")
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(frame)
+    texts = frame["text"].tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib_path = classifier.save(Path(tmp) / "model.joblib")
+        compact_path = classifier.export_compact(Path(tmp) / "model.compact")
+        loaders = {
+            "joblib": f"joblib.load({str(joblib_path)!r})",
+            "compact": f"CompactPredictor.load({str(compact_path)!r})",
+        }
+        paths = {"joblib": joblib_path, "compact": compact_path}
+
+        compact = CompactPredictor.load(compact_path)
+        print(f"{'format':>8} {'disk (KB)':>10} {'load (ms)':>10} {'rss (KB)':>9} {'msgs/s':>9}")
+        for name, loader in loaders.items():
+            samples = [_probe(loader) for _ in range(args.runs)]
+            predict = classifier.predict if name == "joblib" else compact.predict
+            throughput = len(texts) / best_of(lambda: predict(texts), 3)
+            print(
+                f"{name:>8} {_disk_size(paths[name]) / 1024:>10.1f} "
+                f"{np.median([s['load_ms'] for s in samples]):>10.2f} "
+                f"{np.median([s['rss_kb'] for s in samples]):>9.0f} {throughput:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
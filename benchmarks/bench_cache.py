@@ -0,0 +1,51 @@
+"""
+在不同重複率的流量下比較有無推論快取的吞吐量。
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20_000, help="流量筆數。")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--duplicate-ratios", type=float, nargs="+", default=[0.0, 0.6, 0.8])
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    baseline = SpamClassifier(config=AppConfig())
+    baseline.train(frame)
+    corpus = frame["text"].tolist()
+    rng = np.random.default_rng(42)
+
+    print(f"{'dup ratio':>9} {'no cache/s':>11} {'cache/s':>9} {'hit rate':>9}")
+    for ratio in args.duplicate_ratios:
+        # 以少量「活動」樣板重複出現模擬大量群發郵件
+        campaigns = rng.choice(len(corpus), size=50)
+        unique = [f"{corpus[idx % len(corpus)]} #{idx}" for idx in range(args.size)]
+        is_dup = rng.random(args.size) < ratio
+        traffic = [
+            corpus[campaigns[rng.integers(len(campaigns))]] if dup else text
+            for dup, text in zip(is_dup, unique)
+        ]
+        batches = [traffic[i : i + args.batch_size] for i in range(0, len(traffic), args.batch_size)]
+
+        cached = SpamClassifier(config=AppConfig(prediction_cache_size=100_000), pipeline=baseline.pipeline)
+        plain = best_of(lambda: [baseline.predict(batch) for batch in batches], 1)
+        with_cache = best_of(lambda: [cached.predict(batch) for batch in batches], 1)
+        print(
+            f"{ratio:>9.1f} {len(traffic) / plain:>11.0f} {len(traffic) / with_cache:>9.0f} "
+            f"{cached.cache.hit_rate:>9.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
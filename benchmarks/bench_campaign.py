@@ -0,0 +1,79 @@
+"""
+在以樣板大量變造的行銷活動流量上，比較逐封推論與近似重複群集推論的吞吐量、
+模型推論次數與結果一致率。
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.campaign import CampaignIndex
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+NAMES = ("John", "Alice", "Mohammed", "Yuki", "Carla", "Wei", "Priya", "Tom")
+
+
+def campaign_feed(frame, size: int, templates: int, unique_share: float, seed: int = 0) -> list[str]:
+    """
+    以 `templates` 封郵件為樣板產生個人化變體（插入收件者名稱、替換數字與網址），
+    並混入 `unique_share` 比例的一般郵件。
+    """
+    rng = np.random.default_rng(seed)
+    texts = frame["text"].tolist()
+    bases = [texts[idx] for idx in rng.choice(len(texts), size=templates, replace=False)]
+    feed = []
+    for _ in range(size):
+        if rng.random() < unique_share:
+            feed.append(texts[int(rng.integers(len(texts)))])
+            continue
+        base = bases[int(rng.integers(templates))]
+        name = NAMES[int(rng.integers(len(NAMES)))]
+        feed.append(
+            f"Dear {name}, {base} Ref {int(rng.integers(10**5, 10**6))} "
+            f"http://t.example/{int(rng.integers(10**6))}"
+        )
+    return feed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--templates", type=int, default=200)
+    parser.add_argument("--unique-share", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    feed = campaign_feed(frame, args.size, args.templates, args.unique_share)
+
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(frame)
+    full_labels, _ = classifier.predict(feed)
+    full_seconds = best_of(lambda: classifier.predict(feed), args.repeat)
+
+    config = AppConfig(dedupe_enabled=True)
+
+    def dedupe_run():
+        # 每次重新建立索引，量測冷啟動（不沿用前一輪群集）的成本
+        classifier.campaigns = CampaignIndex.from_config(config)
+        return classifier.predict(feed)
+
+    dedupe_seconds = best_of(dedupe_run, args.repeat)
+    labels, _ = dedupe_run()
+    stats = classifier.campaigns.stats()
+
+    print(f"{'mode':>8} {'msgs/s':>9} {'speedup':>8} {'model calls':>12} {'campaigns':>10} {'agreement':>10}")
+    print(f"{'full':>8} {len(feed) / full_seconds:>9.0f} {1.0:>7.2f}x {len(feed):>12} {'-':>10} {1.0:>10.4f}")
+    print(
+        f"{'dedupe':>8} {len(feed) / dedupe_seconds:>9.0f} {full_seconds / dedupe_seconds:>7.2f}x "
+        f"{stats['scored']:>12} {stats['campaigns']:>10} {np.mean(labels == full_labels):>10.4f}"
+    )
+    print("largest campaigns:", ", ".join(f"{cid}:{size}" for cid, size in classifier.campaigns.largest(5)))
+
+
+if __name__ == "__main__":
+    main()
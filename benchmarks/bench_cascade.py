@@ -0,0 +1,51 @@
+"""
+比較完整模型與兩階段串接的吞吐量、提前輸出比例與準確率差異。
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--bands", type=float, nargs="+", default=[0.02, 0.05, 0.1], help="低信心門檻，高門檻取 1 - low。")
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    train, test = train_test_split(frame, test_size=0.2, random_state=42, stratify=frame["label"])
+    texts = test["text"].tolist()
+    truth = test["label"].astype(str).to_numpy()
+    batch = (texts * (args.batch_size // len(texts) + 1))[: args.batch_size]
+
+    full = SpamClassifier(config=AppConfig())
+    full.train(train)
+    full_labels, _ = full.predict(texts)
+    full_seconds = best_of(lambda: full.predict(batch), args.repeat)
+    print(f"{'mode':>14} {'msgs/s':>9} {'speedup':>8} {'early exit':>11} {'accuracy':>9} {'agreement':>10}")
+    print(f"{'full':>14} {len(batch) / full_seconds:>9.0f} {1.0:>7.2f}x {0.0:>11.1%} {np.mean(full_labels == truth):>9.4f} {1.0:>10.4f}")
+
+    for low in args.bands:
+        cascade = SpamClassifier(config=AppConfig(cascade_enabled=True, cascade_low=low, cascade_high=1 - low))
+        cascade.train(train)
+        cascade.cascade.stats.reset()
+        labels, _ = cascade.predict(texts)
+        exit_rate = cascade.cascade.stats.early_exit_rate
+        seconds = best_of(lambda: cascade.predict(batch), args.repeat)
+        print(
+            f"{f'cascade {low:g}':>14} {len(batch) / seconds:>9.0f} {full_seconds / seconds:>7.2f}x "
+            f"{exit_rate:>11.1%} {np.mean(labels == truth):>9.4f} {np.mean(labels == full_labels):>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+量測漂移監控的推論額外成本（不同抽樣比例），並比較同分布、僅正常郵件與行銷活動流量的漂移分數。
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sklearn.model_selection import train_test_split
+
+from benchmarks.bench_campaign import campaign_feed
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    train, live = train_test_split(frame, test_size=0.3, random_state=1, stratify=frame["label"])
+    config = AppConfig(drift_enabled=True, drift_window=2**62)
+    classifier = SpamClassifier(config=config)
+    classifier.train(train)
+
+    traffic = load_corpus(args.size)["text"].tolist()
+
+    def run() -> None:
+        for start in range(0, len(traffic), args.batch_size):
+            classifier.predict(traffic[start : start + args.batch_size])
+
+    print(f"{'sample':>8} {'msgs/s':>9} {'overhead':>9}")
+    baseline_seconds = None
+    for enabled, rate in ((False, 1.0), (True, 1.0), (True, 0.25), (True, 0.05)):
+        config.drift_enabled, config.drift_sample_rate = enabled, rate
+        classifier._attach_monitor()
+        seconds = best_of(run, args.repeat)
+        baseline_seconds = baseline_seconds or seconds
+        label = f"{rate:.2f}" if enabled else "off"
+        print(f"{label:>8} {len(traffic) / seconds:>9.0f} {seconds / baseline_seconds - 1:>8.1%}")
+
+    config.drift_enabled, config.drift_sample_rate = True, 1.0
+    scenarios = {
+        "holdout": live["text"].tolist(),
+        "ham-only": live.loc[live["label"] == "ham", "text"].tolist(),
+        "campaign": campaign_feed(frame, len(live), 30, 0.1),
+    }
+    print(f"\n{'traffic':>10} {'prob PSI':>9} {'feat PSI':>9} {'OOV':>7} {'drifted':>8}")
+    for name, texts in scenarios.items():
+        classifier._attach_monitor()
+        classifier.predict(texts)
+        report = classifier.monitor.evaluate()
+        print(
+            f"{name:>10} {report.probability_psi:>9.3f} {report.feature_psi:>9.3f} "
+            f"{report.oov_rate:>7.1%} {str(report.drifted):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+比較 TF-IDF 與雜湊特徵引擎的準確率、訓練時間、推論吞吐量與模型檔大小。
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=None, help="訓練語料筆數，預設為完整資料集。")
+    parser.add_argument("--engines", nargs="+", default=["tfidf", "hashing"])
+    parser.add_argument("--n-features", type=int, default=AppConfig().hashing_n_features, help="雜湊特徵維度。")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = load_corpus(args.size)
+    texts = frame["text"].tolist()
+
+    print(f"{'engine':>8} {'accuracy':>9} {'fit (s)':>8} {'msgs/s':>9} {'size (KB)':>10} {'load (ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in args.engines:
+            config = AppConfig(feature_engine=engine, hashing_n_features=args.n_features)
+            classifier = SpamClassifier(config=config)
+
+            start = time.perf_counter()
+            _, report = classifier.train(frame)
+            fit_time = time.perf_counter() - start
+
+            support = sum(report.support.values())
+            accuracy = sum(report.recall[label] * report.support[label] for label in report.labels) / support
+            throughput = len(texts) / best_of(lambda: classifier.predict(texts), args.repeat)
+
+            path = classifier.save(Path(tmp) / f"{engine}.joblib")
+            load_time = best_of(lambda: SpamClassifier(config=config).load(path), args.repeat)
+
+            print(
+                f"{engine:>8} {accuracy:>9.4f} {fit_time:>8.2f} {throughput:>9.0f} "
+                f"{path.stat().st_size / 1024:>10.1f} {load_time * 1e3:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
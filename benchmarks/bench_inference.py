@@ -0,0 +1,43 @@
+"""
+比較舊版「predict + predict_proba」雙重向量化、單次推論路徑與附帶詞項解釋的耗時。
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frame = load_corpus()
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(frame)
+    pipeline = classifier.pipeline
+    texts = frame[classifier.config.text_column].tolist()
+
+    def two_pass(batch):
+        pipeline.predict(batch)
+        pipeline.predict_proba(batch)
+
+    print(f"{'batch':>8} {'two-pass (ms)':>14} {'fused (ms)':>12} {'speedup':>8} {'explain (ms)':>13}")
+    for size in args.batch_sizes:
+        batch = (texts * (size // len(texts) + 1))[:size]
+        baseline = best_of(lambda: two_pass(batch), args.repeat)
+        fused = best_of(lambda: classifier.predict(batch), args.repeat)
+        explained = best_of(lambda: classifier.explain(batch), args.repeat)
+        print(
+            f"{size:>8} {baseline * 1e3:>14.2f} {fused * 1e3:>12.2f} "
+            f"{baseline / fused:>7.2f}x {explained * 1e3:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+比較原始郵件擷取的吞吐量：以 `mailbox` + `email.policy.default` 單執行緒解析的常見寫法，
+對照 `MailIngestor` 的 compat32 解析（單程序與程序池）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import email
+import mailbox
+import tempfile
+from email.generator import BytesGenerator
+from email.message import EmailMessage
+from email.policy import default
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.mail import MailIngestor, html_to_text
+
+
+def write_mbox(path: Path, size: int, seed: int = 0) -> None:
+    """
+    以內建語料產生 multipart/alternative（純文字 + HTML）郵件，部分附帶 PDF 附件。
+    """
+    rng = np.random.default_rng(seed)
+    texts = load_corpus()["text"].tolist()
+    with path.open("wb") as handle:
+        for idx in range(size):
+            body = " ".join(texts[int(rng.integers(len(texts)))] for _ in range(5))
+            message = EmailMessage()
+            message["Subject"] = f"Offer {idx}: {body[:40]}"
+            message["From"] = f"Sender {idx % 50} <sender{idx % 50}@example.com>"
+            message["Message-ID"] = f"<{idx}@bench.example>"
+            message.set_content(body)
+            message.add_alternative(f"<html><body><p>{body}</p></body></html>", subtype="html")
+            if idx % 10 == 0:
+                message.add_attachment(rng.bytes(20_000), maintype="application", subtype="pdf", filename="x.pdf")
+            # 本文中行首的 "From " 依 mbox 慣例跳脫為 ">From "
+            handle.write(b"From bench@example Thu Jan  1 00:00:00 2025\n")
+            BytesGenerator(handle, mangle_from_=True).flatten(message)
+            handle.write(b"\n")
+
+
+def naive_ingest(path: Path) -> int:
+    count = 0
+    factory = lambda handle: email.message_from_binary_file(handle, policy=default)  # noqa: E731
+    for message in mailbox.mbox(str(path), factory=factory):
+        part = message.get_body(preferencelist=("plain", "html"))
+        content = part.get_content() if part is not None else ""
+        if part is not None and part.get_content_subtype() == "html":
+            content = html_to_text(content)
+        _ = (str(message["Subject"]), str(message["From"]), content)
+        count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = Path(workdir) / "bench.mbox"
+        write_mbox(source, args.size)
+        runs = {
+            "naive": lambda: naive_ingest(source),
+            "serial": lambda: sum(map(len, MailIngestor(n_jobs=1).iter_chunks(source))),
+            f"pool{args.jobs}": lambda: sum(map(len, MailIngestor(n_jobs=args.jobs).iter_chunks(source))),
+        }
+        print(f"{'mode':>12} {'msgs/s':>9} {'speedup':>8}")
+        baseline = None
+        for name, run in runs.items():
+            assert run() == args.size
+            seconds = best_of(run, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:>12} {args.size / seconds:>9.0f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
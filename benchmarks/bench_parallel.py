@@ -0,0 +1,45 @@
+"""
+量測多程序平行推論在不同工作程序數下的吞吐量。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import best_of, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def main() -> None:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000, help="推論批次筆數。")
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, 2, 4, cpu_count}))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(load_corpus())
+    texts = load_corpus(args.size)[classifier.config.text_column].tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier.save(Path(tmp) / "model.joblib")
+        print(f"{'jobs':>6} {'msgs/s':>12} {'scaling':>8}")
+        single = None
+        for jobs in args.jobs:
+            if jobs <= 1:
+                elapsed = best_of(lambda: classifier.predict(texts), args.repeat)
+            else:
+                with classifier.parallel_predictor(jobs) as predictor:
+                    predictor.predict(texts[:1000])  # 預熱程序池
+                    elapsed = best_of(lambda: predictor.predict(texts), args.repeat)
+            single = single or elapsed
+            print(f"{jobs:>6} {len(texts) / elapsed:>12.0f} {single / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+以並行 keep-alive 連線壓測推論服務，回報吞吐量與延遲百分位數。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks.common import load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.server import InferenceServer
+
+
+async def _client(port: int, texts, latencies) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for text in texts:
+        body = json.dumps({"text": text}).encode("utf-8")
+        start = time.perf_counter()
+        writer.write(b"POST /predict HTTP/1.1\r\n" + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _run(args) -> None:
+    frame = load_corpus()
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(frame)
+    texts = frame[classifier.config.text_column].tolist()
+
+    server = InferenceServer(
+        classifier=classifier,
+        port=0,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _client(port, texts[idx :: args.clients][: args.requests], latencies)
+            for idx in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    await server.stop()
+
+    ms = np.asarray(latencies) * 1e3
+    print(f"requests={len(ms)} throughput={len(ms) / elapsed:.0f}/s")
+    print(f"p50={np.percentile(ms, 50):.2f}ms p95={np.percentile(ms, 95):.2f}ms p99={np.percentile(ms, 99):.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=50, help="每個連線送出的請求數。")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
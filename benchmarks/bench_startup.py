@@ -0,0 +1,60 @@
+"""
+量測匯入時間與 CLI 單筆推論的端到端啟動耗時。
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import PROJECT_ROOT, load_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def _wall_time(command: list[str], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True, cwd=PROJECT_ROOT)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    classifier = SpamClassifier(config=AppConfig())
+    classifier.train(load_corpus())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib_path = classifier.save(Path(tmp) / "model.joblib")
+        compact_path = classifier.export_compact(Path(tmp) / "model.compact")
+        text = "WIN a brand new car by clicking here!!!"
+        cases = {
+            "python (baseline)": [sys.executable, "-c", "pass"],
+            "import src.spam_email": [sys.executable, "-c", "import src.spam_email"],
+            "import artifact": [sys.executable, "-c", "import src.spam_email.artifact"],
+            "import model": [sys.executable, "-c", "import src.spam_email.model"],
+            "cli predict (joblib)": [
+                sys.executable, "-m", "src.spam_email.cli", "predict", text, "--model", str(joblib_path),
+            ],
+            "cli predict (compact)": [
+                sys.executable, "-m", "src.spam_email.cli", "predict", text, "--model", str(compact_path),
+            ],
+        }
+        print(f"{'case':<24} {'wall (ms)':>10}")
+        for name, command in cases.items():
+            print(f"{name:<24} {_wall_time(command, args.runs) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
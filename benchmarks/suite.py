@@ -0,0 +1,165 @@
+"""
+可重現的效能量測套件：涵蓋資料載入、訓練、各批次大小推論、模型存取與指標計算。
+
+結果輸出為 JSON（吞吐量、延遲百分位數、峰值記憶體），並可與既有基準比較以標示退化。
+
+    python -m benchmarks.suite --sizes 5000 50000 --output bench.json
+    python -m benchmarks.suite --sizes 5000 --baseline bench.json --tolerance 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.common import synthetic_corpus
+from src.spam_email.config import AppConfig
+from src.spam_email.data import DatasetLoader
+from src.spam_email.metrics import MetricsReport
+from src.spam_email.model import SpamClassifier
+
+# 值越大越好的指標；其餘（延遲、記憶體）越小越好
+HIGHER_IS_BETTER = {"throughput"}
+COMPARED_METRICS = ("throughput", "p50_ms", "p95_ms", "peak_memory_kb")
+
+
+def measure(fn: Callable[[], Any], items: int, repeat: int) -> Dict[str, float]:
+    """
+    重複執行並彙整延遲百分位數、吞吐量；另以一次 tracemalloc 執行量測峰值記憶體。
+    """
+    latencies: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.asarray(latencies) * 1e3
+    return {
+        "items": items,
+        "repeat": repeat,
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "throughput": float(items / np.median(latencies)),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def run_suite(size: int, batch_sizes: List[int], repeat: int, workdir: Path) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    frame = synthetic_corpus(size)
+    data_path = workdir / f"corpus_{size}.csv"
+    frame.to_csv(data_path, index=False, header=False)
+
+    config = AppConfig(local_data_path=data_path, model_path=workdir / f"model_{size}.joblib", cache_dir=workdir)
+    loader = DatasetLoader(config=config)
+    results["load"] = measure(lambda: loader.load(data_path), size, repeat)
+
+    classifier = SpamClassifier(config=config)
+    results["train"] = measure(lambda: classifier.train(frame), size, max(1, repeat // 2))
+
+    texts = frame["text"].tolist()
+    for batch_size in batch_sizes:
+        batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+        results[f"predict_batch_{batch_size}"] = measure(lambda: classifier.predict(batch), len(batch), repeat)
+
+    results["save"] = measure(lambda: classifier.save(), 1, repeat)
+    results["model_load"] = measure(lambda: SpamClassifier(config=config).load(), 1, repeat)
+
+    y_true = frame["label"]
+    y_pred, y_prob = classifier.predict(texts)
+    target_names = sorted(y_true.unique())
+    results["metrics_report"] = measure(
+        lambda: MetricsReport.from_predictions(y_true, y_pred, y_prob, target_names),
+        size,
+        repeat,
+    )
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    比較兩份結果，回傳超過容許比例的退化描述。
+    """
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, metrics in stages.items():
+            reference = baseline.get("results", {}).get(size, {}).get(stage)
+            if not reference:
+                continue
+            for name in COMPARED_METRICS:
+                old, new = reference.get(name), metrics.get(name)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                worse = -change if name in HIGHER_IS_BETTER else change
+                if worse > tolerance:
+                    regressions.append(f"[{size}] {stage}.{name}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000], help="合成語料筆數。")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256, 4096])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON 輸出路徑。")
+    parser.add_argument("--baseline", type=Path, default=None, help="用於比較的基準 JSON。")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="容許的退化比例。")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            report["results"][str(size)] = run_suite(size, args.batch_sizes, args.repeat, Path(tmp))
+
+    for size, stages in report["results"].items():
+        print(f"== corpus size {size} ==")
+        print(f"{'stage':<22} {'p50 (ms)':>10} {'p95 (ms)':>10} {'items/s':>12} {'peak (KB)':>10}")
+        for stage, metrics in stages.items():
+            print(
+                f"{stage:<22} {metrics['p50_ms']:>10.2f} {metrics['p95_ms']:>10.2f} "
+                f"{metrics['throughput']:>12.0f} {metrics['peak_memory_kb']:>10.0f}"
+            )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"結果已寫入: {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("偵測到效能退化：")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("未偵測到超過容許範圍的退化。")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,41 @@
 # Copyright 2025.
 """
 垃圾郵件分類共同模組。
+
+子模組採延遲匯入：僅在存取對應名稱時才載入 pandas、scikit-learn 等重量級套件，
+讓只使用精簡推論器的程式維持快速啟動。
 """
 
-from .config import AppConfig  # noqa: F401
-from .data import DatasetLoader  # noqa: F401
-from .model import SpamClassifier  # noqa: F401
-from .metrics import MetricsReport  # noqa: F401
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+_LAZY_EXPORTS = {
+    "AppConfig": ".config",
+    "DatasetLoader": ".data",
+    "SpamClassifier": ".model",
+    "MetricsReport": ".metrics",
+    "CompactPredictor": ".artifact",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+if TYPE_CHECKING:
+    from .artifact import CompactPredictor  # noqa: F401
+    from .config import AppConfig  # noqa: F401
+    from .data import DatasetLoader  # noqa: F401
+    from .metrics import MetricsReport  # noqa: F401
+    from .model import SpamClassifier  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_NAME = "spam-compact"
+FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+
+
+def export_compact(pipeline: Any, directory: Path | str, operating_point: Any = None, cascade: Any = None) -> Path:
+    """
+    將 TF-IDF + 線性模型管線匯出為精簡格式目錄。
+
+    詞彙表以 UTF-8 位元組排序後存成定長陣列，IDF 權重與係數依相同順序重排，
+    所有陣列皆為 `.npy`，載入時可直接記憶體映射。若有操作點，門檻與校正參數寫入 manifest；
+    若有串接，第一階段查表權重以相同方式存成 `stage1_*.npy`，信心區間寫入 manifest。
+    """
+    steps = [step for _, step in pipeline.steps]
+    if len(steps) != 2 or not hasattr(steps[0], "vocabulary_"):
+        raise ValueError("精簡格式僅支援單一 TF-IDF 詞彙表特徵步驟的管線。")
+    vectorizer, clf = steps
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor or vectorizer.strip_accents:
+        raise ValueError("精簡格式僅支援預設斷詞設定的向量化器。")
+    coef = np.asarray(clf.coef_)
+    if coef.shape[0] != 1:
+        raise ValueError("精簡格式僅支援二元分類模型。")
+
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term.encode("utf-8")
+    encoded = terms.astype(bytes)
+    order = np.argsort(encoded, kind="stable")
+
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    np.save(target / "vocabulary.npy", encoded[order])
+    np.save(target / "idf.npy", np.asarray(vectorizer.idf_, dtype=np.float64)[order])
+    np.save(target / "coef.npy", coef[0].astype(np.float64)[order])
+
+    stop_words = vectorizer.get_stop_words()
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "classes": [str(label) for label in clf.classes_],
+        "intercept": float(np.asarray(clf.intercept_)[0]),
+        "lowercase": bool(vectorizer.lowercase),
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "norm": vectorizer.norm,
+        "use_idf": bool(vectorizer.use_idf),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "binary": bool(vectorizer.binary),
+    }
+    if operating_point is not None:
+        manifest["threshold"] = float(operating_point.threshold)
+        manifest["calibration"] = list(operating_point.calibration) if operating_point.calibration else None
+    for name in ("stage1_vocabulary.npy", "stage1_weights.npy"):
+        (target / name).unlink(missing_ok=True)
+    if cascade is not None:
+        prefilter = cascade.prefilter
+        if [str(label) for label in prefilter.classes_] != manifest["classes"]:
+            raise ValueError("串接第一階段的類別與模型不一致。")
+        stage1_terms = np.asarray([term.encode("utf-8") for term in prefilter.weights], dtype=bytes)
+        stage1_order = np.argsort(stage1_terms, kind="stable")
+        np.save(target / "stage1_vocabulary.npy", stage1_terms[stage1_order])
+        stage1_weights = np.fromiter(prefilter.weights.values(), dtype=np.float64, count=len(prefilter.weights))
+        np.save(target / "stage1_weights.npy", stage1_weights[stage1_order])
+        manifest["cascade"] = {"low": cascade.low, "high": cascade.high, "intercept": prefilter.intercept}
+    (target / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return target
+
+
+@dataclass(slots=True)
+class CompactPredictor:
+    """
+    僅供推論的精簡模型，只依賴 NumPy 即可完成斷詞、TF-IDF 與線性評分。
+
+    匯出自串接模型時，`predict` 與 `Cascade.run` 相同：先以第一階段查表評分，
+    只有機率落在 `cascade_band` 區間內的郵件才計算完整的 TF-IDF 分數。
+    """
+
+    classes_: np.ndarray
+    vocabulary: np.ndarray
+    idf: np.ndarray
+    coef: np.ndarray
+    intercept: float
+    token_pattern: "re.Pattern[str]"
+    ngram_range: Tuple[int, int]
+    stop_words: FrozenSet[str]
+    lowercase: bool = True
+    norm: Optional[str] = "l2"
+    use_idf: bool = True
+    sublinear_tf: bool = False
+    binary: bool = False
+    threshold: Optional[float] = None
+    calibration: Optional[Tuple[float, float]] = None
+    stage1_vocabulary: Optional[np.ndarray] = None
+    stage1_weights: Optional[np.ndarray] = None
+    stage1_intercept: float = 0.0
+    cascade_band: Optional[Tuple[float, float]] = None
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "CompactPredictor":
+        """
+        從精簡格式目錄載入；`mmap=True` 時陣列以唯讀記憶體映射共用頁面快取。
+        """
+        source = Path(directory)
+        manifest: Dict[str, Any] = json.loads((source / MANIFEST_FILE).read_text(encoding="utf-8"))
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"不是有效的精簡模型目錄：{source}")
+        if manifest.get("version", 1) > FORMAT_VERSION:
+            raise ValueError(f"精簡模型格式版本 {manifest['version']} 過新，請更新程式。")
+        mmap_mode = "r" if mmap else None
+        cascade = manifest.get("cascade")
+        return cls(
+            classes_=np.asarray(manifest["classes"]),
+            vocabulary=np.load(source / "vocabulary.npy", mmap_mode=mmap_mode),
+            idf=np.load(source / "idf.npy", mmap_mode=mmap_mode),
+            coef=np.load(source / "coef.npy", mmap_mode=mmap_mode),
+            intercept=float(manifest["intercept"]),
+            token_pattern=re.compile(manifest["token_pattern"]),
+            ngram_range=tuple(manifest["ngram_range"]),
+            stop_words=frozenset(manifest["stop_words"]),
+            lowercase=manifest["lowercase"],
+            norm=manifest["norm"],
+            use_idf=manifest["use_idf"],
+            sublinear_tf=manifest["sublinear_tf"],
+            binary=manifest["binary"],
+            threshold=manifest.get("threshold"),
+            calibration=tuple(manifest["calibration"]) if manifest.get("calibration") else None,
+            stage1_vocabulary=np.load(source / "stage1_vocabulary.npy", mmap_mode=mmap_mode) if cascade else None,
+            stage1_weights=np.load(source / "stage1_weights.npy", mmap_mode=mmap_mode) if cascade else None,
+            stage1_intercept=float(cascade["intercept"]) if cascade else 0.0,
+            cascade_band=(float(cascade["low"]), float(cascade["high"])) if cascade else None,
+        )
+
+    def analyze(self, text: str) -> List[str]:
+        """
+        與 sklearn `word` 分析器一致的斷詞與 n-gram 展開。
+        """
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+            grams.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def lookup(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        將整批文字的 n-gram 以二分搜尋對應到欄位，回傳 `(文件索引, 欄位索引)`。
+        """
+        doc_ids: List[int] = []
+        grams: List[bytes] = []
+        for doc, text in enumerate(texts):
+            analyzed = self.analyze(str(text))
+            doc_ids.extend([doc] * len(analyzed))
+            grams.extend(gram.encode("utf-8") for gram in analyzed)
+        if not grams:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        queries = np.asarray(grams, dtype=bytes)
+        columns = np.searchsorted(self.vocabulary, queries)
+        columns = np.minimum(columns, len(self.vocabulary) - 1)
+        hit = self.vocabulary[columns] == queries
+        return np.asarray(doc_ids, dtype=np.intp)[hit], columns[hit]
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        n_docs = len(texts)
+        docs, columns = self.lookup(texts)
+        keys, counts = np.unique(docs * len(self.vocabulary) + columns, return_counts=True)
+        docs, columns = np.divmod(keys, len(self.vocabulary))
+
+        weights = counts.astype(np.float64)
+        if self.binary:
+            weights[:] = 1.0
+        elif self.sublinear_tf:
+            weights = 1.0 + np.log(weights)
+        if self.use_idf:
+            weights *= self.idf[columns]
+
+        dot = np.bincount(docs, weights=weights * self.coef[columns], minlength=n_docs)
+        if self.norm == "l2":
+            scale = np.sqrt(np.bincount(docs, weights=weights**2, minlength=n_docs))
+        elif self.norm == "l1":
+            scale = np.bincount(docs, weights=np.abs(weights), minlength=n_docs)
+        else:
+            scale = np.ones(n_docs)
+        scores = np.divide(dot, scale, out=np.zeros(n_docs), where=scale > 0)
+        return scores + self.intercept
+
+    def prefilter_scores(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        串接第一階段的決策分數，與 `TokenTable.decision_function` 相同：不重複的小寫空白切詞權重總和。
+        """
+        doc_ids: List[int] = []
+        tokens: List[bytes] = []
+        for doc, text in enumerate(texts):
+            unique = set(str(text).lower().split())
+            doc_ids.extend([doc] * len(unique))
+            tokens.extend(token.encode("utf-8") for token in unique)
+        scores = np.full(len(texts), self.stage1_intercept)
+        if not tokens or not len(self.stage1_vocabulary):
+            return scores
+
+        queries = np.asarray(tokens, dtype=bytes)
+        columns = np.minimum(np.searchsorted(self.stage1_vocabulary, queries), len(self.stage1_vocabulary) - 1)
+        hit = self.stage1_vocabulary[columns] == queries
+        docs = np.asarray(doc_ids, dtype=np.intp)[hit]
+        return scores + np.bincount(docs, weights=self.stage1_weights[columns[hit]], minlength=len(texts))
+
+    def _probabilities(self, scores: np.ndarray) -> np.ndarray:
+        if self.calibration is not None:
+            # Platt 校正作用於未校正機率的 logit，也就是線性決策分數本身
+            slope, intercept = self.calibration
+            scores = slope * scores + intercept
+        positive = 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - positive, positive])
+
+    def _labels(self, probabilities: np.ndarray) -> np.ndarray:
+        if self.threshold is not None:
+            return np.where(probabilities[:, 1] >= self.threshold, self.classes_[1], self.classes_[0])
+        return self.classes_[np.argmax(probabilities, axis=1)]
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return self._probabilities(self.decision_function(texts))
+
+    def predict(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        與 `SpamClassifier.predict` 相同介面，回傳 `(labels, probabilities)`；
+        manifest 含決策門檻時以門檻取代 argmax，含串接時只有不確定區間才進入完整模型。
+        """
+        texts = list(texts)
+        if self.cascade_band is None:
+            probabilities = self.predict_proba(texts)
+            return self._labels(probabilities), probabilities
+
+        # 第一階段機率不套用完整模型的校正，標籤依落在信心區間的哪一端決定
+        spam = 1.0 / (1.0 + np.exp(-self.prefilter_scores(texts)))
+        probabilities = np.column_stack([1.0 - spam, spam])
+        low, high = self.cascade_band
+        labels = np.where(spam >= high, self.classes_[1], self.classes_[0])
+        uncertain = np.flatnonzero((spam > low) & (spam < high))
+        if len(uncertain):
+            full = self.predict_proba([texts[idx] for idx in uncertain])
+            probabilities[uncertain] = full
+            labels[uncertain] = self._labels(full)
+        return labels, probabilities
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, Callable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data import iter_csv_chunks
+from .mail import MAIL_SUFFIXES, MailIngestor
+from .model import SpamClassifier
+from .parallel import ParallelPredictor, resolve_n_jobs
+
+PredictFn = Callable[[Sequence[str]], Tuple[np.ndarray, np.ndarray]]
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+INPUT_FORMATS = (*SUPPORTED_FORMATS, "mail")
+
+
+def infer_format(
+    path: Path | str,
+    fmt: Optional[str] = None,
+    formats: Sequence[str] = SUPPORTED_FORMATS,
+) -> str:
+    """
+    依副檔名推斷檔案格式（csv 或 jsonl）；輸入端另可為目錄、`.eml` 或 `.mbox` 郵件來源（mail）。
+    """
+    if fmt:
+        fmt = fmt.lower()
+    else:
+        suffix = Path(path).suffix.lower()
+        if suffix in {".jsonl", ".ndjson"}:
+            fmt = "jsonl"
+        elif suffix in MAIL_SUFFIXES or Path(path).is_dir():
+            fmt = "mail"
+        else:
+            fmt = "csv"
+    if fmt not in formats:
+        raise ValueError(f"不支援的檔案格式：{fmt}")
+    return fmt
+
+
+def iter_jsonl_chunks(
+    source: Path | str | IO[bytes],
+    text_column: str,
+    chunk_size: int,
+) -> Iterator[pd.DataFrame]:
+    """
+    以固定筆數分塊串流讀取 JSON Lines。
+    """
+    with pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False) as reader:
+        for chunk in reader:
+            if text_column not in chunk.columns:
+                raise ValueError(f"JSONL 需包含 {text_column} 欄位才能推論。")
+            chunk[text_column] = chunk[text_column].astype(str)
+            yield chunk
+
+
+def iter_chunks(
+    source: Path | str | IO[bytes],
+    text_column: str,
+    chunk_size: int,
+    fmt: Optional[str] = None,
+    ingestor: Optional[MailIngestor] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    依格式分塊讀取輸入檔案；郵件來源以 `ingestor` 平行解析。
+    """
+    name = source if isinstance(source, (str, Path)) else getattr(source, "name", "")
+    fmt = infer_format(name, fmt, INPUT_FORMATS)
+    if fmt == "mail":
+        return (ingestor or MailIngestor(text_column=text_column)).iter_chunks(source, chunk_size)
+    if fmt == "jsonl":
+        return iter_jsonl_chunks(source, text_column, chunk_size)
+    return iter_csv_chunks(source, text_column, chunk_size)
+
+
+def score_chunk(
+    classifier: SpamClassifier,
+    chunk: pd.DataFrame,
+    predict: Optional[PredictFn] = None,
+) -> pd.DataFrame:
+    """
+    對單一區塊推論並附加 `predicted_label` 與 `spam_probability` 欄位；
+    啟用近似重複群集時另附 `campaign_id`。`predict` 只取代模型推論本身（例如平行推論器），
+    推論快取與群集仍由 `classifier` 處理。
+    """
+    texts = chunk[classifier.config.text_column].tolist()
+    scored = chunk.copy()
+    if classifier.campaigns is not None:
+        labels, probs, campaign_ids = classifier.predict_campaigns(texts, predict)
+        scored["campaign_id"] = campaign_ids
+    else:
+        labels, probs = classifier.predict(texts, infer=predict)
+    scored["predicted_label"] = labels
+    scored["spam_probability"] = probs[:, 1]
+    return scored
+
+
+def _write_chunk(frame: pd.DataFrame, handle: io.TextIOBase, fmt: str, first: bool) -> None:
+    if fmt == "jsonl":
+        frame.to_json(handle, orient="records", lines=True, force_ascii=False)
+    else:
+        frame.to_csv(handle, header=first, index=False)
+
+
+def predict_file(
+    classifier: SpamClassifier,
+    source: Path | str,
+    output: Path | str,
+    chunk_size: Optional[int] = None,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+) -> int:
+    """
+    串流讀取輸入檔並逐塊寫出推論結果，記憶體用量與檔案大小無關。
+
+    `n_jobs` 大於 1 時以程序池平行推論每個區塊，程序池於整個檔案間共用。
+    輸入為郵件來源時，MIME 解析另由 `config.mail_jobs` 個程序平行進行。
+    回傳已處理的筆數。
+    """
+    chunk_size = chunk_size or classifier.config.batch_chunk_size
+    n_jobs = classifier.config.n_jobs if n_jobs is None else n_jobs
+    out_fmt = infer_format(output, output_format)
+    target = Path(output)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    if resolve_n_jobs(n_jobs) > 1:
+        pool = classifier.parallel_predictor(n_jobs)
+    else:
+        pool = nullcontext()
+
+    total = 0
+    with pool, target.open("w", encoding="utf-8", newline="") as handle:
+        predict = pool.predict if isinstance(pool, ParallelPredictor) else None
+        chunks = iter_chunks(
+            source,
+            classifier.config.text_column,
+            chunk_size,
+            input_format,
+            MailIngestor.from_config(classifier.config),
+        )
+        for idx, chunk in enumerate(chunks):
+            _write_chunk(score_chunk(classifier, chunk, predict), handle, out_fmt, first=idx == 0)
+            total += len(chunk)
+    return total
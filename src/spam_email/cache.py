@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    正規化郵件文字：轉小寫並合併空白，與向量化器的斷詞結果一致。
+    """
+    return " ".join(str(text).split()).lower()
+
+
+@dataclass(slots=True)
+class PredictionCache:
+    """
+    以「正規化文字雜湊 + 模型版本」為鍵的推論結果快取，採 LRU 與 TTL 淘汰。
+    """
+
+    max_size: int = 100_000
+    ttl: Optional[float] = 3600.0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _entries: "OrderedDict[bytes, Tuple[float, Any, np.ndarray]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @staticmethod
+    def make_key(text: str, model_version: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(model_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[Any, np.ndarray]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, label, probs = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return label, probs
+
+    def put(self, key: bytes, label: Any, probs: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), label, probs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_hits(self, count: int) -> None:
+        """
+        記錄批次內重複文字直接共用結果所節省的推論次數。
+        """
+        with self._lock:
+            self.hits += count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
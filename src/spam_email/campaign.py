@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import itertools
+import re
+import string
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import AppConfig
+from .instrumentation import REGISTRY
+
+ScoreFn = Callable[[Sequence[str]], Tuple[np.ndarray, np.ndarray]]
+
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_EMAIL = re.compile(r"\S+@\S+")
+# 位元組層級的轉換表：標點轉為空白、數字一律轉為 0
+_BYTE_TABLE = bytes.maketrans(
+    string.punctuation.encode() + string.digits.encode(),
+    b" " * len(string.punctuation) + b"0" * len(string.digits),
+)
+_BLOCK_SHINGLES = 1 << 15
+
+
+def _mask_personal(text: str) -> str:
+    # 先以子字串檢查過濾，只有可能含網址或電子郵件的郵件才執行正規表示式
+    text = str(text)
+    if "://" in text or "www." in text or "WWW." in text:
+        text = _URL.sub(" url ", text)
+    if "@" in text:
+        text = _EMAIL.sub(" email ", text)
+    return text
+
+
+def campaign_tokens(text: str) -> List[bytes]:
+    """
+    去除行銷活動中常見的個人化差異後斷詞：網址與電子郵件以佔位符取代，數字轉為 0，
+    轉小寫並移除標點。
+    """
+    return _mask_personal(text).lower().encode("utf-8").translate(_BYTE_TABLE).split()
+
+
+@dataclass(slots=True)
+class MinHasher:
+    """
+    以詞 1～`shingle_size`-gram 為 shingle 計算 MinHash 簽章。
+
+    詞以 CRC32 雜湊，n-gram 以向量化運算組合；再分塊套用 `num_perm` 組 32 位元
+    乘加雜湊，並以 `np.minimum.reduceat` 取每封郵件的最小值。
+    """
+
+    num_perm: int = 64
+    shingle_size: int = 2
+    seed: int = 1
+    _a: np.ndarray = field(init=False, repr=False)
+    _b: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        rng = np.random.default_rng(self.seed)
+        self._a = rng.integers(0, 2**32, size=(self.num_perm, 1), dtype=np.uint32) | np.uint32(1)
+        self._b = rng.integers(0, 2**32, size=(self.num_perm, 1), dtype=np.uint32)
+
+    def _shingle_hashes(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        回傳依郵件排列的 shingle 雜湊與每封郵件的 shingle 數。
+        """
+        per_message = [campaign_tokens(text) for text in texts]
+        lengths = np.fromiter(map(len, per_message), dtype=np.int64, count=len(per_message))
+        tokens = itertools.chain.from_iterable(per_message)
+        words = np.fromiter(map(zlib.crc32, tokens), dtype=np.uint32, count=int(lengths.sum()))
+        # 依每封郵件的詞數標記所屬郵件，不使用可能與真實詞雜湊碰撞的帶內分隔詞
+        owner = np.repeat(np.arange(len(per_message)), lengths)
+
+        hashes, owners = [words], [owner]
+        for n in range(2, self.shingle_size + 1):
+            # n-gram 由相鄰詞雜湊組合，跨越郵件邊界者捨棄
+            same = owner[n - 1 :] == owner[: len(owner) - n + 1]
+            gram = words[: len(words) - n + 1].copy()
+            for offset in range(1, n):
+                gram = gram * np.uint32(0x01000193) ^ words[offset : len(words) - n + 1 + offset]
+            hashes.append(gram[same])
+            owners.append(owner[n - 1 :][same])
+
+        owner = np.concatenate(owners)
+        order = np.argsort(owner, kind="stable")
+        return np.concatenate(hashes)[order], np.bincount(owner, minlength=len(texts))
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        回傳形狀為 `(len(texts), num_perm)` 的簽章矩陣；沒有任何詞的郵件簽章全為 0。
+        """
+        result = np.zeros((len(texts), self.num_perm), dtype=np.uint32)
+        if len(texts) == 0:
+            return result
+        hashes, counts = self._shingle_hashes(texts)
+        present = np.flatnonzero(counts)
+        starts = np.r_[0, np.cumsum(counts)[:-1]][present]
+        ends = starts + counts[present]
+        first = 0
+        while first < len(present):
+            # 以郵件為界分塊，控制 (num_perm, 區塊 shingle 數) 暫存矩陣的大小
+            last = max(int(np.searchsorted(ends, starts[first] + _BLOCK_SHINGLES, side="right")), first + 1)
+            permuted = self._a * hashes[starts[first] : ends[last - 1]] + self._b
+            permuted ^= permuted >> np.uint32(16)
+            result[present[first:last]] = np.minimum.reduceat(
+                permuted, starts[first:last] - starts[first], axis=1
+            ).T
+            first = last
+        return result
+
+
+@dataclass(slots=True)
+class Campaign:
+    """
+    一個近似重複郵件群集：代表郵件的簽章、LSH 分桶鍵與共用的推論結果。
+    """
+
+    campaign_id: int
+    signature: np.ndarray
+    keys: Tuple[int, ...]
+    size: int = 1
+    label: Any = None
+    probability: Optional[np.ndarray] = None
+
+
+@dataclass(slots=True)
+class CampaignIndex:
+    """
+    以 MinHash + LSH 分桶將郵件歸入近似重複群集，每個群集只由代表郵件推論一次。
+
+    簽章切成 `bands` 段，任一段完全相同者成為候選，再以簽章相同比例估計 Jaccard 相似度，
+    不低於 `threshold` 才併入該群集。群集數超過 `max_clusters` 時淘汰最久未出現者；
+    模型版本改變時清空所有群集，避免沿用舊模型的結果。
+    """
+
+    hasher: MinHasher = field(default_factory=MinHasher)
+    bands: int = 16
+    threshold: float = 0.7
+    max_clusters: int = 100_000
+    model_version: Optional[str] = None
+    messages: int = 0
+    scored: int = 0
+    campaigns: "OrderedDict[int, Campaign]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _buckets: List[Dict[int, List[int]]] = field(init=False, repr=False)
+    _multipliers: np.ndarray = field(init=False, repr=False)
+    _next_id: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.hasher.num_perm % self.bands:
+            raise ValueError("MinHash 簽章長度必須能被分段數整除。")
+        self._buckets = [{} for _ in range(self.bands)]
+        rows = self.hasher.num_perm // self.bands
+        rng = np.random.default_rng(self.hasher.seed + 1)
+        self._multipliers = rng.integers(0, 2**63, size=rows, dtype=np.uint64) | np.uint64(1)
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "CampaignIndex":
+        return cls(
+            hasher=MinHasher(num_perm=config.dedupe_num_perm, shingle_size=config.dedupe_shingle_size),
+            bands=config.dedupe_bands,
+            threshold=config.dedupe_threshold,
+            max_clusters=config.dedupe_max_clusters,
+        )
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        rows = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        return (rows * self._multipliers).sum(axis=2, dtype=np.uint64)
+
+    def _match(self, signature: np.ndarray, keys: Sequence[int]) -> Optional[Campaign]:
+        required = self.threshold * len(signature)
+        seen = set()
+        for band, key in enumerate(keys):
+            for campaign_id in self._buckets[band].get(key, ()):
+                if campaign_id in seen:
+                    continue
+                seen.add(campaign_id)
+                campaign = self.campaigns[campaign_id]
+                if np.count_nonzero(campaign.signature == signature) >= required:
+                    return campaign
+        return None
+
+    def _add(self, signature: np.ndarray, keys: Tuple[int, ...]) -> Campaign:
+        campaign = Campaign(campaign_id=self._next_id, signature=signature, keys=keys)
+        self._next_id += 1
+        self.campaigns[campaign.campaign_id] = campaign
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(campaign.campaign_id)
+        while len(self.campaigns) > self.max_clusters:
+            _, stale = self.campaigns.popitem(last=False)
+            for band, key in enumerate(stale.keys):
+                members = self._buckets[band][key]
+                members.remove(stale.campaign_id)
+                if not members:
+                    del self._buckets[band][key]
+        return campaign
+
+    def predict(
+        self,
+        texts: Sequence[str],
+        score: ScoreFn,
+        model_version: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        將郵件歸入群集，只對新群集的代表郵件呼叫 `score`，再將結果分送給所有成員。
+
+        回傳 `(labels, probabilities, campaign_ids)`；群集跨批次保留，之後批次中的
+        相似郵件直接沿用結果。
+        """
+        texts = list(texts)
+        with REGISTRY.timer("campaign_minhash", rows=len(texts)):
+            signatures = self.hasher.signatures(texts)
+            band_keys = self._band_keys(signatures).tolist()
+
+        with self._lock:
+            if model_version != self.model_version:
+                self.clear()
+                self.model_version = model_version
+            members: List[Campaign] = []
+            pending: List[Tuple[Campaign, int]] = []
+            for idx, (signature, keys) in enumerate(zip(signatures, band_keys)):
+                campaign = self._match(signature, keys)
+                if campaign is None:
+                    campaign = self._add(signature, tuple(keys))
+                    pending.append((campaign, idx))
+                else:
+                    campaign.size += 1
+                    self.campaigns.move_to_end(campaign.campaign_id)
+                members.append(campaign)
+
+            if pending:
+                labels, probabilities = score([texts[idx] for _, idx in pending])
+                for (campaign, _), label, row in zip(pending, labels, probabilities):
+                    campaign.label, campaign.probability = label, np.array(row)
+            self.messages += len(texts)
+            self.scored += len(pending)
+
+        REGISTRY.inc("campaign_messages", len(texts))
+        REGISTRY.inc("campaign_representatives", len(pending))
+        if not members:
+            return np.empty(0, dtype=object), np.empty((0, 2)), np.empty(0, dtype=np.int64)
+        return (
+            np.array([campaign.label for campaign in members]),
+            np.vstack([campaign.probability for campaign in members]),
+            np.fromiter((campaign.campaign_id for campaign in members), dtype=np.int64, count=len(members)),
+        )
+
+    def largest(self, top_n: int = 10) -> List[Tuple[int, int]]:
+        """
+        回傳成員數最多的群集 `(campaign_id, size)`。
+        """
+        with self._lock:
+            sizes = [(campaign.campaign_id, campaign.size) for campaign in self.campaigns.values()]
+        return sorted(sizes, key=lambda item: (-item[1], item[0]))[:top_n]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "scored": self.scored,
+            "campaigns": len(self.campaigns),
+            "reduction": self.messages / self.scored if self.scored else 0.0,
+            "largest": self.largest(5),
+        }
+
+    def clear(self) -> None:
+        """
+        清空群集與分桶（呼叫端需持有鎖或確保沒有並行推論）。
+        """
+        self.campaigns.clear()
+        for bucket in self._buckets:
+            bucket.clear()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from .config import AppConfig
+from .instrumentation import REGISTRY, logger
+from .metadata import atomic_dump, read_metadata, update_metadata
+from .threshold import OperatingPoint
+
+
+def prefilter_path(model_path: Path | str) -> Path:
+    """
+    第一階段模型的附屬檔：`<模型檔名>.stage1.joblib`。
+    """
+    path = Path(model_path)
+    return path.with_name(path.name + ".stage1.joblib")
+
+
+@dataclass(slots=True)
+class CascadeStats:
+    """
+    各階段處理筆數的執行緒安全計數器。
+    """
+
+    total: int = 0
+    early_ham: int = 0
+    early_spam: int = 0
+    full_model: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, early_ham: int, early_spam: int, full_model: int) -> None:
+        with self._lock:
+            self.early_ham += early_ham
+            self.early_spam += early_spam
+            self.full_model += full_model
+            self.total += early_ham + early_spam + full_model
+
+    @property
+    def early_exit_rate(self) -> float:
+        return (self.early_ham + self.early_spam) / self.total if self.total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "early_ham": self.early_ham,
+            "early_spam": self.early_spam,
+            "full_model": self.full_model,
+            "early_exit_rate": self.early_exit_rate,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.total = self.early_ham = self.early_spam = self.full_model = 0
+
+
+@dataclass(slots=True)
+class TokenTable:
+    """
+    第一階段的詞項查表模型：以空白切分的小寫詞出現與否為特徵的邏輯斯迴歸。
+
+    推論只需 `str.split` 與字典查表加總權重，不建立稀疏矩陣，
+    成本遠低於完整的正規表示式斷詞與 bigram TF-IDF。
+    """
+
+    weights: Dict[str, float]
+    intercept: float
+    classes_: np.ndarray
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        C: float = 1.0,
+        random_state: Optional[int] = None,
+    ) -> "TokenTable":
+        vectorizer = CountVectorizer(tokenizer=str.split, token_pattern=None, binary=True)
+        features = vectorizer.fit_transform(texts)
+        clf = LogisticRegression(C=C, max_iter=500, random_state=random_state, solver="lbfgs")
+        clf.fit(features, labels)
+        if clf.coef_.shape[0] != 1:
+            raise ValueError("串接第一階段僅支援二元分類。")
+        coef = clf.coef_[0]
+        weights = {term: float(coef[column]) for term, column in vectorizer.vocabulary_.items() if coef[column]}
+        return cls(weights=weights, intercept=float(clf.intercept_[0]), classes_=clf.classes_)
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        lookup = self.weights.get
+        scores = np.fromiter(
+            (sum(lookup(token, 0.0) for token in set(str(text).lower().split())) for text in texts),
+            dtype=np.float64,
+            count=len(texts),
+        )
+        return scores + self.intercept
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+
+@dataclass(slots=True)
+class Cascade:
+    """
+    兩階段分類：以 `TokenTable` 查表的第一階段先為所有郵件評分，
+    垃圾郵件機率不高於 `low` 或不低於 `high` 者直接輸出，只有中間的不確定區間
+    才交給完整的 TF-IDF 模型。
+
+    信心區間作用於第一階段自身的機率；完整模型的 Platt 校正是以完整模型的分數擬合，
+    不套用於第一階段。提前輸出的標籤依所在的一端決定，因此操作點門檻必須落在
+    `(low, high)` 之間，輸出的機率才不會與門檻判定相反，見 `include_threshold`。
+    """
+
+    prefilter: Optional[TokenTable] = None
+    low: float = 0.05
+    high: float = 0.95
+    C: float = 1.0
+    random_state: Optional[int] = None
+    stats: CascadeStats = field(default_factory=CascadeStats, repr=False)
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "Cascade":
+        if not 0.0 <= config.cascade_low < config.cascade_high <= 1.0:
+            raise ValueError("串接信心區間需滿足 0 <= low < high <= 1。")
+        return cls(
+            low=config.cascade_low,
+            high=config.cascade_high,
+            C=config.cascade_c,
+            random_state=config.random_state,
+        )
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "Cascade":
+        self.prefilter = TokenTable.fit(texts, labels, C=self.C, random_state=self.random_state)
+        return self
+
+    def include_threshold(self, point: Optional[OperatingPoint] = None) -> bool:
+        """
+        門檻落在信心區間外時，將越界的一端移到門檻與 0 或 1 的中點，使 `low < 門檻 < high`；
+        門檻要在驗證集上選定後才知道，因此以收窄提前輸出的範圍取代訓練完才報錯。回傳區間是否改變。
+        """
+        threshold = point.threshold if point is not None else 0.5
+        low = threshold / 2 if threshold <= self.low else self.low
+        high = (1.0 + threshold) / 2 if threshold >= self.high else self.high
+        if (low, high) == (self.low, self.high):
+            return False
+        logger.warning(
+            "決策門檻 %.4g 落在串接信心區間 (%s, %s) 外，區間調整為 (%.4g, %.4g)",
+            threshold,
+            self.low,
+            self.high,
+            low,
+            high,
+        )
+        self.low, self.high = low, high
+        return True
+
+    def run(
+        self,
+        texts: Sequence[str],
+        full_model: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        以第一階段分流，`full_model(indices)` 只對不確定區間的索引計算；
+        提前輸出者回傳第一階段機率，標籤依落在區間的哪一端決定。
+        """
+        if self.prefilter is None:
+            raise RuntimeError("串接第一階段尚未訓練。")
+        classes = self.prefilter.classes_
+        with REGISTRY.timer("cascade_prefilter", rows=len(texts)):
+            probabilities = self.prefilter.predict_proba(texts)
+        spam = probabilities[:, 1]
+        labels = np.where(spam >= self.high, classes[1], classes[0])
+
+        uncertain = np.flatnonzero((spam > self.low) & (spam < self.high))
+        if len(uncertain):
+            full_labels, full_probs = full_model(uncertain)
+            labels = labels.astype(np.result_type(labels.dtype, full_labels.dtype))
+            labels[uncertain] = full_labels
+            probabilities[uncertain] = full_probs
+
+        early_spam = int((spam >= self.high).sum())
+        early_ham = len(spam) - early_spam - len(uncertain)
+        self.stats.record(early_ham=early_ham, early_spam=early_spam, full_model=len(uncertain))
+        REGISTRY.inc("cascade_messages", early_ham, route="early_ham")
+        REGISTRY.inc("cascade_messages", early_spam, route="early_spam")
+        REGISTRY.inc("cascade_messages", len(uncertain), route="full_model")
+        return labels, probabilities
+
+    def save(self, model_path: Path | str) -> None:
+        atomic_dump(self.prefilter, prefilter_path(model_path))
+        update_metadata(model_path, cascade={"low": self.low, "high": self.high})
+
+    @classmethod
+    def load(cls, model_path: Path | str) -> Optional["Cascade"]:
+        settings = read_metadata(model_path).get("cascade")
+        if not settings:
+            return None
+        prefilter = joblib.load(prefilter_path(model_path))
+        return cls(prefilter=prefilter, low=settings["low"], high=settings["high"])
+
+    @staticmethod
+    def discard(model_path: Path | str) -> None:
+        """
+        移除既有模型檔旁的第一階段模型與設定，避免沿用過期的串接。
+        """
+        prefilter_path(model_path).unlink(missing_ok=True)
+        if read_metadata(model_path):
+            update_metadata(model_path, cascade=None)
@@ -1,16 +1,82 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import typer
 
 from .config import AppConfig
-from .data import DatasetLoader
-from .model import SpamClassifier
+
+if TYPE_CHECKING:
+    from .model import SpamClassifier
+    from .quantize import CompactionReport
 
 app = typer.Typer(help="垃圾郵件分類 CLI 工具")
 
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile_path: Path = typer.Option(
+        None,
+        "--profile",
+        help="以 cProfile 剖析整個指令並寫入此檔（可用 pstats 或 snakeviz 檢視）。",
+    ),
+    log_json: bool = typer.Option(
+        False,
+        "--log-json",
+        help="以 JSON 日誌輸出各階段耗時，並於結束時輸出指標快照（stderr）。",
+    ),
+) -> None:
+    """
+    垃圾郵件分類 CLI 工具。
+    """
+    if log_json:
+        from .instrumentation import REGISTRY, configure_json_logging, logger
+
+        configure_json_logging()
+        ctx.call_on_close(lambda: logger.info("metrics", extra={"event": REGISTRY.snapshot()}))
+    if profile_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def _dump_profile() -> None:
+            profiler.disable()
+            profiler.dump_stats(str(profile_path))
+            typer.echo(f"剖析結果已寫入: {profile_path}", err=True)
+
+        ctx.call_on_close(_dump_profile)
+
+
+def _apply_mail_options(config: AppConfig, subject: bool, sender: bool, jobs: Optional[int]) -> None:
+    # 主旨與寄件者是否併入文字必須與訓練時一致
+    config.mail_include_subject = subject
+    config.mail_include_sender = sender
+    if jobs is not None:
+        config.mail_jobs = jobs
+
+
+def _parse_mail_sources(values: List[str]) -> List[Tuple[str, Path]]:
+    sources = []
+    for value in values:
+        label, sep, path = value.partition("=")
+        if not sep or not label or not path:
+            raise typer.BadParameter(f"郵件來源需為 標籤=路徑 格式：{value}", param_hint="--mail")
+        sources.append((label, Path(path)))
+    return sources
+
+
+def _load_classifier(config: AppConfig) -> "SpamClassifier":
+    # 延遲匯入 scikit-learn / pandas，讓精簡推論路徑不必付出匯入成本
+    from .model import SpamClassifier
+
+    classifier = SpamClassifier(config=config)
+    classifier.load()
+    return classifier
+
+
 @app.command()
 def train(
     data_path: Path = typer.Option(
@@ -25,20 +91,118 @@ def train(
         "-m",
         help="儲存模型的目標檔案。",
     ),
+    engine: str = typer.Option(
+        None,
+        "--engine",
+        "-e",
+        help="特徵引擎：tfidf 或 hashing。",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="以分塊串流方式增量訓練線上模型（雜湊特徵 + SGD）。",
+    ),
+    chunk_size: int = typer.Option(
+        None,
+        "--chunk-size",
+        "-c",
+        help="增量訓練時每塊讀取的筆數。",
+    ),
+    feature_cache: bool = typer.Option(
+        False,
+        "--feature-cache",
+        help="將特徵矩陣快取於 cache_dir，相同資料與參數再次訓練時略過特徵擷取。",
+    ),
+    threshold_strategy: str = typer.Option(
+        None,
+        "--threshold",
+        help="決策門檻策略：argmax、f1（F1 最佳）或 fpr（限制正常郵件誤判率）。",
+    ),
+    target_fpr: float = typer.Option(None, "--target-fpr", help="fpr 策略允許的正常郵件誤判率上限。"),
+    calibrate: bool = typer.Option(False, "--calibrate", help="以 Platt scaling 校正垃圾郵件機率。"),
+    cascade: bool = typer.Option(
+        False,
+        "--cascade",
+        help="另訓練查表式第一階段，高信心郵件提前輸出，只有不確定者交給完整模型。",
+    ),
+    cascade_low: float = typer.Option(None, "--cascade-low", help="第一階段直接判為正常郵件的機率上限。"),
+    cascade_high: float = typer.Option(None, "--cascade-high", help="第一階段直接判為垃圾郵件的機率下限。"),
+    feature_dtype: str = typer.Option(None, "--feature-dtype", help="特徵矩陣型別：float64 或 float32。"),
+    quantize: str = typer.Option(
+        None,
+        "--quantize",
+        help="訓練後剪除近零係數並量化權重：float32、float16 或 int8。",
+    ),
+    mail: List[str] = typer.Option(
+        None,
+        "--mail",
+        help="以 標籤=路徑 指定 mbox、Maildir 或 .eml 目錄作為訓練資料（可重複），例如 --mail spam=corpus/spam。",
+    ),
+    subject: bool = typer.Option(True, "--subject/--no-subject", help="郵件來源是否將主旨併入文字。"),
+    sender: bool = typer.Option(False, "--sender", help="郵件來源是否將寄件者併入文字。"),
+    mail_jobs: int = typer.Option(None, "--mail-jobs", help="平行解析郵件的程序數，-1 代表使用全部核心。"),
+    drift: bool = typer.Option(False, "--drift", help="以驗證集建立漂移基準，供 drift 指令與 serve --drift 監控。"),
+    register: bool = typer.Option(False, "--register", help="將模型登錄為模型登錄庫的新版本，而非覆寫模型檔。"),
+    promote: bool = typer.Option(False, "--promote", help="登錄後立即推進為上線版本（隱含 --register）。"),
 ) -> None:
     """
     訓練模型並輸出指標。
     """
+    from .data import DatasetLoader
+    from .model import SpamClassifier
+
     config = AppConfig.from_env(
         local_data_path=str(data_path) if data_path else None,
         model_path=str(model_path) if model_path else None,
+        feature_engine=engine,
     )
+    config.feature_cache_enabled = feature_cache
+    config.calibrate_probabilities = calibrate
+    if threshold_strategy:
+        config.decision_strategy = threshold_strategy
+    if target_fpr is not None:
+        config.target_fpr = target_fpr
+    config.cascade_enabled = cascade
+    if feature_dtype:
+        config.feature_dtype = feature_dtype
+    config.quantize_dtype = quantize
+    config.drift_enabled = drift
+    if cascade_low is not None:
+        config.cascade_low = cascade_low
+    if cascade_high is not None:
+        config.cascade_high = cascade_high
     loader = DatasetLoader(config=config)
-    frame = loader.load()
     classifier = SpamClassifier(config=config)
-    _, report = classifier.train(frame)
-    saved_path = classifier.save()
-    typer.echo(f"模型已儲存於: {saved_path}")
+    if mail:
+        import pandas as pd
+
+        from .mail import MailIngestor
+
+        sources = _parse_mail_sources(mail)
+        _apply_mail_options(config, subject, sender, mail_jobs)
+        ingestor = MailIngestor.from_config(config)
+        if incremental:
+            chunks = ingestor.iter_labelled_chunks(
+                sources, chunk_size or config.batch_chunk_size, random_state=config.random_state
+            )
+            _, report = classifier.train_incremental(chunks)
+        else:
+            frame = pd.concat([ingestor.load(path, label=label) for label, path in sources], ignore_index=True)
+            _, report = classifier.train(frame)
+    elif incremental:
+        _, report = classifier.train_incremental(loader.iter_chunks(chunk_size=chunk_size))
+    else:
+        _, report = classifier.train(loader.load())
+    if register or promote:
+        from .registry import ModelRegistry
+
+        version = ModelRegistry.from_config(config).register(classifier, promote=promote)
+        typer.echo(f"模型已登錄為版本 {version.version}{'（已上線）' if promote else ''}: {version.directory}")
+    else:
+        saved_path = classifier.save()
+        typer.echo(f"模型已儲存於: {saved_path}")
+    if report is None:
+        return
     typer.echo("=== 評估指標 ===")
     for label in report.labels:
         typer.echo(
@@ -46,19 +210,413 @@ def train(
             f"Recall={report.recall[label]:.3f}, F1={report.f1[label]:.3f}"
         )
     typer.echo(f"ROC AUC: {report.roc_auc:.3f}")
+    point = classifier.operating_point
+    if point is not None:
+        typer.echo(
+            f"決策門檻: {point.threshold:.4f} ({point.strategy}), "
+            f"Precision={point.precision:.3f}, Recall={point.recall:.3f}, FPR={point.fpr:.4f}"
+        )
+    if classifier.cascade is not None:
+        typer.echo(f"串接第一階段提前輸出比例: {classifier.cascade.stats.early_exit_rate:.1%}")
+    if classifier.compaction is not None:
+        _echo_compaction(classifier.compaction)
+
+
+def _echo_compaction(report: "CompactionReport") -> None:
+    typer.echo(
+        f"精簡 ({report.dtype}): 特徵 {report.features_before} -> {report.features_after}，"
+        f"記憶體約 {report.bytes_before / 1024:.0f} KiB -> {report.bytes_after / 1024:.0f} KiB"
+        f"（節省 {report.bytes_saved / 1024:.0f} KiB），"
+        f"準確率 {report.accuracy_before:.4f} -> {report.accuracy_after:.4f} ({report.accuracy_delta:+.4f})"
+    )
+
+
+@app.command()
+def tune(
+    data_path: Path = typer.Option(None, "--data", "-d", help="自訂資料集路徑，預設自動下載。"),
+    grid_path: Path = typer.Option(None, "--grid", "-g", help="參數網格 JSON 檔，鍵為管線參數名稱。"),
+    n_iter: int = typer.Option(None, "--n-iter", "-n", help="隨機搜尋的候選數，未指定則完整網格搜尋。"),
+    folds: int = typer.Option(5, "--folds", "-k", help="交叉驗證 fold 數。"),
+    scoring: str = typer.Option("f1", "--scoring", "-s", help="評分方式：f1、roc_auc 或 accuracy。"),
+    jobs: int = typer.Option(-1, "--jobs", "-j", help="平行程序數，-1 代表使用全部核心。"),
+    output_path: Path = typer.Option(None, "--output", "-o", help="將完整結果寫入 JSON。"),
+    refit: bool = typer.Option(False, "--refit", help="以最佳參數重新訓練並儲存模型。"),
+    model_path: Path = typer.Option(None, "--model", "-m", help="重新訓練後儲存模型的目標檔案。"),
+) -> None:
+    """
+    以 k-fold 交叉驗證平行搜尋超參數，每個 fold 的特徵矩陣只計算一次。
+    """
+    import json
+
+    from .data import DatasetLoader
+    from .model import SpamClassifier
+    from .tuning import tune as run_tune
+
+    config = AppConfig.from_env(
+        local_data_path=str(data_path) if data_path else None,
+        model_path=str(model_path) if model_path else None,
+    )
+    frame = DatasetLoader(config=config).load()
+    grid = json.loads(grid_path.read_text(encoding="utf-8")) if grid_path else None
+    result = run_tune(frame, config, grid, n_iter=n_iter, folds=folds, scoring=scoring, n_jobs=jobs)
+
+    typer.echo(f"共評估 {len(result.candidates)} 組參數，耗時 {result.wall_seconds:.1f} 秒")
+    for candidate in result.candidates[:10]:
+        typer.echo(
+            f"{scoring}={candidate.mean_score:.4f}±{candidate.std_score:.4f} "
+            f"({candidate.wall_seconds:.2f}s) {candidate.params}"
+        )
+    if output_path:
+        output_path.write_text(json.dumps(result.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        typer.echo(f"搜尋結果已寫入: {output_path}")
+    if refit:
+        config.pipeline_params = dict(result.best.params)
+        classifier = SpamClassifier(config=config)
+        classifier.train(frame)
+        typer.echo(f"最佳參數模型已儲存於: {classifier.save()}")
+
+
+@app.command()
+def evaluate(
+    data_path: Path = typer.Option(..., "--data", "-d", help="已標記的評估資料 CSV。"),
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    chunk_size: int = typer.Option(None, "--chunk-size", "-c", help="每塊讀取筆數。"),
+    histogram_bins: int = typer.Option(
+        None,
+        "--histogram-bins",
+        help="以固定分箱直方圖累積分數，記憶體與資料量無關；0 代表精確計算。",
+    ),
+    curve_points: int = typer.Option(None, "--curve-points", help="ROC / PR 曲線保留的最多點數。"),
+) -> None:
+    """
+    串流分塊評估既有模型，適用於大型資料集。
+    """
+    from .data import DatasetLoader
+
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    if histogram_bins is not None:
+        config.eval_histogram_bins = histogram_bins
+    if curve_points is not None:
+        config.eval_curve_points = curve_points
+    classifier = _load_classifier(config)
+    report = classifier.evaluate_chunks(DatasetLoader(config=config).iter_chunks(data_path, chunk_size))
+    typer.echo("=== 評估指標 ===")
+    for label in report.labels:
+        typer.echo(
+            f"{label}: Precision={report.precision[label]:.3f}, "
+            f"Recall={report.recall[label]:.3f}, F1={report.f1[label]:.3f}, "
+            f"Support={report.support[label]:.0f}"
+        )
+    typer.echo(f"ROC AUC: {report.roc_auc:.3f}")
+
+
+@app.command()
+def update(
+    data_path: Path = typer.Option(..., "--data", "-d", help="新標記郵件的 CSV 檔案。"),
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    chunk_size: int = typer.Option(None, "--chunk-size", "-c", help="每塊讀取筆數。"),
+) -> None:
+    """
+    以新標記資料增量更新既有的線上模型。
+    """
+    from .data import DatasetLoader
+
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    classifier = _load_classifier(config)
+    total = 0
+    try:
+        for chunk in DatasetLoader(config=config).iter_chunks(data_path, chunk_size):
+            classifier.update(chunk)
+            total += len(chunk)
+    except RuntimeError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--model") from exc
+    saved_path = classifier.save()
+    typer.echo(f"已以 {total} 筆資料更新模型，儲存於: {saved_path}")
 
 
 @app.command()
-def predict(text: str, model_path: Path = typer.Option(None, "--model", "-m")) -> None:
+def predict(
+    text: str,
+    model_path: Path = typer.Option(None, "--model", "-m", help="模型檔案或精簡模型目錄。"),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="使用精簡模型推論，只需 NumPy，不載入 scikit-learn 與 pandas。",
+    ),
+) -> None:
     """
     對單一郵件文字進行分類。
     """
     config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
-    classifier = SpamClassifier(config=config)
-    classifier.load()
+    target = model_path or (config.compact_model_path if compact else config.model_path)
+    if compact or target.is_dir():
+        from .artifact import CompactPredictor
+
+        classifier = CompactPredictor.load(target)
+    else:
+        classifier = _load_classifier(config)
     labels, probs = classifier.predict([text])
     typer.echo(f"預測結果: {labels[0]}, 垃圾郵件機率: {probs[0][1]:.3f}")
 
 
+@app.command()
+def explain(
+    text: str,
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    top_k: int = typer.Option(10, "--top-k", "-k", help="列出貢獻最大的詞項數。"),
+) -> None:
+    """
+    分類單一郵件並列出影響判斷最大的 n-gram。
+    """
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    result = _load_classifier(config).explain([text], top_k=top_k)[0]
+    typer.echo(f"預測結果: {result.label}, 垃圾郵件機率: {result.spam_probability:.3f}")
+    for term, weight in result.contributions:
+        typer.echo(f"{weight:+.4f}  {term}")
+
+
+@app.command()
+def export(
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    output_path: Path = typer.Option(None, "--output", "-o", help="精簡模型輸出目錄。"),
+) -> None:
+    """
+    將 joblib 模型匯出為可記憶體映射的精簡推論格式。
+    """
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    classifier = _load_classifier(config)
+    target = classifier.export_compact(output_path)
+    typer.echo(f"精簡模型已匯出至: {target}")
+
+
+@app.command("quantize")
+def quantize_model(
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    data_path: Path = typer.Option(None, "--data", "-d", help="量測準確率的已標記資料，預設使用訓練資料集。"),
+    dtype: str = typer.Option("int8", "--dtype", help="權重量化型別：float32、float16 或 int8。"),
+    tolerance: float = typer.Option(None, "--tolerance", help="相對於最大係數的剪枝門檻，預設 0.01。"),
+    output_path: Path = typer.Option(None, "--output", "-o", help="輸出模型檔，預設為 <模型檔名>.<型別>.joblib。"),
+) -> None:
+    """
+    剪除既有模型的近零係數與詞彙並量化權重，回報準確率差異與節省的記憶體。
+    """
+    from .data import DatasetLoader
+
+    config = AppConfig.from_env(
+        local_data_path=str(data_path) if data_path else None,
+        model_path=str(model_path) if model_path else None,
+    )
+    classifier = _load_classifier(config)
+    report = classifier.quantize(DatasetLoader(config=config).load(), dtype=dtype, tolerance=tolerance)
+    target = output_path or config.model_path.with_name(f"{config.model_path.stem}.{dtype}{config.model_path.suffix}")
+    classifier.save(target)
+    _echo_compaction(report)
+    typer.echo(f"精簡模型已儲存於: {target}")
+
+
+@app.command("predict-file")
+def predict_file(
+    input_path: Path = typer.Argument(..., help="輸入檔案（CSV 或 JSONL），或 mbox、Maildir、.eml 目錄等郵件來源。"),
+    output_path: Path = typer.Argument(..., help="輸出檔案，副檔名決定格式。"),
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    chunk_size: int = typer.Option(None, "--chunk-size", "-c", help="每塊讀取筆數。"),
+    input_format: str = typer.Option(
+        None,
+        "--format",
+        "-f",
+        help="輸入格式：csv、jsonl 或 mail，預設依副檔名判斷（目錄、.eml、.mbox 視為 mail）。",
+    ),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="平行推論程序數，-1 代表使用全部核心。"),
+    cache_size: int = typer.Option(0, "--cache-size", help="推論快取容量，0 代表停用。"),
+    dedupe: bool = typer.Option(
+        False,
+        "--dedupe",
+        help="以 MinHash/LSH 將近似重複郵件歸為同一群集，每個群集只推論一次並輸出 campaign_id。",
+    ),
+    subject: bool = typer.Option(True, "--subject/--no-subject", help="郵件來源是否將主旨併入文字。"),
+    sender: bool = typer.Option(False, "--sender", help="郵件來源是否將寄件者併入文字。"),
+    mail_jobs: int = typer.Option(None, "--mail-jobs", help="平行解析郵件的程序數，-1 代表使用全部核心。"),
+) -> None:
+    """
+    串流分塊對大型檔案進行批次推論。
+    """
+    from .batch import predict_file as run_predict_file
+
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    config.prediction_cache_size = cache_size
+    config.dedupe_enabled = dedupe
+    _apply_mail_options(config, subject, sender, mail_jobs)
+    classifier = _load_classifier(config)
+    total = run_predict_file(
+        classifier,
+        input_path,
+        output_path,
+        chunk_size=chunk_size,
+        input_format=input_format,
+        n_jobs=jobs,
+    )
+    typer.echo(f"已完成 {total} 筆推論，結果儲存於: {output_path}")
+    if classifier.campaigns is not None:
+        stats = classifier.campaigns.stats()
+        typer.echo(
+            f"群集數: {stats['campaigns']}，模型推論 {stats['scored']} 次"
+            f"（減少為 1/{stats['reduction']:.1f}）"
+        )
+        for campaign_id, size in classifier.campaigns.largest(10):
+            typer.echo(f"  campaign {campaign_id}: {size} 封")
+
+
+@app.command()
+def drift(
+    input_path: Path = typer.Argument(..., help="新流量檔案（CSV、JSONL）或郵件來源。"),
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    chunk_size: int = typer.Option(None, "--chunk-size", "-c", help="每塊讀取筆數。"),
+    input_format: str = typer.Option(None, "--format", "-f", help="輸入格式：csv、jsonl 或 mail。"),
+    sample_rate: float = typer.Option(None, "--sample-rate", help="抽樣更新監控的郵件比例。"),
+) -> None:
+    """
+    以串流方式推論新流量，回報相對於訓練基準的分數與詞彙漂移，判斷是否需要重新訓練。
+    """
+    from .batch import iter_chunks
+    from .mail import MailIngestor
+
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    config.drift_enabled = True
+    # 整個檔案視為單一視窗
+    config.drift_window = 2**62
+    if sample_rate is not None:
+        config.drift_sample_rate = sample_rate
+    classifier = _load_classifier(config)
+    if classifier.monitor is None:
+        raise typer.BadParameter("模型缺少漂移基準，請以 train --drift 重新訓練。", param_hint="--model")
+    for chunk in iter_chunks(
+        input_path,
+        config.text_column,
+        chunk_size or config.batch_chunk_size,
+        input_format,
+        MailIngestor.from_config(config),
+    ):
+        classifier.predict(chunk[config.text_column].tolist())
+
+    report = classifier.monitor.evaluate()
+    if report is None:
+        typer.echo("輸入沒有任何郵件。")
+        return
+    typer.echo(f"郵件數: {classifier.monitor.messages}（抽樣 {report.messages}）")
+    typer.echo(f"垃圾郵件機率分布 PSI={report.probability_psi:.4f}, KL={report.probability_kl:.4f}")
+    typer.echo(f"詞彙分布 PSI={report.feature_psi:.4f}, KL={report.feature_kl:.4f}")
+    typer.echo(f"詞彙表外比例: {report.oov_rate:.2%}（基準 {report.baseline_oov_rate:.2%}）")
+    typer.echo("建議重新訓練" if report.drifted else "未偵測到顯著漂移")
+    if report.top_oov:
+        typer.echo("最常見的詞彙表外詞: " + ", ".join(f"{term}({count})" for term, count in report.top_oov[:10]))
+    for term, before, after in report.top_features[:10]:
+        typer.echo(f"  {term}: 每封命中 {before:.4f} -> {after:.4f}")
+
+
+@app.command()
+def serve(
+    model_path: Path = typer.Option(None, "--model", "-m"),
+    host: str = typer.Option(None, "--host", help="監聽位址。"),
+    port: int = typer.Option(None, "--port", "-p", help="監聽埠號。"),
+    max_batch_size: int = typer.Option(None, "--max-batch-size", help="單一微批次的最大筆數。"),
+    max_wait_ms: float = typer.Option(None, "--max-wait-ms", help="微批次最長等待毫秒數。"),
+    cache_size: int = typer.Option(None, "--cache-size", help="推論快取容量，0 代表停用。"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="啟用近似重複群集，相似郵件共用推論結果。"),
+    drift: bool = typer.Option(False, "--drift", help="監控流量相對於訓練基準的漂移，分數輸出於 /metrics。"),
+    use_registry: bool = typer.Option(
+        False,
+        "--registry",
+        help="載入模型登錄庫的上線版本，並在推進或回復時於背景熱替換。",
+    ),
+) -> None:
+    """
+    啟動常駐的 HTTP 推論服務。
+    """
+    from .server import serve as run_server
+
+    config = AppConfig.from_env(model_path=str(model_path) if model_path else None)
+    if host:
+        config.serve_host = host
+    if port is not None:
+        config.serve_port = port
+    if max_batch_size is not None:
+        config.batch_max_size = max_batch_size
+    if max_wait_ms is not None:
+        config.batch_max_wait_ms = max_wait_ms
+    if cache_size is not None:
+        config.prediction_cache_size = cache_size
+    config.dedupe_enabled = dedupe
+    config.drift_enabled = drift
+
+    registry = None
+    if use_registry:
+        from .registry import ModelRegistry
+
+        registry = ModelRegistry.from_config(config)
+        classifier = registry.load(config)
+    else:
+        classifier = _load_classifier(config)
+    typer.echo(f"推論服務啟動於 http://{config.serve_host}:{config.serve_port}")
+    run_server(config, classifier, registry)
+
+
+registry_app = typer.Typer(help="模型登錄庫：列出、推進與回復模型版本。")
+app.add_typer(registry_app, name="registry")
+
+
+@registry_app.command("list")
+def registry_list() -> None:
+    """
+    列出所有版本與其指標，標記目前上線版本。
+    """
+    from .registry import ModelRegistry
+
+    registry = ModelRegistry.from_config(AppConfig())
+    current = registry.current_version()
+    for item in registry.versions():
+        metrics = item.manifest.get("metrics") or {}
+        auc = metrics.get("roc_auc")
+        marker = "*" if item.version == current else " "
+        typer.echo(f"{marker} {item.version}  ROC AUC={auc:.3f}" if auc is not None else f"{marker} {item.version}")
+
+
+@registry_app.command("show")
+def registry_show(version: str = typer.Argument(None, help="版本，預設為上線版本。")) -> None:
+    """
+    顯示版本的 manifest。
+    """
+    import json
+
+    from .registry import ModelRegistry
+
+    registry = ModelRegistry.from_config(AppConfig())
+    item = registry.get(version) if version else registry.current()
+    if item is None:
+        raise typer.BadParameter("登錄庫尚未有上線版本。")
+    typer.echo(json.dumps(item.manifest, ensure_ascii=False, indent=2))
+
+
+@registry_app.command("promote")
+def registry_promote(version: str = typer.Argument(..., help="要上線的版本。")) -> None:
+    """
+    將指定版本推進為上線版本。
+    """
+    from .registry import ModelRegistry
+
+    ModelRegistry.from_config(AppConfig()).promote(version)
+    typer.echo(f"已上線版本: {version}")
+
+
+@registry_app.command("rollback")
+def registry_rollback() -> None:
+    """
+    回復到前一個上線版本。
+    """
+    from .registry import ModelRegistry
+
+    item = ModelRegistry.from_config(AppConfig()).rollback()
+    typer.echo(f"已回復至版本: {item.version}")
+
+
 if __name__ == "__main__":
     app()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 @dataclass(slots=True)
@@ -17,14 +17,70 @@ class AppConfig:
         "master/chapter3/datasets/spam.csv"
     )
     local_data_path: Path = Path("datasets/sms_spam_no_header.csv")
+    data_sha256: Optional[str] = None
+    data_mirror_dir: Optional[Path] = None
+    download_chunk_size: int = 1 << 20
     model_path: Path = Path("models/spam_classifier.joblib")
+    compact_model_path: Path = Path("models/spam_classifier.compact")
+    registry_dir: Path = Path("models/registry")
+    registry_keep: int = 10
+    registry_poll_seconds: float = 5.0
     label_column: str = "label"
     text_column: str = "text"
     random_state: int = 42
     test_size: float = 0.2
     max_features: int = 10000
+    feature_engine: str = "tfidf"
+    hashing_n_features: int = 2**16
+    feature_dtype: str = "float64"
+    quantize_dtype: Optional[str] = None
+    prune_tolerance: float = 0.01
+    class_labels: Tuple[str, ...] = ("ham", "spam")
+    pipeline_params: Dict[str, Any] = field(default_factory=dict)
     cache_dir: Path = Path(".cache")
+    dataset_snapshot: bool = True
+    feature_cache_enabled: bool = False
+    feature_cache_max_bytes: int = 2 * 1024**3
+    feature_cache_max_age: float = 7 * 24 * 3600
     streamlit_cache_ttl: int = 3600
+    eval_curve_points: int = 500
+    decision_strategy: str = "argmax"
+    target_fpr: float = 0.01
+    calibrate_probabilities: bool = False
+    calibration_size: float = 0.2
+    cascade_enabled: bool = False
+    cascade_low: float = 0.05
+    cascade_high: float = 0.95
+    cascade_c: float = 1.0
+    eval_histogram_bins: int = 0
+    serve_host: str = "127.0.0.1"
+    serve_port: int = 8000
+    serve_max_body_bytes: int = 10 * 1024**2
+    batch_max_size: int = 64
+    batch_max_wait_ms: float = 2.0
+    batch_chunk_size: int = 10000
+    n_jobs: int = 1
+    prediction_cache_size: int = 0
+    prediction_cache_ttl: float = 3600.0
+    dedupe_enabled: bool = False
+    dedupe_num_perm: int = 64
+    dedupe_bands: int = 16
+    dedupe_shingle_size: int = 2
+    dedupe_threshold: float = 0.7
+    dedupe_max_clusters: int = 100_000
+    mail_include_subject: bool = True
+    mail_include_sender: bool = False
+    mail_max_chars: int = 100_000
+    mail_jobs: int = -1
+    mail_batch_size: int = 200
+    drift_enabled: bool = False
+    drift_bins: int = 20
+    drift_window: int = 10000
+    drift_sample_rate: float = 1.0
+    drift_psi_threshold: float = 0.2
+    drift_top_k: int = 20
+    drift_sketch_width: int = 4096
+    drift_sketch_depth: int = 4
 
     def ensure_directories(self) -> None:
         """
@@ -43,6 +99,8 @@ class AppConfig:
         data_url: Optional[str] = None,
         local_data_path: Optional[str] = None,
         model_path: Optional[str] = None,
+        feature_engine: Optional[str] = None,
+        cache_dir: Optional[str] = None,
     ) -> "AppConfig":
         """
         建立覆寫特定欄位的設定。
@@ -52,4 +110,6 @@ class AppConfig:
             data_url=data_url or base.data_url,
             local_data_path=Path(local_data_path) if local_data_path else base.local_data_path,
             model_path=Path(model_path) if model_path else base.model_path,
+            feature_engine=feature_engine or base.feature_engine,
+            cache_dir=Path(cache_dir) if cache_dir else base.cache_dir,
         )
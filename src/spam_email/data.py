@@ -1,20 +1,102 @@
 from __future__ import annotations
 
+import csv
+import glob
+import hashlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import IO, Iterator, List, Optional, Tuple
 
 import pandas as pd
-import requests
-from requests import Response
 
 from .config import AppConfig
+from .download import DatasetDownloadError, StreamingDownloader
+from .instrumentation import REGISTRY
 
+try:  # pyarrow 為選用相依套件，未安裝時退回 pandas 直接解析 CSV
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
+    pa_csv = None
 
-class DatasetDownloadError(RuntimeError):
+
+def text_dtype() -> object:
+    """
+    文字欄位使用的字串型別：pandas 3 預設的 `str` 型別本身即以 Arrow 儲存；pandas 2.x 在已安裝
+    pyarrow 時改用 `string[pyarrow]`，兩者都能自 Arrow 快照零複製轉換。否則退回 `str` 的預設型別。
+    """
+    dtype = pd.Series(dtype=str).dtype
+    if isinstance(dtype, pd.StringDtype) or pa is None:
+        return dtype
+    return pd.StringDtype("pyarrow")
+
+
+def detect_csv_columns(
+    first_line: str,
+    text_column: str,
+    label_column: str = "label",
+) -> Tuple[Optional[List[str]], bool]:
     """
-    資料下載失敗時拋出。
+    只檢查首列即判定欄位結構。
+
+    回傳 `(names, has_header)`：若首列已含文字欄位則沿用表頭；否則視為無表頭，
+    並將最後一欄命名為文字欄位、第一欄為標籤欄位。
     """
+    fields = next(csv.reader([first_line]), [])
+    if not fields:
+        raise ValueError("CSV 檔案內沒有任何欄位。")
+    if text_column in fields:
+        return None, True
+
+    names = []
+    for idx in range(len(fields)):
+        if idx == len(fields) - 1:
+            names.append(text_column)
+        elif idx == 0:
+            names.append(label_column)
+        else:
+            names.append(f"col_{idx}")
+    return names, False
+
+
+def _peek_first_line(handle: IO[bytes], encoding: str) -> str:
+    first_line = handle.readline().decode(encoding)
+    handle.seek(0)
+    return first_line
+
+
+def iter_csv_chunks(
+    source: Path | str | IO[bytes],
+    text_column: str,
+    chunk_size: int,
+    encoding: str = "latin1",
+    label_column: str = "label",
+) -> Iterator[pd.DataFrame]:
+    """
+    以固定筆數分塊串流讀取 CSV，欄位結構只偵測一次。
+    """
+    handle = open(source, "rb") if isinstance(source, (str, Path)) else source
+    try:
+        names, has_header = detect_csv_columns(
+            _peek_first_line(handle, encoding),
+            text_column,
+            label_column,
+        )
+        reader = pd.read_csv(
+            handle,
+            encoding=encoding,
+            header=0 if has_header else None,
+            names=names,
+            chunksize=chunk_size,
+        )
+        for chunk in reader:
+            chunk[text_column] = chunk[text_column].astype(str)
+            yield chunk
+    finally:
+        if handle is not source:
+            handle.close()
 
 
 @dataclass(slots=True)
@@ -25,15 +107,19 @@ class DatasetLoader:
 
     config: AppConfig
 
-    def _download(self, dest: Path) -> None:
-        self.config.ensure_directories()
-        try:
-            response: Response = requests.get(self.config.data_url, timeout=30)
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            raise DatasetDownloadError(f"無法下載資料集：{exc}") from exc
+    @property
+    def downloader(self) -> StreamingDownloader:
+        return StreamingDownloader(
+            url=self.config.data_url,
+            sha256=self.config.data_sha256,
+            mirror_dir=self.config.data_mirror_dir,
+            chunk_size=self.config.download_chunk_size,
+        )
 
-        dest.write_bytes(response.content)
+    def _download(self, dest: Path, refresh: bool = False) -> Path:
+        self.config.ensure_directories()
+        with REGISTRY.timer("download", url=self.config.data_url):
+            return self.downloader.fetch(dest, refresh=refresh)
 
     def ensure_local_copy(self) -> Path:
         """
@@ -44,29 +130,148 @@ class DatasetLoader:
             self._download(target)
         return target
 
-    def load(self, source: Optional[Path | str] = None) -> pd.DataFrame:
+    def refresh(self) -> Path:
         """
-        載入資料集為 DataFrame。
+        以 ETag / Last-Modified 條件式請求檢查遠端資料集，僅在有更新時重新下載。
         """
-        if source:
-            path = Path(source)
+        return self._download(self.config.local_data_path, refresh=True)
+
+    def resolve_sources(self, source: Optional[Path | str] = None) -> List[Path]:
+        """
+        解析資料來源：單一檔案、含多個分片 CSV 的目錄，或萬用字元樣式（如 `shards/*.csv`）。
+        """
+        if not source:
+            return [self.ensure_local_copy()]
+        path = Path(source)
+        if path.is_dir():
+            files = sorted(path.glob("*.csv"))
+        elif any(char in str(source) for char in "*?["):
+            files = sorted(Path(match) for match in glob.glob(str(source)))
         else:
-            path = self.ensure_local_copy()
+            files = [path]
+        if not files:
+            raise FileNotFoundError(f"找不到資料集檔案：{source}")
+        return files
 
-        frame = pd.read_csv(path, encoding="latin1")
-        expected_columns = {self.config.label_column, self.config.text_column}
+    def _detect_schema(self, path: Path) -> Tuple[List[str], bool]:
+        with path.open("rb") as handle:
+            first_line = _peek_first_line(handle, "latin1")
+        names, has_header = detect_csv_columns(first_line, self.config.text_column, self.config.label_column)
+        if has_header:
+            names = next(csv.reader([first_line]))
+        # 無表頭且只有一欄時該欄視為文字，沒有標籤可讀
+        if self.config.label_column not in names:
+            raise ValueError(f"資料集缺少 {self.config.label_column} 欄位：{path}")
+        return names, has_header
 
-        if not expected_columns.issubset(set(frame.columns)) or len(frame.columns) < 2:
-            frame = pd.read_csv(
-                path,
+    def _snapshot_prefix(self, path: Path) -> str:
+        # 來源與欄位決定前綴，同一來源的各個版本共用前綴以便淘汰舊快照
+        source = hashlib.sha256(
+            "\0".join([str(path.resolve()), self.config.label_column, self.config.text_column]).encode("utf-8")
+        ).hexdigest()[:12]
+        return f"{path.stem}-{source}-"
+
+    def _snapshot_path(self, path: Path) -> Path:
+        stat = path.stat()
+        version = hashlib.sha256(f"{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8")).hexdigest()[:12]
+        return self.config.cache_dir / "datasets" / f"{self._snapshot_prefix(path)}{version}.arrow"
+
+    def _write_snapshot(self, path: Path, target: Path) -> None:
+        """
+        以串流方式將 CSV 轉為 Arrow IPC 快照，欄位結構只偵測一次；寫入後移除同一來源的舊版快照。
+        """
+        names, has_header = self._detect_schema(path)
+        label, text = self.config.label_column, self.config.text_column
+        reader = pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(
                 encoding="latin1",
-                names=[self.config.label_column, self.config.text_column],
-                header=None,
-            )
-        else:
-            frame = frame[[self.config.label_column, self.config.text_column]]
+                column_names=None if has_header else names,
+            ),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                include_columns=[label, text],
+            ),
+        )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_suffix(f".tmp-{os.getpid()}")
+        try:
+            with pa.OSFile(str(staging), "wb") as sink:
+                with pa.ipc.new_file(sink, reader.schema) as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                staging.unlink()
+        for stale in target.parent.glob(glob.escape(self._snapshot_prefix(path)) + "*.arrow"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
 
-        frame[self.config.label_column] = frame[self.config.label_column].astype(str)
-        frame[self.config.text_column] = frame[self.config.text_column].astype(str)
+    def _read_snapshot(self, path: Path) -> pd.DataFrame:
+        snapshot = self._snapshot_path(path)
+        if not snapshot.exists():
+            self._write_snapshot(path, snapshot)
+        table = pa.ipc.open_file(pa.memory_map(str(snapshot), "r")).read_all()
+        # 文字以 Arrow 字串型別零複製轉為 pandas；標籤字典編碼後轉為 Categorical，都不逐筆建立 Python 字串物件
+        label = self.config.label_column
+        table = table.set_column(
+            table.schema.get_field_index(label), label, table.column(label).dictionary_encode()
+        )
+        return table.to_pandas(types_mapper={pa.string(): text_dtype()}.get, self_destruct=True)
 
-        return frame.dropna()
+    def _read_csv(self, path: Path) -> pd.DataFrame:
+        names, has_header = self._detect_schema(path)
+        frame = pd.read_csv(
+            path,
+            encoding="latin1",
+            header=0 if has_header else None,
+            names=None if has_header else names,
+            usecols=[self.config.label_column, self.config.text_column],
+            dtype=str,
+            keep_default_na=False,
+        )
+        return frame[[self.config.label_column, self.config.text_column]]
+
+    def load(self, source: Optional[Path | str] = None) -> pd.DataFrame:
+        """
+        載入資料集為 DataFrame，支援分片的多檔資料集。
+
+        啟用 `config.dataset_snapshot` 且已安裝 pyarrow 時，首次載入會將 CSV 串流轉為
+        `cache_dir` 下的 Arrow IPC 快照，之後直接以記憶體映射讀取。無論來源為何，
+        標籤欄位皆為字串類別的 Categorical，文字欄位皆為 `text_dtype()`。
+        """
+        use_snapshot = self.config.dataset_snapshot and pa is not None
+        sources = self.resolve_sources(source)
+        with REGISTRY.timer("dataset_load", shards=len(sources), snapshot=use_snapshot) as event:
+            frames = [self._read_snapshot(path) if use_snapshot else self._read_csv(path) for path in sources]
+            frame = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            frame = frame.dropna()
+            # 各分片的類別不同時合併結果會退回一般字串，需再轉為 Categorical
+            if not isinstance(frame[self.config.label_column].dtype, pd.CategoricalDtype):
+                frame[self.config.label_column] = frame[self.config.label_column].astype("category")
+            frame[self.config.text_column] = frame[self.config.text_column].astype(text_dtype())
+            event["rows"] = len(frame)
+        REGISTRY.inc("dataset_rows", len(frame))
+        return frame
+
+    def iter_chunks(
+        self,
+        source: Optional[Path | str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        以固定筆數分塊串流載入資料集，供增量訓練使用。
+        """
+        label, text = self.config.label_column, self.config.text_column
+        for path in self.resolve_sources(source):
+            for chunk in iter_csv_chunks(
+                path,
+                text,
+                chunk_size or self.config.batch_chunk_size,
+                label_column=label,
+            ):
+                chunk = chunk[[label, text]].dropna()
+                chunk[label] = chunk[label].astype(str)
+                yield chunk
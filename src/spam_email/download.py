@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import requests
+
+
+class DatasetDownloadError(RuntimeError):
+    """
+    資料下載失敗時拋出。
+    """
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class StreamingDownloader:
+    """
+    串流下載資料集：分塊寫入暫存檔、支援 HTTP Range 續傳與 ETag / Last-Modified
+    條件式更新，驗證 SHA-256 後才原子改名為目標檔。
+
+    若設定本機鏡像目錄且其中有同名檔案，或 URL 為 `file://`，則直接自本機複製。
+    """
+
+    url: str
+    sha256: Optional[str] = None
+    mirror_dir: Optional[Path] = None
+    chunk_size: int = 1 << 20
+    timeout: float = 30.0
+
+    @staticmethod
+    def _partial_path(dest: Path) -> Path:
+        return dest.with_name(dest.name + ".part")
+
+    @staticmethod
+    def _meta_path(dest: Path) -> Path:
+        return dest.with_name(dest.name + ".meta.json")
+
+    def _read_meta(self, dest: Path) -> Dict[str, str]:
+        path = self._meta_path(dest)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return {}
+
+    def _write_meta(self, dest: Path, meta: Dict[str, str]) -> None:
+        self._meta_path(dest).write_text(json.dumps(meta), encoding="utf-8")
+
+    @staticmethod
+    def _resume_validator(meta: Dict[str, str]) -> Optional[str]:
+        """
+        續傳時 `If-Range` 使用的驗證值：優先採強 ETag，否則退回 Last-Modified。
+        """
+        etag = meta.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return meta.get("last_modified")
+
+    def _local_source(self) -> Optional[Path]:
+        parsed = urlparse(self.url)
+        if parsed.scheme == "file":
+            return Path(url2pathname(unquote(parsed.path)))
+        if self.mirror_dir is not None:
+            candidate = Path(self.mirror_dir) / Path(unquote(parsed.path)).name
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _finalize(self, partial: Path, dest: Path, meta: Dict[str, str]) -> Path:
+        digest = file_sha256(partial, self.chunk_size)
+        if self.sha256 and digest.lower() != self.sha256.lower():
+            partial.unlink(missing_ok=True)
+            raise DatasetDownloadError(f"資料集校驗碼不符：預期 {self.sha256}，實際 {digest}")
+        os.replace(partial, dest)
+        self._write_meta(dest, {**meta, "sha256": digest, "url": self.url})
+        return dest
+
+    def fetch(self, dest: Path | str, refresh: bool = False) -> Path:
+        """
+        下載至 `dest`；`refresh=True` 時以條件式請求檢查遠端是否更新。
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() and not refresh:
+            return dest
+
+        partial = self._partial_path(dest)
+        local = self._local_source()
+        if local is not None:
+            if not local.exists():
+                raise DatasetDownloadError(f"找不到本機資料來源：{local}")
+            shutil.copyfile(local, partial)
+            return self._finalize(partial, dest, {})
+
+        meta = self._read_meta(dest)
+        headers: Dict[str, str] = {}
+        if dest.exists():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        offset = partial.stat().st_size if partial.exists() else 0
+        validator = self._resume_validator(self._read_meta(partial))
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        elif offset:
+            # 無法確認遠端檔案未變更時不續傳，避免將新內容接在過期的暫存檔後面
+            partial.unlink(missing_ok=True)
+            self._meta_path(partial).unlink(missing_ok=True)
+
+        try:
+            with requests.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 304:
+                    return dest
+                if response.status_code == 416:
+                    # 暫存檔已與遠端不一致，捨棄後重新下載
+                    partial.unlink(missing_ok=True)
+                    self._meta_path(partial).unlink(missing_ok=True)
+                    return self.fetch(dest, refresh=refresh)
+                response.raise_for_status()
+
+                remote_meta = {
+                    key: value
+                    for key, value in {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }.items()
+                    if value
+                }
+                self._write_meta(partial, remote_meta)
+                mode = "ab" if response.status_code == 206 else "wb"
+                with partial.open(mode) as handle:
+                    for block in response.iter_content(chunk_size=self.chunk_size):
+                        handle.write(block)
+        except requests.RequestException as exc:
+            raise DatasetDownloadError(f"無法下載資料集：{exc}") from exc
+
+        self._meta_path(partial).unlink(missing_ok=True)
+        return self._finalize(partial, dest, remote_meta)
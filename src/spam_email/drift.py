@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from itertools import compress, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import AppConfig
+from .instrumentation import REGISTRY
+
+BASELINE_VERSION = 1
+# 與 scikit-learn 預設的 token_pattern `\b\w\w+\b` 結果相同；貪婪比對已保證詞界，省去 \b 較快
+_TOKEN = re.compile(r"\w\w+")
+_STOP = -1
+_OOV = -2
+
+
+def baseline_path(model_path: Path | str) -> Path:
+    """
+    漂移基準的附屬檔：`<模型檔名>.drift.npz`。
+    """
+    path = Path(model_path)
+    return path.with_name(path.name + ".drift.npz")
+
+
+def _distribution(counts: np.ndarray, epsilon: float) -> np.ndarray:
+    # 空分箱以 epsilon 平滑，避免對數發散
+    values = np.asarray(counts, dtype=np.float64)
+    total = values.sum()
+    if total <= 0:
+        return np.full(len(values), 1.0 / len(values))
+    values = np.maximum(values / total, epsilon)
+    return values / values.sum()
+
+
+def psi(expected: np.ndarray, actual: np.ndarray, epsilon: float = 1e-4) -> float:
+    """
+    母體穩定度指標（PSI）：`Σ (a - e) · ln(a / e)`；一般以 0.1 / 0.2 作為輕微 / 顯著漂移的門檻。
+    """
+    e, a = _distribution(expected, epsilon), _distribution(actual, epsilon)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def kl_divergence(expected: np.ndarray, actual: np.ndarray, epsilon: float = 1e-4) -> float:
+    """
+    線上流量相對於基準的 KL 散度 `KL(actual ‖ expected)`。
+    """
+    e, a = _distribution(expected, epsilon), _distribution(actual, epsilon)
+    return float(np.sum(a * np.log(a / e)))
+
+
+def frequent_terms(texts: Iterable[str], stop_words: Iterable[str] = (), max_terms: int = 10000) -> List[str]:
+    """
+    取文字中最常出現的單詞，供沒有詞彙表的雜湊特徵引擎作為監控詞彙。
+    """
+    stop = frozenset(stop_words)
+    counts = Counter(token for token in _TOKEN.findall("\n".join(texts).lower()) if token not in stop)
+    return [term for term, _ in counts.most_common(max_terms)]
+
+
+def frequency_groups(token_counts: np.ndarray, bins: int) -> np.ndarray:
+    """
+    依命中次數由高至低將詞彙切成 `bins` 個命中量相等的分組；OOV（最後一格）為第 `bins` 組。
+    """
+    counts = np.asarray(token_counts[:-1], dtype=np.float64)
+    order = np.argsort(-counts, kind="stable")
+    total = counts.sum()
+    # 以每個詞在累積命中量中的起點分組，高頻詞可能獨佔一組
+    start = (np.cumsum(counts[order]) - counts[order]) / total if total else np.ones(len(counts))
+    groups = np.empty(len(counts) + 1, dtype=np.int32)
+    groups[order] = np.minimum((start * bins).astype(np.int32), bins - 1)
+    groups[order[counts[order] == 0]] = bins - 1
+    groups[-1] = bins
+    return groups
+
+
+def probability_histogram(probabilities: np.ndarray, bins: int) -> np.ndarray:
+    """
+    以 `[0, 1]` 等寬分箱累計垃圾郵件機率。
+    """
+    scores = np.asarray(probabilities, dtype=np.float64)
+    return np.bincount(np.clip((scores * bins).astype(np.intp), 0, bins - 1), minlength=bins)
+
+
+@dataclass(slots=True)
+class DriftBaseline:
+    """
+    訓練時的流量基準：驗證集的垃圾郵件機率直方圖，以及每個監控詞彙的命中次數。
+
+    `token_counts` 最後一格為詞彙表外（OOV）詞數；停用詞不計入。逐詞比較分布時樣本太稀疏，
+    因此詞彙依頻率排序後切成 `bins` 個命中量相等的分組（`groups`，未出現的詞歸入最後一組），
+    OOV 自成一組，詞彙分布的 PSI 以這些分組計算。
+    """
+
+    vocabulary: np.ndarray
+    token_counts: np.ndarray
+    probability_counts: np.ndarray
+    groups: np.ndarray
+    messages: int
+    stop_words: Tuple[str, ...] = ()
+    _index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = {str(term): idx for idx, term in enumerate(self.vocabulary)}
+        for word in self.stop_words:
+            self._index.setdefault(word, _STOP)
+
+    def group_counts(self, token_counts: np.ndarray) -> np.ndarray:
+        """
+        將詞彙命中計數彙總為頻率分組（最後一格為 OOV）。
+        """
+        return np.bincount(self.groups, weights=token_counts, minlength=self.bins + 1)
+
+    @property
+    def bins(self) -> int:
+        return len(self.probability_counts)
+
+    @property
+    def hit_rates(self) -> np.ndarray:
+        """
+        每封郵件平均命中各詞彙的次數。
+        """
+        return self.token_counts[:-1] / max(self.messages, 1)
+
+    @property
+    def oov_rate(self) -> float:
+        total = self.token_counts.sum()
+        return float(self.token_counts[-1] / total) if total else 0.0
+
+    def scan(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        一次斷詞整批郵件，回傳詞彙命中計數（最後一格為 OOV 數）與 OOV 詞清單。
+        """
+        tokens = _TOKEN.findall("\n".join(map(str, texts)).lower())
+        columns = np.fromiter(map(self._index.get, tokens, repeat(_OOV)), dtype=np.intp, count=len(tokens))
+        oov = columns == _OOV
+        counts = np.bincount(columns[columns >= 0], minlength=len(self.vocabulary) + 1)
+        counts[-1] = np.count_nonzero(oov)
+        return counts, list(compress(tokens, oov.tolist()))
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        probabilities: np.ndarray,
+        vocabulary: Sequence[str],
+        stop_words: Iterable[str] = (),
+        bins: int = 20,
+        reference_texts: Optional[Sequence[str]] = None,
+    ) -> "DriftBaseline":
+        """
+        以驗證集郵件與其垃圾郵件機率建立基準；`vocabulary` 通常為模型詞彙表中的單詞。
+
+        頻率分組以 `reference_texts`（通常為訓練集）決定：若以驗證集本身分組，
+        恰好在驗證集中較常出現的詞會被分到高頻組，同分布的流量也會呈現假性漂移。
+        """
+        texts = list(texts)
+        baseline = cls(
+            vocabulary=np.asarray(list(vocabulary), dtype=str),
+            token_counts=np.zeros(len(vocabulary) + 1, dtype=np.int64),
+            probability_counts=probability_histogram(probabilities, bins),
+            groups=np.zeros(len(vocabulary) + 1, dtype=np.int32),
+            messages=len(texts),
+            stop_words=tuple(sorted(stop_words)),
+        )
+        baseline.token_counts, _ = baseline.scan(texts)
+        reference = baseline.token_counts if reference_texts is None else baseline.scan(list(reference_texts))[0]
+        baseline.groups = frequency_groups(reference, bins)
+        return baseline
+
+    def restrict(self, vocabulary: Iterable[str]) -> "DriftBaseline":
+        """
+        只保留仍在 `vocabulary` 中的詞，其餘詞的命中次數併入 OOV；保留原本的分組與驗證集計數，
+        不需重新掃描郵件。供剪枝後的模型沿用訓練時建立的基準。
+        """
+        kept = set(vocabulary)
+        keep = np.fromiter((str(term) in kept for term in self.vocabulary), dtype=bool, count=len(self.vocabulary))
+        dropped = self.token_counts[:-1][~keep].sum()
+        token_counts = np.append(self.token_counts[:-1][keep], self.token_counts[-1] + dropped)
+        return type(self)(
+            vocabulary=self.vocabulary[keep],
+            token_counts=token_counts,
+            probability_counts=self.probability_counts.copy(),
+            groups=np.append(self.groups[:-1][keep], self.groups[-1]),
+            messages=self.messages,
+            stop_words=self.stop_words,
+        )
+
+    def save(self, path: Path | str) -> Path:
+        """
+        寫成 NPZ 後原子改名。
+        """
+        target = Path(path)
+        staging = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        meta = {"baseline_version": BASELINE_VERSION, "messages": self.messages}
+        try:
+            with staging.open("wb") as handle:
+                np.savez(
+                    handle,
+                    vocabulary=self.vocabulary,
+                    token_counts=self.token_counts,
+                    probability_counts=self.probability_counts,
+                    groups=self.groups,
+                    stop_words=np.asarray(self.stop_words, dtype=str),
+                    meta=np.array(json.dumps(meta)),
+                )
+            os.replace(staging, target)
+        finally:
+            staging.unlink(missing_ok=True)
+        return target
+
+    @classmethod
+    def load(cls, path: Path | str) -> Optional["DriftBaseline"]:
+        """
+        讀取基準；檔案不存在或格式版本不符時回傳 `None`。
+        """
+        target = Path(path)
+        if not target.exists():
+            return None
+        with np.load(target, allow_pickle=False) as archive:
+            meta = json.loads(str(archive["meta"]))
+            if meta.get("baseline_version") != BASELINE_VERSION:
+                return None
+            return cls(
+                vocabulary=archive["vocabulary"],
+                token_counts=archive["token_counts"],
+                probability_counts=archive["probability_counts"],
+                groups=archive["groups"],
+                messages=int(meta["messages"]),
+                stop_words=tuple(archive["stop_words"].tolist()),
+            )
+
+
+@dataclass(slots=True)
+class CountMinSketch:
+    """
+    固定大小的 Count-Min Sketch：估計值只會高估，誤差上限約為總數的 `e / width`。
+    """
+
+    width: int = 4096
+    depth: int = 4
+    seed: int = 7
+    total: int = 0
+    table: np.ndarray = field(init=False, repr=False)
+    _a: np.ndarray = field(init=False, repr=False)
+    _b: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        rng = np.random.default_rng(self.seed)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self._a = rng.integers(0, 2**32, size=(self.depth, 1), dtype=np.uint32) | np.uint32(1)
+        self._b = rng.integers(0, 2**32, size=(self.depth, 1), dtype=np.uint32)
+
+    def _columns(self, items: Sequence[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint32, count=len(items))
+        mixed = self._a * hashes + self._b
+        mixed ^= mixed >> np.uint32(16)
+        return (mixed % np.uint32(self.width)).astype(np.intp)
+
+    def add(self, items: Sequence[str], counts: Optional[Sequence[int]] = None) -> None:
+        if not len(items):
+            return
+        counts = np.ones(len(items), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        columns = self._columns(items)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, items: Sequence[str]) -> np.ndarray:
+        if not len(items):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(items)
+        return self.table[np.arange(self.depth)[:, np.newaxis], columns].min(axis=0)
+
+    def clear(self) -> None:
+        self.table[:] = 0
+        self.total = 0
+
+
+@dataclass(slots=True)
+class DriftReport:
+    """
+    一個監控視窗的漂移分數；`drifted` 代表任一 PSI 達到門檻，建議以新資料重新訓練。
+    """
+
+    messages: int
+    probability_psi: float
+    probability_kl: float
+    feature_psi: float
+    feature_kl: float
+    oov_rate: float
+    baseline_oov_rate: float
+    drifted: bool
+    top_oov: List[Tuple[str, int]] = field(default_factory=list)
+    top_features: List[Tuple[str, float, float]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class DriftMonitor:
+    """
+    掛在推論路徑上的串流漂移監控，記憶體只與分箱數、詞彙量與 sketch 大小有關。
+
+    每封郵件只更新機率直方圖、詞彙命中計數與 OOV 詞的 Count-Min Sketch（攤銷 O(1)）；
+    每累積 `window` 封計算一次相對於基準的 PSI / KL 並輸出為 `spam_drift_*` 量表，再開始新視窗。
+    OOV 詞另以有界的候選表追蹤出現最多者，不保存任何郵件內容。
+    `sample_rate` 小於 1 時只隨機抽樣部分郵件更新草圖，視窗以抽樣後的郵件數計算。
+    """
+
+    baseline: DriftBaseline
+    window: int = 10000
+    psi_threshold: float = 0.2
+    top_k: int = 20
+    sample_rate: float = 1.0
+    sketch: CountMinSketch = field(default_factory=CountMinSketch)
+    messages: int = 0
+    window_messages: int = 0
+    last_report: Optional[DriftReport] = None
+    probability_counts: np.ndarray = field(init=False, repr=False)
+    token_counts: np.ndarray = field(init=False, repr=False)
+    _heavy: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _rng: np.random.Generator = field(default_factory=np.random.default_rng, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.probability_counts = np.zeros(self.baseline.bins, dtype=np.int64)
+        self.token_counts = np.zeros_like(self.baseline.token_counts)
+
+    @classmethod
+    def from_config(cls, config: AppConfig, baseline: DriftBaseline) -> "DriftMonitor":
+        return cls(
+            baseline=baseline,
+            window=config.drift_window,
+            psi_threshold=config.drift_psi_threshold,
+            top_k=config.drift_top_k,
+            sample_rate=config.drift_sample_rate,
+            sketch=CountMinSketch(width=config.drift_sketch_width, depth=config.drift_sketch_depth),
+        )
+
+    def observe(self, texts: Sequence[str], probabilities: np.ndarray) -> Optional[DriftReport]:
+        """
+        以一批推論結果更新草圖；視窗滿時計算漂移分數並回傳報告，否則回傳 `None`。
+        """
+        texts = list(texts)
+        REGISTRY.inc("drift_messages", len(texts))
+        probabilities = np.asarray(probabilities)
+        if self.sample_rate < 1.0:
+            with self._lock:
+                sampled = np.flatnonzero(self._rng.random(len(texts)) < self.sample_rate)
+            texts = [texts[idx] for idx in sampled]
+            probabilities = probabilities[sampled]
+        if not texts:
+            return None
+        histogram = probability_histogram(probabilities[:, 1], self.baseline.bins)
+        counts, oov = self.baseline.scan(texts)
+        oov_counts = Counter(oov)
+        terms = list(oov_counts)
+
+        with self._lock:
+            self.probability_counts += histogram
+            self.token_counts += counts
+            self.sketch.add(terms, list(oov_counts.values()))
+            self._track_heavy(terms)
+            self.messages += len(texts)
+            self.window_messages += len(texts)
+            report = None
+            if self.window_messages >= self.window:
+                report = self._evaluate()
+                self.probability_counts[:] = 0
+                self.token_counts[:] = 0
+                self.window_messages = 0
+        return report
+
+    def _track_heavy(self, terms: List[str]) -> None:
+        # 候選表只保留 sketch 估計次數最高的詞，大小固定為 top_k 的數倍
+        for term, estimate in zip(terms, self.sketch.estimate(terms).tolist()):
+            self._heavy[term] = estimate
+        capacity = self.top_k * 8
+        if len(self._heavy) > capacity * 2:
+            kept = sorted(self._heavy.items(), key=lambda item: -item[1])[:capacity]
+            self._heavy = dict(kept)
+
+    def _ranked_oov(self, top_n: int) -> List[Tuple[str, int]]:
+        return sorted(self._heavy.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+
+    def top_oov(self, top_n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        回傳估計出現次數最多的詞彙表外詞。
+        """
+        with self._lock:
+            return self._ranked_oov(top_n or self.top_k)
+
+    def _evaluate(self) -> DriftReport:
+        baseline = self.baseline
+        live_rates = self.token_counts[:-1] / max(self.window_messages, 1)
+        shift = np.abs(live_rates - baseline.hit_rates)
+        top = np.argsort(shift)[::-1][: self.top_k]
+        total = self.token_counts.sum()
+        report = DriftReport(
+            messages=self.window_messages,
+            probability_psi=psi(baseline.probability_counts, self.probability_counts),
+            probability_kl=kl_divergence(baseline.probability_counts, self.probability_counts),
+            feature_psi=psi(baseline.group_counts(baseline.token_counts), baseline.group_counts(self.token_counts)),
+            feature_kl=kl_divergence(
+                baseline.group_counts(baseline.token_counts), baseline.group_counts(self.token_counts)
+            ),
+            oov_rate=float(self.token_counts[-1] / total) if total else 0.0,
+            baseline_oov_rate=baseline.oov_rate,
+            drifted=False,
+            top_oov=self._ranked_oov(self.top_k),
+            top_features=[
+                (str(baseline.vocabulary[idx]), float(baseline.hit_rates[idx]), float(live_rates[idx]))
+                for idx in top
+                if shift[idx] > 0
+            ],
+        )
+        report.drifted = max(report.probability_psi, report.feature_psi) >= self.psi_threshold
+        for signal, value in (("probability", report.probability_psi), ("features", report.feature_psi)):
+            REGISTRY.set_gauge("drift_psi", value, signal=signal)
+        for signal, value in (("probability", report.probability_kl), ("features", report.feature_kl)):
+            REGISTRY.set_gauge("drift_kl", value, signal=signal)
+        REGISTRY.set_gauge("drift_oov_rate", report.oov_rate)
+        REGISTRY.set_gauge("drift_alert", float(report.drifted))
+        self.last_report = report
+        return report
+
+    def evaluate(self) -> Optional[DriftReport]:
+        """
+        立即以目前視窗（不重設）計算漂移分數；尚無資料時回傳 `None`。
+        """
+        with self._lock:
+            return self._evaluate() if self.window_messages else None
+
+    def stats(self) -> Dict[str, Any]:
+        last = self.last_report
+        return {
+            "messages": self.messages,
+            "window_messages": self.window_messages,
+            "last_report": last.to_dict() if last is not None else None,
+        }
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .metrics import MetricsReport
+
+
+def downsample_curve(*arrays: np.ndarray, max_points: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+    """
+    以等距索引將曲線降採樣至最多 `max_points` 點，並保留首尾端點。
+    """
+    size = len(arrays[0])
+    if not max_points or size <= max_points:
+        return arrays
+    keep = np.unique(np.linspace(0, size - 1, max(max_points, 2)).round().astype(np.intp))
+    return tuple(array[keep] for array in arrays)
+
+
+def downsample_pr_curve(
+    recall: np.ndarray,
+    precision: np.ndarray,
+    thresholds: np.ndarray,
+    max_points: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    降採樣 scikit-learn 格式的 PR 曲線：前 n 個點與 n 個門檻以相同索引一起取樣，
+    末端沒有門檻的 (recall=0, precision=1) 端點另外保留，門檻與點的對應關係不變。
+    """
+    if not max_points or len(recall) <= max_points:
+        return recall, precision, thresholds
+    n = len(thresholds)
+    recall_ds, precision_ds, thresholds_ds = downsample_curve(
+        recall[:n], precision[:n], thresholds, max_points=max(max_points - 1, 1)
+    )
+    return np.r_[recall_ds, recall[n:]], np.r_[precision_ds, precision[n:]], thresholds_ds
+
+
+def curves_from_counts(
+    tps: np.ndarray,
+    fps: np.ndarray,
+    thresholds: np.ndarray,
+    max_points: Optional[int] = None,
+) -> Tuple[float, Tuple[np.ndarray, ...], Tuple[np.ndarray, ...]]:
+    """
+    由門檻值遞減排列的累積 TP / FP 計數計算 ROC AUC、ROC 曲線與 PR 曲線。
+
+    AUC 以完整計數計算，降採樣只影響回傳的曲線點。
+    """
+    positives = tps[-1] if len(tps) else 0
+    negatives = fps[-1] if len(fps) else 0
+
+    fpr = np.r_[0.0, fps / negatives] if negatives else np.full(len(fps) + 1, np.nan)
+    tpr = np.r_[0.0, tps / positives] if positives else np.full(len(tps) + 1, np.nan)
+    roc_thresholds = np.r_[np.inf, thresholds]
+    roc_auc = float("nan")
+    if positives and negatives:
+        roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+
+    predicted = tps + fps
+    precision = np.divide(tps, predicted, out=np.zeros(len(tps)), where=predicted > 0)
+    recall = tps / positives if positives else np.zeros(len(tps))
+    # 與 scikit-learn 相同：門檻值遞增排列，並在末端補上 (recall=0, precision=1)
+    precision = np.r_[precision[::-1], 1.0]
+    recall = np.r_[recall[::-1], 0.0]
+    pr_thresholds = thresholds[::-1]
+
+    roc = downsample_curve(fpr, tpr, roc_thresholds, max_points=max_points)
+    pr = downsample_pr_curve(recall, precision, pr_thresholds, max_points=max_points)
+    return roc_auc, roc, pr
+
+
+def cumulative_counts(scores: np.ndarray, positive: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    以單次排序取得各相異門檻（遞減）下的累積 TP / FP 計數。
+    """
+    if len(scores) == 0:
+        empty = np.empty(0)
+        return empty, empty, empty
+    order = np.argsort(-scores, kind="mergesort")
+    scores = scores[order]
+    positive = positive[order]
+    # 只在分數改變處取累積計數，相同分數視為同一門檻
+    distinct = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tps = np.cumsum(positive, dtype=np.int64)[distinct]
+    fps = distinct + 1 - tps
+    return tps, fps, scores[distinct]
+
+
+@dataclass(slots=True)
+class StreamingEvaluator:
+    """
+    逐塊累積評估資料，最後以單次排序計算全部指標。
+
+    混淆矩陣以計數累加；`histogram_bins` 大於 0 時分數改以固定分箱的正負樣本直方圖
+    累積，記憶體與資料量無關，曲線精度為分箱寬度。否則保留分數與正樣本旗標，
+    於 `finalize` 時只排序一次。
+    """
+
+    labels: List[str]
+    curve_points: Optional[int] = None
+    histogram_bins: int = 0
+    confusion: np.ndarray = field(init=False)
+    positive_hist: Optional[np.ndarray] = field(init=False, default=None)
+    negative_hist: Optional[np.ndarray] = field(init=False, default=None)
+    scores: List[np.ndarray] = field(init=False, default_factory=list)
+    positives: List[np.ndarray] = field(init=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.labels = [str(label) for label in self.labels]
+        if len(self.labels) != 2:
+            raise ValueError("評估引擎僅支援二元分類標籤。")
+        self.confusion = np.zeros((2, 2), dtype=np.int64)
+        if self.histogram_bins:
+            self.positive_hist = np.zeros(self.histogram_bins, dtype=np.int64)
+            self.negative_hist = np.zeros(self.histogram_bins, dtype=np.int64)
+
+    def _codes(self, values: Sequence) -> np.ndarray:
+        return pd.Categorical(np.asarray(values).astype(str), categories=self.labels).codes
+
+    def update(self, y_true: Sequence, y_pred: Sequence, y_score: Sequence[float]) -> None:
+        """
+        累加一個區塊；`y_score` 為正類（`labels[1]`）的機率。
+        """
+        true_codes = self._codes(y_true)
+        pred_codes = self._codes(y_pred)
+        valid = (true_codes >= 0) & (pred_codes >= 0)
+        self.confusion += np.bincount(
+            true_codes[valid] * 2 + pred_codes[valid],
+            minlength=4,
+        ).reshape(2, 2)
+
+        is_positive = true_codes == 1
+        score = np.asarray(y_score, dtype=np.float64)
+        if self.histogram_bins:
+            bins = np.clip((score * self.histogram_bins).astype(np.intp), 0, self.histogram_bins - 1)
+            self.positive_hist += np.bincount(bins[is_positive], minlength=self.histogram_bins)
+            self.negative_hist += np.bincount(bins[~is_positive], minlength=self.histogram_bins)
+        else:
+            self.scores.append(score)
+            self.positives.append(is_positive)
+
+    def _cumulative_counts(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self.histogram_bins:
+            occupied = (self.positive_hist + self.negative_hist)[::-1] > 0
+            tps = np.cumsum(self.positive_hist[::-1])[occupied]
+            fps = np.cumsum(self.negative_hist[::-1])[occupied]
+            edges = np.linspace(0.0, 1.0, self.histogram_bins + 1)[:-1][::-1]
+            return tps, fps, edges[occupied]
+
+        if not self.scores:
+            return cumulative_counts(np.empty(0), np.empty(0, dtype=bool))
+        return cumulative_counts(np.concatenate(self.scores), np.concatenate(self.positives))
+
+    def finalize(self) -> "MetricsReport":
+        from .metrics import MetricsReport
+
+        confusion = self.confusion
+        true_totals = confusion.sum(axis=1)
+        pred_totals = confusion.sum(axis=0)
+        diagonal = np.diag(confusion).astype(np.float64)
+        precision = np.divide(diagonal, pred_totals, out=np.zeros(2), where=pred_totals > 0)
+        recall = np.divide(diagonal, true_totals, out=np.zeros(2), where=true_totals > 0)
+        denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, denominator, out=np.zeros(2), where=denominator > 0)
+
+        roc_auc, roc_curve, pr_curve = curves_from_counts(
+            *self._cumulative_counts(),
+            max_points=self.curve_points,
+        )
+        return MetricsReport(
+            labels=self.labels,
+            precision=dict(zip(self.labels, precision.tolist())),
+            recall=dict(zip(self.labels, recall.tolist())),
+            f1=dict(zip(self.labels, f1.tolist())),
+            support=dict(zip(self.labels, true_totals.astype(float).tolist())),
+            roc_auc=roc_auc,
+            confusion_matrix=pd.DataFrame(
+                confusion,
+                index=[f"實際-{label}" for label in self.labels],
+                columns=[f"預測-{label}" for label in self.labels],
+            ),
+            roc_curve=roc_curve,
+            pr_curve=pr_curve,
+        )
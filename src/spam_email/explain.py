@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+@dataclass(slots=True)
+class Explanation:
+    """
+    單封郵件的預測結果與貢獻最大的詞項；權重為正代表推向垃圾郵件。
+    """
+
+    label: str
+    spam_probability: float
+    contributions: List[Tuple[str, float]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "spam_probability": self.spam_probability,
+            "contributions": [{"term": term, "weight": weight} for term, weight in self.contributions],
+        }
+
+
+@dataclass(slots=True)
+class LinearExplainer:
+    """
+    直接以稀疏特徵列與線性模型係數計算詞項貢獻，不需重新執行管線。
+
+    貢獻值為 `x_ij * coef_j`，整批以單次排序取得每列前 k 名；
+    特徵名稱與係數依欄位對齊預先建立，雜湊特徵則以 `hash:<欄位>` 命名。
+    """
+
+    coef: np.ndarray
+    feature_names: Optional[np.ndarray] = None
+    term_index: Dict[str, int] = field(default_factory=dict, repr=False)
+    model_version: Optional[str] = None
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Any, model_version: Optional[str] = None) -> "LinearExplainer":
+        clf = pipeline[-1]
+        coef = np.asarray(clf.coef_)
+        if coef.ndim != 2 or coef.shape[0] != 1:
+            raise ValueError("詞項解釋僅支援二元線性分類模型。")
+        vectorizer = pipeline[0]
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        names = None
+        if vocabulary is not None:
+            names = np.asarray(vectorizer.get_feature_names_out(), dtype=object)
+        return cls(
+            coef=coef[0].astype(np.float64),
+            feature_names=names,
+            term_index=dict(vocabulary) if vocabulary is not None else {},
+            model_version=model_version,
+        )
+
+    def term_name(self, column: int) -> str:
+        if self.feature_names is None:
+            return f"hash:{column}"
+        return str(self.feature_names[column])
+
+    def weight(self, term: str) -> float:
+        """
+        查詢詞項的模型係數；雜湊特徵可直接傳入 `hash:<欄位>`。
+        """
+        if term.startswith("hash:") and self.feature_names is None:
+            return float(self.coef[int(term[5:])])
+        column = self.term_index.get(term)
+        return float(self.coef[column]) if column is not None else 0.0
+
+    def top_contributions(self, features: Any, top_k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        依貢獻絕對值取得每列前 `top_k` 個詞項。
+        """
+        matrix = sparse.csr_matrix(features)
+        n_rows = matrix.shape[0]
+        counts = np.diff(matrix.indptr)
+        rows = np.repeat(np.arange(n_rows), counts)
+        values = matrix.data * self.coef[matrix.indices]
+
+        order = np.lexsort((-np.abs(values), rows))
+        ranks = np.arange(len(order)) - matrix.indptr[rows[order]]
+        keep = order[ranks < top_k]
+
+        results: List[List[Tuple[str, float]]] = [[] for _ in range(n_rows)]
+        for row, column, value in zip(rows[keep], matrix.indices[keep], values[keep]):
+            results[row].append((self.term_name(int(column)), float(value)))
+        return results
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+
+_ARRAYS = ("data", "indices", "indptr")
+
+
+def content_hash(texts: Iterable[str]) -> str:
+    """
+    計算文字序列的內容雜湊，作為資料集版本鍵。
+    """
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(str(text).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def frame_hash(frame: pd.DataFrame, columns: Sequence[str]) -> str:
+    """
+    以向量化的逐列雜湊計算資料表指定欄位的內容雜湊，大型資料集上遠快於 `content_hash`。
+    """
+    rows = pd.util.hash_pandas_object(frame[list(columns)], index=False)
+    return hashlib.sha256(rows.to_numpy().tobytes()).hexdigest()
+
+
+def params_hash(steps: Iterable[Any]) -> str:
+    """
+    以特徵步驟的類別與參數（含 scikit-learn 版本）計算設定雜湊。
+    """
+    description = [sklearn.__version__]
+    for step in steps:
+        params = sorted((key, repr(value)) for key, value in step.get_params(deep=False).items())
+        description.append([type(step).__name__, params])
+    return hashlib.sha256(json.dumps(description).encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class FeatureCache:
+    """
+    以磁碟保存稀疏特徵矩陣的快取，依資料內容雜湊與向量化參數建立鍵值。
+
+    每個項目為一個目錄，CSR 矩陣的 data / indices / indptr 分別存為 `.npy`，
+    讀取時以記憶體映射載入；超過容量或存放期限的項目依最後使用時間淘汰。
+    """
+
+    directory: Path
+    max_bytes: int = 2 * 1024**3
+    max_age: float = 7 * 24 * 3600
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:32]
+
+    def _entry(self, key: str) -> Path:
+        return Path(self.directory) / key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        取出快取項目；矩陣以唯讀 mmap 載入，其他物件以 joblib 載入。
+        """
+        entry = self._entry(key)
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        values: Dict[str, Any] = {}
+        for name, shape in meta["matrices"].items():
+            data, indices, indptr = (np.load(entry / f"{name}.{part}.npy", mmap_mode="r") for part in _ARRAYS)
+            values[name] = sparse.csr_matrix((data, indices, indptr), shape=tuple(shape), copy=False)
+        for name in meta["objects"]:
+            values[name] = joblib.load(entry / f"{name}.joblib")
+        os.utime(meta_path)
+        return values
+
+    def put(self, key: str, values: Dict[str, Any]) -> None:
+        """
+        寫入快取項目：先寫入暫存目錄再原子改名，避免讀到寫一半的項目。
+        """
+        root = Path(self.directory)
+        root.mkdir(parents=True, exist_ok=True)
+        staging = root / f".tmp-{uuid.uuid4().hex}"
+        staging.mkdir()
+        meta: Dict[str, Any] = {"matrices": {}, "objects": [], "created": time.time()}
+        try:
+            for name, value in values.items():
+                if sparse.issparse(value):
+                    matrix = sparse.csr_matrix(value)
+                    for part in _ARRAYS:
+                        np.save(staging / f"{name}.{part}.npy", getattr(matrix, part))
+                    meta["matrices"][name] = list(matrix.shape)
+                else:
+                    joblib.dump(value, staging / f"{name}.joblib")
+                    meta["objects"].append(name)
+            (staging / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+            target = self._entry(key)
+            if target.exists():
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        刪除過期項目，並由最久未使用者開始刪除直到總容量低於上限。
+        """
+        root = Path(self.directory)
+        if not root.exists():
+            return
+        now = time.time()
+        entries = []
+        for entry in root.iterdir():
+            meta_path = entry / "meta.json"
+            if entry.name.startswith(".tmp-") or not meta_path.exists():
+                continue
+            last_used = meta_path.stat().st_mtime
+            if now - last_used > self.max_age:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(item.stat().st_size for item in entry.iterdir())
+            entries.append((last_used, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import html
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from email.header import decode_header
+from email.message import Message
+from email.parser import BytesParser
+from email.policy import compat32
+from functools import partial
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import AppConfig
+from .instrumentation import REGISTRY
+
+MAIL_SUFFIXES = frozenset({".eml", ".mbox", ".mbx"})
+
+RawMessage = Tuple[str, bytes]
+
+# compat32 不建立結構化標頭物件，解析速度遠快於 email.policy.default
+_PARSER = BytesParser(policy=compat32)
+_HEADER_LINE = re.compile(rb"^[!-9;-~]+:")
+_HTML_DROP = re.compile(r"<(script|style|head)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]*>")
+# mboxrd 將本文中的 `From ` 行跳脫為 `>From `、`>>From ` 等，讀取時去掉一個 `>`
+_MBOXRD_QUOTED = re.compile(rb">+From ")
+
+
+def _is_mbox(path: Path) -> bool:
+    with path.open("rb") as handle:
+        return handle.read(5) == b"From "
+
+
+def _looks_like_message(path: Path) -> bool:
+    with path.open("rb") as handle:
+        return bool(_HEADER_LINE.match(handle.readline(4096)))
+
+
+def resolve_mail_sources(source: Path | str) -> List[Tuple[str, Path]]:
+    """
+    解析郵件來源為 `(kind, path)` 清單，`kind` 為 `mbox`（多封郵件）或 `eml`（單封郵件）。
+
+    目錄會遞迴搜尋：Maildir 的 `cur/`、`new/` 內每個檔案為一封郵件（略過投遞中的 `tmp/`）；
+    其餘檔案以 `.eml` 副檔名、mbox 的 `From ` 分隔列或首列為郵件標頭判斷。
+    """
+    path = Path(source)
+    if path.is_file():
+        return [("mbox" if _is_mbox(path) else "eml", path)]
+    if not path.is_dir():
+        raise FileNotFoundError(f"找不到郵件來源：{source}")
+
+    sources: List[Tuple[str, Path]] = []
+    for root, dirs, files in os.walk(path):
+        current = Path(root)
+        maildir = current.name in {"cur", "new"} and (current.parent / "cur").is_dir()
+        dirs[:] = sorted(name for name in dirs if not (name == "tmp" and (current / "cur").is_dir()))
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            file = current / name
+            if maildir or file.suffix.lower() == ".eml":
+                sources.append(("eml", file))
+            elif file.suffix.lower() in MAIL_SUFFIXES or _is_mbox(file):
+                sources.append(("mbox", file))
+            elif _looks_like_message(file):
+                sources.append(("eml", file))
+    return sources
+
+
+def iter_mbox(path: Path | str) -> Iterator[bytes]:
+    """
+    逐封串流讀取 mbox，不建立整個檔案的索引。
+
+    只有位於檔首或空行之後、以 `From ` 開頭的行才是分隔列，本文中未跳脫的 `From ` 行不會切開郵件；
+    `>From ` 等跳脫行依 mboxrd 還原。
+    """
+    lines: List[bytes] = []
+    after_blank = True
+    with open(path, "rb") as handle:
+        for line in handle:
+            if after_blank and line.startswith(b"From "):
+                if lines:
+                    yield b"".join(lines)
+                lines = []
+                after_blank = False
+                continue
+            after_blank = not line.strip(b"\r\n")
+            lines.append(line[1:] if _MBOXRD_QUOTED.match(line) else line)
+    if lines:
+        yield b"".join(lines)
+
+
+def count_messages(source: Path | str) -> int:
+    """
+    計算來源中的郵件數，只切分 mbox 而不解析 MIME。
+    """
+    return sum(sum(1 for _ in iter_mbox(path)) if kind == "mbox" else 1 for kind, path in resolve_mail_sources(source))
+
+
+def iter_raw_messages(source: Path | str) -> Iterator[RawMessage]:
+    """
+    依序產生 `(來源識別, 原始位元組)`；mbox 內的郵件以 `<路徑>#<序號>` 識別。
+    """
+    for kind, path in resolve_mail_sources(source):
+        if kind == "mbox":
+            for idx, raw in enumerate(iter_mbox(path)):
+                yield f"{path}#{idx}", raw
+        else:
+            yield str(path), path.read_bytes()
+
+
+def _decode(payload: bytes, charset: Optional[str]) -> str:
+    try:
+        return payload.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        # 未知或拼錯的字元集名稱
+        return payload.decode("latin-1")
+
+
+def decode_header_value(value: Optional[str]) -> str:
+    """
+    解碼 RFC 2047 編碼的標頭；未編碼的 8 位元標頭以 UTF-8 還原。
+    """
+    if not value:
+        return ""
+    value = str(value)
+    try:
+        parts = decode_header(value)
+    except Exception:
+        parts = [(value, None)]
+    decoded = []
+    for chunk, charset in parts:
+        if isinstance(chunk, bytes):
+            decoded.append(_decode(chunk, charset))
+        else:
+            decoded.append(chunk.encode("utf-8", "surrogateescape").decode("utf-8", "replace"))
+    return " ".join("".join(decoded).split())
+
+
+def html_to_text(markup: str) -> str:
+    """
+    移除 script / style / head 區塊、註解與標籤，並還原 HTML 實體。
+    """
+    return html.unescape(_HTML_TAG.sub(" ", _HTML_DROP.sub(" ", markup)))
+
+
+def message_body(message: Message) -> str:
+    """
+    擷取郵件本文：依各部分的字元集解碼，略過附件；有純文字部分時優先採用，否則將 HTML 轉為文字。
+    """
+    plain: List[str] = []
+    markup: List[str] = []
+    for part in message.walk():
+        if part.is_multipart() or part.get_content_maintype() != "text":
+            continue
+        if part.get_content_disposition() == "attachment":
+            continue
+        payload = part.get_payload(decode=True)
+        if not payload:
+            continue
+        text = _decode(payload, part.get_content_charset())
+        (markup if part.get_content_subtype() == "html" else plain).append(text)
+    if plain:
+        return " ".join(plain)
+    return " ".join(map(html_to_text, markup))
+
+
+@dataclass(slots=True)
+class MailMessage:
+    """
+    解析後的單封郵件；`text` 為送入模型的文字（依設定附加主旨與寄件者）。
+    """
+
+    source: str
+    subject: str = ""
+    sender: str = ""
+    message_id: str = ""
+    text: str = ""
+
+
+def parse_message(
+    source: str,
+    raw: bytes,
+    include_subject: bool = True,
+    include_sender: bool = False,
+    max_chars: int = 0,
+) -> MailMessage:
+    """
+    解析單封原始郵件，本文空白壓縮為單一空格；`max_chars` 大於 0 時截斷本文。
+    """
+    message = _PARSER.parsebytes(raw)
+    subject = decode_header_value(message.get("Subject"))
+    sender = decode_header_value(message.get("From"))
+    body = " ".join(message_body(message).split())
+    if max_chars > 0:
+        body = body[:max_chars]
+    fields = [subject] if include_subject and subject else []
+    if include_sender and sender:
+        fields.append(sender)
+    fields.append(body)
+    return MailMessage(
+        source=source,
+        subject=subject,
+        sender=sender,
+        message_id=decode_header_value(message.get("Message-ID")),
+        text="\n".join(fields),
+    )
+
+
+def _parse_batch(
+    batch: Sequence[RawMessage],
+    include_subject: bool,
+    include_sender: bool,
+    max_chars: int,
+) -> Tuple[List[MailMessage], int]:
+    messages, errors = [], 0
+    for source, raw in batch:
+        try:
+            messages.append(parse_message(source, raw, include_subject, include_sender, max_chars))
+        except Exception:
+            # 格式嚴重毀損的郵件仍保留一列，避免輸出與來源筆數對不上
+            messages.append(MailMessage(source=source))
+            errors += 1
+    return messages, errors
+
+
+def _batches(items: Iterable[RawMessage], size: int) -> Iterator[List[RawMessage]]:
+    batch: List[RawMessage] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@dataclass(slots=True)
+class MailIngestor:
+    """
+    由 mbox、Maildir 與 `.eml` 目錄串流讀取原始郵件，以程序池平行解析 MIME 後分塊輸出 DataFrame。
+
+    主程序只負責讀取原始位元組，每 `batch_size` 封郵件交給一個工作程序解析；
+    同時進行中的批次數有上限，結果依來源順序輸出，記憶體用量不隨信箱大小成長。
+    """
+
+    text_column: str = "text"
+    label_column: str = "label"
+    include_subject: bool = True
+    include_sender: bool = False
+    max_chars: int = 100_000
+    n_jobs: int = -1
+    batch_size: int = 200
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "MailIngestor":
+        return cls(
+            text_column=config.text_column,
+            label_column=config.label_column,
+            include_subject=config.mail_include_subject,
+            include_sender=config.mail_include_sender,
+            max_chars=config.mail_max_chars,
+            n_jobs=config.mail_jobs,
+            batch_size=config.mail_batch_size,
+        )
+
+    def _parsed_batches(self, raw: Iterable[RawMessage]) -> Iterator[Tuple[List[MailMessage], int]]:
+        # 延遲匯入：parallel 會載入 scikit-learn，spawn 啟動的工作程序不需要它
+        from .parallel import resolve_n_jobs
+
+        parse = partial(
+            _parse_batch,
+            include_subject=self.include_subject,
+            include_sender=self.include_sender,
+            max_chars=self.max_chars,
+        )
+        batches = _batches(raw, self.batch_size)
+        workers = resolve_n_jobs(self.n_jobs)
+        if workers == 1:
+            yield from map(parse, batches)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque = deque()
+            for batch in batches:
+                pending.append(pool.submit(parse, batch))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _frame(self, messages: List[MailMessage], label: Optional[str]) -> pd.DataFrame:
+        frame = pd.DataFrame(
+            {
+                self.text_column: [message.text for message in messages],
+                "subject": [message.subject for message in messages],
+                "sender": [message.sender for message in messages],
+                "message_id": [message.message_id for message in messages],
+                "source": [message.source for message in messages],
+            }
+        )
+        if label is not None:
+            frame.insert(0, self.label_column, label)
+        return frame
+
+    def iter_chunks(
+        self,
+        source: Path | str,
+        chunk_size: int = 10000,
+        label: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        依固定筆數分塊產生含文字、主旨、寄件者、Message-ID 與來源欄位的 DataFrame，
+        可直接交給 `SpamClassifier.predict` 或 `train_incremental`；指定 `label` 時附加標籤欄位。
+        """
+        buffer: List[MailMessage] = []
+        for messages, errors in self._parsed_batches(iter_raw_messages(source)):
+            REGISTRY.inc("mail_messages", len(messages))
+            if errors:
+                REGISTRY.inc("mail_parse_errors", errors)
+            buffer.extend(messages)
+            while len(buffer) >= chunk_size:
+                yield self._frame(buffer[:chunk_size], label)
+                del buffer[:chunk_size]
+        if buffer:
+            yield self._frame(buffer, label)
+
+    def iter_labelled_chunks(
+        self,
+        sources: Sequence[Tuple[str, Path | str]],
+        chunk_size: int = 10000,
+        random_state: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        依各 `(標籤, 來源)` 的郵件數比例自每個來源取信，合併打散後輸出約 `chunk_size` 筆的混合區塊。
+
+        逐一串接各來源會讓 `partial_fit` 連續看到整段單一類別的資料，SGD 會隨之擺盪，
+        漸進驗證指標也只反映類別切換。先以 `count_messages` 計數（只切分 mbox、不解析），
+        每塊依累計比例取信，各來源大致同時取完，尾端不會只剩單一類別；
+        只有解析失敗使實際筆數少於計數時，最後一兩塊才可能偏向其餘來源。
+        各來源的工作程序數平分 `n_jobs`，總數不變。
+        """
+        from .parallel import resolve_n_jobs
+
+        if not sources:
+            return
+        sizes = np.array([count_messages(path) for _, path in sources], dtype=np.float64)
+        if not sizes.sum():
+            return
+        shares = chunk_size * sizes / sizes.sum()
+        ingestor = replace(self, n_jobs=max(1, resolve_n_jobs(self.n_jobs) // len(sources)))
+        streams = [
+            ingestor.iter_chunks(path, max(1, int(np.ceil(share))), label=label)
+            for (label, path), share in zip(sources, shares)
+        ]
+        pending: List[Optional[pd.DataFrame]] = [None] * len(sources)
+        alive = [True] * len(sources)
+        taken = np.zeros(len(sources), dtype=np.int64)
+        rng = np.random.default_rng(random_state)
+        rounds = 0
+        while any(alive):
+            rounds += 1
+            parts = []
+            # 以累計目標取整，避免每塊各自取整造成的誤差隨塊數累積
+            for idx, quota in enumerate(np.floor(rounds * shares).astype(np.int64) - taken):
+                while quota > 0 and alive[idx]:
+                    if pending[idx] is None or pending[idx].empty:
+                        pending[idx] = next(streams[idx], None)
+                        if pending[idx] is None:
+                            alive[idx] = False
+                            break
+                    part, pending[idx] = pending[idx].iloc[:quota], pending[idx].iloc[quota:]
+                    parts.append(part)
+                    taken[idx] += len(part)
+                    quota -= len(part)
+            if parts:
+                merged = pd.concat(parts, ignore_index=True)
+                yield merged.iloc[rng.permutation(len(merged))].reset_index(drop=True)
+
+    def load(self, source: Path | str, label: Optional[str] = None) -> pd.DataFrame:
+        """
+        一次載入整個郵件來源為 DataFrame。
+        """
+        with REGISTRY.timer("mail_load", source=str(source)) as event:
+            chunks = list(self.iter_chunks(source, label=label))
+            frame = pd.concat(chunks, ignore_index=True) if chunks else self._frame([], label)
+            event["rows"] = len(frame)
+        return frame
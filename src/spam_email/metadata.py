@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+import joblib
+
+
+def metadata_path(model_path: Path | str) -> Path:
+    """
+    模型附屬的中繼資料檔：`<模型檔名>.meta.json`。
+    """
+    path = Path(model_path)
+    return path.with_name(path.name + ".meta.json")
+
+
+def read_metadata(model_path: Path | str) -> Dict[str, Any]:
+    target = metadata_path(model_path)
+    if not target.exists():
+        return {}
+    return json.loads(target.read_text(encoding="utf-8"))
+
+
+def update_metadata(model_path: Path | str, **sections: Any) -> Path:
+    """
+    更新中繼資料中的指定區段；值為 `None` 時移除該區段。寫入暫存檔後原子改名。
+    """
+    target = metadata_path(model_path)
+    meta = read_metadata(model_path)
+    for name, value in sections.items():
+        if value is None:
+            meta.pop(name, None)
+        else:
+            meta[name] = value
+    staging = target.with_name(target.name + ".tmp")
+    staging.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(staging, target)
+    return target
+
+
+def atomic_dump(value: Any, path: Path | str) -> Path:
+    """
+    以 joblib 寫入同目錄暫存檔後原子改名，讀取端不會讀到寫一半的檔案。
+    """
+    target = Path(path)
+    staging = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        joblib.dump(value, staging)
+        os.replace(staging, target)
+    finally:
+        staging.unlink(missing_ok=True)
+    return target
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import json
+import os
+import uuid
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn import metrics
+
+SNAPSHOT_VERSION = 2
+_CURVE_ARRAYS = (
+    ("roc_curve", ("roc_fpr", "roc_tpr", "roc_thresholds")),
+    ("pr_curve", ("pr_recall", "pr_precision", "pr_thresholds")),
+)
+
+
+def snapshot_path(model_path: Path | str) -> Path:
+    """
+    模型附屬的評估快照：`<模型檔名>.report.npz`。
+    """
+    path = Path(model_path)
+    return path.with_name(path.name + ".report.npz")
 
 
 @dataclass(slots=True)
@@ -31,38 +48,108 @@ class MetricsReport:
         y_pred,
         y_prob,
         target_names: List[str],
+        curve_points: Optional[int] = None,
+        histogram_bins: int = 0,
     ) -> "MetricsReport":
-        report = metrics.classification_report(
-            y_true,
-            y_pred,
-            target_names=target_names,
-            output_dict=True,
-            zero_division=0,
-        )
-        confusion = metrics.confusion_matrix(y_true, y_pred, labels=target_names)
-        confusion_df = pd.DataFrame(
-            confusion,
-            index=[f"實際-{label}" for label in target_names],
-            columns=[f"預測-{label}" for label in target_names],
-        )
+        """
+        由單批預測結果建立報表；計算委派給 `StreamingEvaluator`，只排序一次分數。
+        """
+        from .evaluation import StreamingEvaluator
 
-        fpr, tpr, roc_thresholds = metrics.roc_curve(
-            (y_true == target_names[1]).astype(int),
-            y_prob[:, 1],
-        )
-        precision_curve, recall_curve, pr_thresholds = metrics.precision_recall_curve(
-            (y_true == target_names[1]).astype(int),
-            y_prob[:, 1],
+        evaluator = StreamingEvaluator(
+            labels=list(target_names),
+            curve_points=curve_points,
+            histogram_bins=histogram_bins,
         )
+        evaluator.update(y_true, y_pred, np.asarray(y_prob)[:, 1])
+        return evaluator.finalize()
 
+    def summary(self) -> Dict[str, Any]:
+        """
+        不含曲線陣列的精簡指標，可直接序列化為 JSON。
+        """
+        return {
+            "labels": list(self.labels),
+            "precision": dict(self.precision),
+            "recall": dict(self.recall),
+            "f1": dict(self.f1),
+            "support": dict(self.support),
+            "roc_auc": float(self.roc_auc),
+            "confusion_matrix": self.confusion_matrix.to_numpy().tolist(),
+        }
+
+    @classmethod
+    def from_summary(
+        cls,
+        summary: Dict[str, Any],
+        roc_curve: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        pr_curve: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    ) -> "MetricsReport":
+        labels = [str(label) for label in summary["labels"]]
         return cls(
-            labels=target_names,
-            precision={label: report[label]["precision"] for label in target_names},
-            recall={label: report[label]["recall"] for label in target_names},
-            f1={label: report[label]["f1-score"] for label in target_names},
-            support={label: report[label]["support"] for label in target_names},
-            roc_auc=metrics.roc_auc_score((y_true == target_names[1]).astype(int), y_prob[:, 1]),
-            confusion_matrix=confusion_df,
-            roc_curve=(fpr, tpr, roc_thresholds),
-            pr_curve=(recall_curve, precision_curve, pr_thresholds),
+            labels=labels,
+            precision=dict(summary["precision"]),
+            recall=dict(summary["recall"]),
+            f1=dict(summary["f1"]),
+            support=dict(summary["support"]),
+            roc_auc=float(summary["roc_auc"]),
+            confusion_matrix=pd.DataFrame(
+                np.asarray(summary["confusion_matrix"], dtype=np.int64),
+                index=[f"實際-{label}" for label in labels],
+                columns=[f"預測-{label}" for label in labels],
+            ),
+            roc_curve=roc_curve,
+            pr_curve=pr_curve,
         )
+
+    def save_snapshot(self, path: Path | str, max_points: Optional[int] = None, **keys: Any) -> Path:
+        """
+        將報表寫成精簡的 NPZ 快照：曲線降採樣為數值陣列，指標與 `keys`（模型、資料版本）存為 JSON。
+
+        寫入暫存檔後原子改名，讀取端不會讀到寫一半的快照。
+        """
+        from .evaluation import downsample_curve, downsample_pr_curve
+
+        # PR 曲線的門檻比點數少一個，需與點一起降採樣才能維持對應
+        curves = {
+            "roc_curve": downsample_curve(*self._curve_arrays("roc_curve"), max_points=max_points),
+            "pr_curve": downsample_pr_curve(*self._curve_arrays("pr_curve"), max_points=max_points),
+        }
+        arrays: Dict[str, np.ndarray] = {}
+        for attribute, names in _CURVE_ARRAYS:
+            arrays.update(zip(names, curves[attribute]))
+        meta = {"snapshot_version": SNAPSHOT_VERSION, "keys": keys, "summary": self.summary()}
+        arrays["meta"] = np.array(json.dumps(meta, ensure_ascii=False))
+
+        target = Path(path)
+        staging = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with staging.open("wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(staging, target)
+        finally:
+            staging.unlink(missing_ok=True)
+        return target
+
+    def _curve_arrays(self, attribute: str) -> Tuple[np.ndarray, ...]:
+        return tuple(np.asarray(values, dtype=np.float64) for values in getattr(self, attribute))
+
+    @classmethod
+    def load_snapshot(cls, path: Path | str, **expected: Any) -> Optional["MetricsReport"]:
+        """
+        讀取評估快照；檔案不存在、格式版本不符或任一 `expected` 鍵與快照不同時回傳 `None`。
+        """
+        target = Path(path)
+        if not target.exists():
+            return None
+        with np.load(target, allow_pickle=False) as archive:
+            meta = json.loads(str(archive["meta"]))
+            if meta.get("snapshot_version") != SNAPSHOT_VERSION:
+                return None
+            keys = meta.get("keys", {})
+            if any(value is None or keys.get(name) != value for name, value in expected.items()):
+                return None
+            curves = {
+                attribute: tuple(archive[name] for name in names) for attribute, names in _CURVE_ARRAYS
+            }
+        return cls.from_summary(meta["summary"], **curves)
@@ -1,44 +1,117 @@
 from __future__ import annotations
 
+import hashlib
+import tempfile
+import time
+import uuid
+
 import joblib
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
 
+from .cache import PredictionCache
+from .campaign import CampaignIndex, ScoreFn
+from .cascade import Cascade
 from .config import AppConfig
-from .metrics import MetricsReport
+from .drift import DriftBaseline, DriftMonitor, baseline_path, frequent_terms
+from .evaluation import StreamingEvaluator
+from .explain import Explanation, LinearExplainer
+from .feature_cache import FeatureCache, content_hash, frame_hash, params_hash
+from .instrumentation import REGISTRY, SIZE_BUCKETS
+from .metadata import atomic_dump, read_metadata, update_metadata
+from .metrics import MetricsReport, snapshot_path
+from .quantize import CompactionReport, compact_pipeline, compaction_report
+from .threshold import OperatingPoint, load_operating_point, save_operating_point, select_operating_point
+
+if TYPE_CHECKING:
+    from .parallel import ParallelPredictor
 
 
 @dataclass(slots=True)
 class SpamClassifier:
     """
-    Logistic Regression + TF-IDF 垃圾郵件分類器。
+    Logistic Regression + TF-IDF 垃圾郵件分類器，特徵引擎可切換為雜湊向量化。
     """
 
     config: AppConfig
     pipeline: Optional[Pipeline] = None
+    model_file: Optional[Path] = None
+    model_version: Optional[str] = None
+    cache: Optional[PredictionCache] = field(default=None, repr=False)
+    campaigns: Optional[CampaignIndex] = field(default=None, repr=False)
+    explainer: Optional[LinearExplainer] = field(default=None, repr=False)
+    operating_point: Optional[OperatingPoint] = None
+    cascade: Optional[Cascade] = field(default=None, repr=False)
+    report: Optional[MetricsReport] = field(default=None, repr=False)
+    compaction: Optional[CompactionReport] = field(default=None, repr=False)
+    drift_baseline: Optional[DriftBaseline] = field(default=None, repr=False)
+    monitor: Optional[DriftMonitor] = field(default=None, repr=False)
+    data_hash: Optional[str] = None
 
-    def build_pipeline(self) -> Pipeline:
+    def __post_init__(self) -> None:
+        if self.cache is None and self.config.prediction_cache_size > 0:
+            self.cache = PredictionCache(
+                max_size=self.config.prediction_cache_size,
+                ttl=self.config.prediction_cache_ttl,
+            )
+        if self.campaigns is None and self.config.dedupe_enabled:
+            self.campaigns = CampaignIndex.from_config(self.config)
+        if self.pipeline is not None and self.model_version is None:
+            self.model_version = uuid.uuid4().hex
+
+    def build_feature_steps(self) -> List[Tuple[str, Any]]:
         """
-        建立完整的特徵工程與模型管線。
+        依 `config.feature_engine` 建立特徵工程步驟。
+
+        - `tfidf`：TfidfVectorizer，需建立並保存 n-gram 詞彙表。
+        - `hashing`：HashingVectorizer + TfidfTransformer，無詞彙表、記憶體固定。
         """
-        pipeline = Pipeline(
-            steps=[
+        engine = self.config.feature_engine
+        if engine == "tfidf":
+            return [
                 (
                     "vectorize",
                     TfidfVectorizer(
                         max_features=self.config.max_features,
                         ngram_range=(1, 2),
                         stop_words="english",
+                        dtype=np.dtype(self.config.feature_dtype),
+                    ),
+                ),
+            ]
+        if engine == "hashing":
+            return [
+                (
+                    "vectorize",
+                    HashingVectorizer(
+                        n_features=self.config.hashing_n_features,
+                        ngram_range=(1, 2),
+                        stop_words="english",
+                        alternate_sign=False,
+                        norm=None,
+                        dtype=np.dtype(self.config.feature_dtype),
                     ),
                 ),
+                ("tfidf", TfidfTransformer()),
+            ]
+        raise ValueError(f"不支援的特徵引擎：{engine}")
+
+    def build_pipeline(self) -> Pipeline:
+        """
+        建立完整的特徵工程與模型管線，並套用 `config.pipeline_params` 覆寫的參數。
+        """
+        pipeline = Pipeline(
+            steps=[
+                *self.build_feature_steps(),
                 (
                     "clf",
                     LogisticRegression(
@@ -49,13 +122,73 @@ class SpamClassifier:
                 ),
             ]
         )
+        if self.config.pipeline_params:
+            pipeline.set_params(**self.config.pipeline_params)
+        self.pipeline = pipeline
+        self.model_file = None
+        self.operating_point = None
+        self.cascade = None
+        self.report = None
+        self.data_hash = None
+        self.compaction = None
+        self.drift_baseline = None
+        self.monitor = None
+        self.model_version = uuid.uuid4().hex
+        return pipeline
+
+    def build_incremental_pipeline(self) -> Pipeline:
+        """
+        建立可 `partial_fit` 的線上學習管線：無狀態雜湊特徵 + SGD 邏輯迴歸。
+        """
+        pipeline = Pipeline(
+            steps=[
+                (
+                    "vectorize",
+                    HashingVectorizer(
+                        n_features=self.config.hashing_n_features,
+                        ngram_range=(1, 2),
+                        stop_words="english",
+                        alternate_sign=False,
+                        dtype=np.dtype(self.config.feature_dtype),
+                    ),
+                ),
+                (
+                    "clf",
+                    SGDClassifier(
+                        loss="log_loss",
+                        random_state=self.config.random_state,
+                    ),
+                ),
+            ]
+        )
         self.pipeline = pipeline
+        self.model_file = None
+        self.operating_point = None
+        self.cascade = None
+        self.report = None
+        self.data_hash = None
+        self.compaction = None
+        self.drift_baseline = None
+        self.monitor = None
+        self.model_version = uuid.uuid4().hex
         return pipeline
 
     @property
     def is_trained(self) -> bool:
         return self.pipeline is not None
 
+    @property
+    def supports_incremental(self) -> bool:
+        """
+        管線是否可直接以新資料增量更新（特徵步驟無狀態且分類器支援 partial_fit）。
+        """
+        if not self.pipeline:
+            return False
+        feature_steps = [step for _, step in self.pipeline.steps[:-1]]
+        return hasattr(self.pipeline[-1], "partial_fit") and all(
+            isinstance(step, HashingVectorizer) for step in feature_steps
+        )
+
     def train(
         self,
         frame: pd.DataFrame,
@@ -71,45 +204,497 @@ class SpamClassifier:
             random_state=self.config.random_state,
             stratify=frame[self.config.label_column],
         )
+        x_train, x_calib, y_train, y_calib = self._calibration_split(x_train, y_train)
 
-        pipeline.fit(x_train[self.config.text_column], y_train)
-        x_eval = x_test[self.config.text_column]
-        y_pred = pipeline.predict(x_eval)
-        y_prob = pipeline.predict_proba(x_eval)
+        with REGISTRY.timer("vectorize", rows=len(frame)):
+            features, train_matrix, test_matrix = self._fit_features(
+                Pipeline(pipeline.steps[:-1]),
+                x_train[self.config.text_column],
+                x_test[self.config.text_column],
+            )
+        clf = pipeline.steps[-1][1]
+        with REGISTRY.timer("fit", rows=len(y_train)):
+            clf.fit(train_matrix, y_train)
+        pipeline = Pipeline([*features.steps, ("clf", clf)])
+        self.pipeline = pipeline
+        if self.config.quantize_dtype:
+            holdout = pd.DataFrame(
+                {self.config.text_column: x_test[self.config.text_column], self.config.label_column: y_test}
+            )
+            self.compaction = self.quantize(holdout)
+            pipeline, clf = self.pipeline, self.pipeline[-1]
+            # 剪枝改變詞彙表與正規化，驗證集需以精簡後的特徵步驟重新轉換
+            test_matrix = self._vectorize(x_test[self.config.text_column])
+        if x_calib is not None:
+            self.operating_point = self._select_operating_point(
+                y_calib, clf.predict_proba(self._vectorize(x_calib[self.config.text_column]))
+            )
+        if self.config.cascade_enabled:
+            self.cascade = Cascade.from_config(self.config).fit(
+                x_train[self.config.text_column].tolist(),
+                y_train.astype(str).tolist(),
+            )
+            self.cascade.include_threshold(self.operating_point)
+        y_pred, y_prob = self._route(x_test[self.config.text_column], test_matrix)
+        if self.config.drift_enabled:
+            # 量化與串接模型皆已定案，漂移基準只以最終模型建立一次
+            self.fit_drift_baseline(x_test[self.config.text_column], y_prob, x_train[self.config.text_column])
+
+        evaluator = self.evaluator(sorted(frame[self.config.label_column].unique()))
+        evaluator.update(y_test, y_pred, y_prob[:, 1])
+        self.report = evaluator.finalize()
+        self.data_hash = frame_hash(frame, self._data_columns)
+        return pipeline, self.report
 
-        report = MetricsReport.from_predictions(
-            y_true=y_test.reset_index(drop=True),
-            y_pred=y_pred,
-            y_prob=y_prob,
-            target_names=sorted(frame[self.config.label_column].unique()),
+    @property
+    def _needs_operating_point(self) -> bool:
+        return self.config.decision_strategy != "argmax" or self.config.calibrate_probabilities
+
+    def _calibration_split(self, x_train: pd.DataFrame, y_train: pd.Series) -> Tuple[Any, Any, Any, Any]:
+        """
+        需要操作點時自訓練集再切出 `calibration_size` 比例的校正集，門檻與校正不在驗證集上選擇，
+        回報的指標與評估快照才不會偏樂觀；不需要時校正集為 `None`。
+        """
+        if not self._needs_operating_point:
+            return x_train, None, y_train, None
+        classes = y_train.nunique()
+        size = max(int(np.ceil(self.config.calibration_size * len(y_train))), classes)
+        return train_test_split(
+            x_train,
+            y_train,
+            test_size=size,
+            random_state=self.config.random_state,
+            stratify=y_train,
         )
 
-        self.pipeline = pipeline
-        return pipeline, report
+    def _select_operating_point(self, y_true: pd.Series, probabilities: np.ndarray) -> Optional[OperatingPoint]:
+        """
+        依設定於校正集上選擇決策門檻與機率校正；預設 argmax 且不校正時不建立操作點。
+        """
+        if not self._needs_operating_point:
+            return None
+        positive_label = self.pipeline[-1].classes_[1]
+        return select_operating_point(
+            np.asarray(y_true) == positive_label,
+            probabilities[:, 1],
+            strategy=self.config.decision_strategy,
+            target_fpr=self.config.target_fpr,
+            calibrate=self.config.calibrate_probabilities,
+        )
+
+    def quantize(
+        self,
+        frame: pd.DataFrame,
+        dtype: Optional[str] = None,
+        tolerance: Optional[float] = None,
+    ) -> CompactionReport:
+        """
+        剪除近零係數與其詞彙並量化權重，以 `frame` 量測前後準確率，回傳精簡報告。
+        """
+        if not self.pipeline:
+            raise RuntimeError("模型尚未訓練或載入。")
+        dtype = dtype or self.config.quantize_dtype or "float32"
+        tolerance = self.config.prune_tolerance if tolerance is None else tolerance
+        texts = frame[self.config.text_column]
+        truth = frame[self.config.label_column].astype(str).to_numpy()
+
+        accuracy_before = float(np.mean(self._infer(texts)[0].astype(str) == truth))
+        original = self.pipeline
+        with REGISTRY.timer("quantize", dtype=dtype):
+            self.pipeline = compact_pipeline(original, dtype, tolerance)
+        self.model_file = None
+        self.model_version = uuid.uuid4().hex
+        report = compaction_report(original, self.pipeline, dtype, tolerance)
+        report.accuracy_before = accuracy_before
+        labels = self._infer(texts)[0]
+        report.accuracy_after = float(np.mean(labels.astype(str) == truth))
+        self.compaction = report
+        vectorizer = self.pipeline[0]
+        if self.drift_baseline is not None and hasattr(vectorizer, "vocabulary_"):
+            # `frame` 通常是含訓練列的完整資料集，不能用來重建基準；只移除剪掉的詞，
+            # 沿用訓練時以驗證集計數、以訓練集分組的基準
+            self.drift_baseline = self.drift_baseline.restrict(
+                term for term in vectorizer.vocabulary_ if " " not in term
+            )
+            self._attach_monitor()
+        return report
+
+    def fit_drift_baseline(self, texts, probabilities: np.ndarray, reference_texts=None) -> DriftBaseline:
+        """
+        以驗證集郵件與其機率建立漂移基準，啟用 `drift_enabled` 時同時掛上監控。
+
+        詞彙表引擎監控模型詞彙中的單詞；雜湊引擎沒有詞彙表，改用 `reference_texts`
+        （預設為 `texts`）中最常見的 `max_features` 個單詞。`reference_texts` 也用於決定詞彙的頻率分組。
+        """
+        vectorizer = self.pipeline[0]
+        stop_words = vectorizer.get_stop_words() or ()
+        if hasattr(vectorizer, "vocabulary_"):
+            vocabulary = sorted(term for term in vectorizer.vocabulary_ if " " not in term)
+        else:
+            reference = texts if reference_texts is None else reference_texts
+            vocabulary = frequent_terms(reference, stop_words, self.config.max_features)
+        self.drift_baseline = DriftBaseline.fit(
+            list(texts),
+            probabilities[:, 1],
+            vocabulary,
+            stop_words,
+            bins=self.config.drift_bins,
+            reference_texts=reference_texts,
+        )
+        self._attach_monitor()
+        return self.drift_baseline
+
+    def _attach_monitor(self) -> None:
+        if self.config.drift_enabled and self.drift_baseline is not None:
+            self.monitor = DriftMonitor.from_config(self.config, self.drift_baseline)
+        else:
+            self.monitor = None
+
+    @property
+    def _data_columns(self) -> List[str]:
+        return [self.config.label_column, self.config.text_column]
+
+    def evaluator(self, target_names: Optional[List[str]] = None) -> StreamingEvaluator:
+        """
+        依設定的曲線點數與直方圖分箱建立串流評估器。
+        """
+        return StreamingEvaluator(
+            labels=list(target_names or self.config.class_labels),
+            curve_points=self.config.eval_curve_points,
+            histogram_bins=self.config.eval_histogram_bins,
+        )
+
+    @property
+    def feature_cache(self) -> Optional[FeatureCache]:
+        if not self.config.feature_cache_enabled:
+            return None
+        return FeatureCache(
+            directory=self.config.cache_dir / "features",
+            max_bytes=self.config.feature_cache_max_bytes,
+            max_age=self.config.feature_cache_max_age,
+        )
+
+    def _fit_features(
+        self,
+        features: Pipeline,
+        train_texts: pd.Series,
+        test_texts: pd.Series,
+    ) -> Tuple[Pipeline, Any, Any]:
+        """
+        擬合特徵步驟並轉換訓練 / 測試集；啟用特徵快取時直接重用相同資料與參數的結果。
+        """
+        cache = self.feature_cache
+        if cache is not None:
+            key = cache.make_key(
+                "train",
+                content_hash(train_texts),
+                content_hash(test_texts),
+                params_hash(step for _, step in features.steps),
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                return cached["features"], cached["train"], cached["test"]
+
+        train_matrix = features.fit_transform(train_texts)
+        test_matrix = features.transform(test_texts)
+        if cache is not None:
+            cache.put(key, {"features": features, "train": train_matrix, "test": test_matrix})
+        return features, train_matrix, test_matrix
+
+    def update(self, frame: pd.DataFrame) -> Pipeline:
+        """
+        以新標記的郵件增量更新現有模型，不需重新訓練完整歷史資料。
+
+        更新後分數分布隨之改變，原本在驗證集上選定的操作點與漂移基準不再適用，一併移除。
+        """
+        if not self.supports_incremental:
+            raise RuntimeError("目前模型不支援增量更新，請改用增量模式重新訓練。")
+        clf = self.pipeline[-1]
+        features = self.pipeline[:-1].transform(frame[self.config.text_column])
+        # 已擬合的模型沿用自身類別，僅首次 partial_fit 才以設定的類別宣告
+        classes = getattr(clf, "classes_", None)
+        clf.partial_fit(
+            features,
+            frame[self.config.label_column],
+            classes=np.asarray(self.config.class_labels) if classes is None else classes,
+        )
+        self.model_file = None
+        self.report = None
+        self.operating_point = None
+        self.drift_baseline = None
+        self.monitor = None
+        self.model_version = uuid.uuid4().hex
+        return self.pipeline
+
+    def train_incremental(
+        self,
+        chunks: Iterable[pd.DataFrame],
+    ) -> Tuple[Pipeline, Optional[MetricsReport]]:
+        """
+        逐塊串流訓練線上模型，並以「先預測後學習」的漸進驗證產生指標。
+        """
+        pipeline = self.build_incremental_pipeline()
+        evaluator = self.evaluator()
+        fitted = evaluated = False
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if fitted:
+                labels, probs = self._infer(chunk[self.config.text_column])
+                evaluator.update(chunk[self.config.label_column], labels, probs[:, 1])
+                evaluated = True
+            self.update(chunk)
+            fitted = True
+
+        self.report = evaluator.finalize() if evaluated else None
+        return pipeline, self.report
+
+    def _infer(self, text_inputs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        單次向量化並只計算一次決策分數，同時取得預測標籤與機率；
+        啟用串接時只有第一階段不確定的郵件才向量化。
+        """
+        if self.cascade is None:
+            return self._classify(self._vectorize(text_inputs))
+        texts = list(text_inputs)
+        return self.cascade.run(
+            texts,
+            lambda indices: self._classify(self._vectorize([texts[idx] for idx in indices])),
+        )
+
+    def _vectorize(self, text_inputs) -> Any:
+        with REGISTRY.timer("vectorize", rows=len(text_inputs)):
+            return self.pipeline[:-1].transform(text_inputs)
+
+    def _route(self, text_inputs, features) -> Tuple[np.ndarray, np.ndarray]:
+        # 已有完整特徵矩陣時（訓練、評估），串接的第二階段直接取用對應列
+        if self.cascade is None:
+            return self._classify(features)
+        return self.cascade.run(
+            list(text_inputs),
+            lambda indices: self._classify(features[indices]),
+        )
+
+    def _classify(self, features) -> Tuple[np.ndarray, np.ndarray]:
+        clf = self.pipeline[-1]
+        with REGISTRY.timer("classify", rows=features.shape[0]):
+            probabilities = clf.predict_proba(features)
+        if self.operating_point is not None:
+            return self.operating_point.apply(probabilities, clf.classes_)
+        labels = clf.classes_[np.argmax(probabilities, axis=1)]
+        return labels, probabilities
 
     def predict(
         self,
         text_inputs: list[str],
+        infer: Optional[ScoreFn] = None,
     ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        `infer` 取代模型推論本身（例如 `ParallelPredictor.predict`），快取、群集、監控與指標照常套用。
+        """
         if not self.pipeline:
             raise RuntimeError("模型尚未訓練或載入。")
-        labels = self.pipeline.predict(text_inputs)
-        probabilities = self.pipeline.predict_proba(text_inputs)
+        REGISTRY.observe("predict_batch_size", len(text_inputs), buckets=SIZE_BUCKETS)
+        REGISTRY.inc("predictions", len(text_inputs))
+        with REGISTRY.timer("predict", rows=len(text_inputs)):
+            if self.campaigns is not None:
+                labels, probabilities, _ = self.predict_campaigns(text_inputs, infer)
+            else:
+                labels, probabilities = self._score(text_inputs, infer)
+        if self.monitor is not None:
+            self.monitor.observe(text_inputs, probabilities)
         return labels, probabilities
 
+    def predict_campaigns(
+        self,
+        text_inputs: list[str],
+        infer: Optional[ScoreFn] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        以近似重複群集推論：每個群集只由代表郵件經推論快取與 `infer`（預設為 `_infer`）評分，
+        回傳 `(labels, probabilities, campaign_ids)`。
+        """
+        if not self.pipeline:
+            raise RuntimeError("模型尚未訓練或載入。")
+        if self.campaigns is None:
+            raise RuntimeError("尚未啟用近似重複群集，請設定 dedupe_enabled。")
+        return self.campaigns.predict(text_inputs, partial(self._score, infer=infer), self.model_version)
+
+    def _score(self, text_inputs, infer: Optional[ScoreFn] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if self.cache is None:
+            return (infer or self._infer)(text_inputs)
+        return self._predict_cached(text_inputs, infer)
+
+    def _predict_cached(self, text_inputs, infer: Optional[ScoreFn] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        先在批次內去除重複文字並查詢快取，只對未命中的文字向量化。
+        """
+        texts = list(text_inputs)
+        positions: Dict[bytes, int] = {}
+        inverse = np.empty(len(texts), dtype=np.intp)
+        unique_texts: List[str] = []
+        for idx, text in enumerate(texts):
+            key = PredictionCache.make_key(text, self.model_version)
+            inverse[idx] = positions.setdefault(key, len(positions))
+            if inverse[idx] == len(unique_texts):
+                unique_texts.append(text)
+        self.cache.record_hits(len(texts) - len(unique_texts))
+
+        classes = self.pipeline[-1].classes_
+        unique_labels = np.empty(len(unique_texts), dtype=classes.dtype)
+        unique_probs = np.empty((len(unique_texts), len(classes)), dtype=float)
+        missing: List[int] = []
+        for key, pos in positions.items():
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(pos)
+            else:
+                unique_labels[pos], unique_probs[pos] = cached
+
+        REGISTRY.inc("prediction_cache_hits", len(texts) - len(missing))
+        REGISTRY.inc("prediction_cache_misses", len(missing))
+        if missing:
+            labels, probs = (infer or self._infer)([unique_texts[pos] for pos in missing])
+            unique_labels[missing] = labels
+            unique_probs[missing] = probs
+            keys = list(positions)
+            for pos, label, row in zip(missing, labels, probs):
+                self.cache.put(keys[pos], label, row.copy())
+
+        return unique_labels[inverse], unique_probs[inverse]
+
+    def parallel_predictor(self, n_jobs: Optional[int] = None) -> "ParallelPredictor":
+        """
+        建立共用目前模型檔案的多程序推論器。尚未存檔的模型只將管線、操作點與串接寫入快取目錄下的
+        暫存目錄，推論器關閉時刪除；不會改變本物件的 `model_file` 與 `model_version`。
+        """
+        from .parallel import ParallelPredictor
+
+        if not self.pipeline:
+            raise RuntimeError("模型尚未訓練或載入。")
+        n_jobs = self.config.n_jobs if n_jobs is None else n_jobs
+        if self.model_file is not None:
+            return ParallelPredictor(model_path=self.model_file, n_jobs=n_jobs)
+        self.config.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix="parallel-", dir=self.config.cache_dir))
+        target = staging / "model.joblib"
+        atomic_dump(self.pipeline, target)
+        save_operating_point(target, self.operating_point)
+        if self.cascade is not None:
+            self.cascade.save(target)
+        return ParallelPredictor(model_path=target, n_jobs=n_jobs, cleanup=staging)
+
+    def predict_parallel(
+        self,
+        text_inputs: list[str],
+        n_jobs: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        以多程序平行推論；每個工作程序只載入一次模型，結果維持原始順序。
+        """
+        from .parallel import resolve_n_jobs
+
+        n_jobs = self.config.n_jobs if n_jobs is None else n_jobs
+        if resolve_n_jobs(n_jobs) <= 1 or len(text_inputs) == 0:
+            return self.predict(text_inputs)
+        with self.parallel_predictor(n_jobs) as predictor:
+            return self.predict(text_inputs, infer=predictor.predict)
+
+    @property
+    def linear_explainer(self) -> LinearExplainer:
+        """
+        依目前模型版本建立（並重用）詞項解釋器。
+        """
+        if not self.pipeline:
+            raise RuntimeError("模型尚未訓練或載入。")
+        if self.explainer is None or self.explainer.model_version != self.model_version:
+            self.explainer = LinearExplainer.from_pipeline(self.pipeline, self.model_version)
+        return self.explainer
+
+    def explain(self, text_inputs: list[str], top_k: int = 10) -> List[Explanation]:
+        """
+        預測並列出每封郵件貢獻最大的 `top_k` 個詞項。
+
+        標籤與機率走與 `predict` 相同的路徑（串接、近似重複群集與操作點），
+        詞項貢獻則來自完整模型；無群集時兩者共用同一次向量化。
+        """
+        explainer = self.linear_explainer
+        features = self._vectorize(text_inputs)
+        if self.campaigns is not None:
+            labels, probabilities, _ = self.predict_campaigns(text_inputs)
+        else:
+            labels, probabilities = self._route(text_inputs, features)
+        contributions = explainer.top_contributions(features, top_k)
+        return [
+            Explanation(label=str(label), spam_probability=float(row[1]), contributions=terms)
+            for label, row, terms in zip(labels, probabilities, contributions)
+        ]
+
     def save(self, path: Optional[Path | str] = None) -> Path:
         if not self.pipeline:
             raise RuntimeError("無法儲存：模型尚未訓練。")
         target = Path(path) if path else self.config.model_path
         target.parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self.pipeline, target)
+        with REGISTRY.timer("save", path=str(target)):
+            atomic_dump(self.pipeline, target)
+            save_operating_point(target, self.operating_point)
+            if self.cascade is not None:
+                self.cascade.save(target)
+            else:
+                Cascade.discard(target)
+            # 以檔案內容作為版本，與重新載入後的 `model_version` 一致，評估快照才能對應；
+            # 版本連同檔案大小與修改時間寫入中繼資料，載入時不必重新雜湊整個模型檔
+            self.model_version = _file_version(target)
+            _store_version(target, self.model_version)
+            if self.report is not None:
+                self.report.save_snapshot(
+                    snapshot_path(target),
+                    max_points=self.config.eval_curve_points,
+                    model_version=self.model_version,
+                    data_hash=self.data_hash,
+                    scope="holdout",
+                )
+            else:
+                snapshot_path(target).unlink(missing_ok=True)
+            if self.drift_baseline is not None:
+                self.drift_baseline.save(baseline_path(target))
+            else:
+                baseline_path(target).unlink(missing_ok=True)
+        self.model_file = target
         return target
 
     def load(self, path: Optional[Path | str] = None) -> Pipeline:
         target = Path(path) if path else self.config.model_path
-        self.pipeline = joblib.load(target)
+        with REGISTRY.timer("load", path=str(target)) as event:
+            start = time.perf_counter()
+            self.pipeline = joblib.load(target)
+            self.operating_point = load_operating_point(target)
+            self.cascade = Cascade.load(target)
+            self.model_file = target
+            self.report = None
+            self.data_hash = None
+            self.drift_baseline = DriftBaseline.load(baseline_path(target))
+            self._attach_monitor()
+            self.model_version = _stored_version(target) or _file_version(target)
+            event["model_version"] = self.model_version
+        REGISTRY.set_gauge("model_load_seconds", time.perf_counter() - start)
         return self.pipeline
 
+    def export_compact(self, path: Optional[Path | str] = None) -> Path:
+        """
+        匯出可記憶體映射的精簡推論格式，供快速冷啟動使用。
+        """
+        from .artifact import export_compact
+
+        if not self.pipeline:
+            raise RuntimeError("無法匯出：模型尚未訓練或載入。")
+        return export_compact(
+            self.pipeline,
+            Path(path) if path else self.config.compact_model_path,
+            operating_point=self.operating_point,
+            cascade=self.cascade,
+        )
+
     def evaluate(self, frame: pd.DataFrame) -> MetricsReport:
         """
         利用既有模型對完整資料集進行評估。
@@ -119,13 +704,86 @@ class SpamClassifier:
 
         y_true = frame[self.config.label_column]
         x_text = frame[self.config.text_column]
-        y_pred = self.pipeline.predict(x_text)
-        y_prob = self.pipeline.predict_proba(x_text)
-        target_names = sorted(y_true.unique())
-
-        return MetricsReport.from_predictions(
-            y_true=y_true.reset_index(drop=True),
-            y_pred=y_pred,
-            y_prob=y_prob,
-            target_names=target_names,
-        )
+        cache = self.feature_cache
+        matrix = None
+        if cache is not None:
+            key = cache.make_key("evaluate", self.model_version, content_hash(x_text))
+            cached = cache.get(key)
+            matrix = cached["matrix"] if cached is not None else None
+        if matrix is None:
+            matrix = self._vectorize(x_text)
+            if cache is not None:
+                cache.put(key, {"matrix": matrix})
+        y_pred, y_prob = self._route(x_text, matrix)
+
+        with REGISTRY.timer("evaluate", rows=len(frame)):
+            evaluator = self.evaluator(sorted(y_true.unique()))
+            evaluator.update(y_true, y_pred, y_prob[:, 1])
+            return evaluator.finalize()
+
+    def evaluate_cached(self, frame: pd.DataFrame) -> MetricsReport:
+        """
+        優先讀取模型旁的評估快照，模型與資料版本皆相符時不需重新推論；
+        否則重新評估完整資料集並更新快照，下次啟動即可直接使用。
+        """
+        data_hash = frame_hash(frame, self._data_columns)
+        if self.model_file is None:
+            return self.evaluate(frame)
+        path = snapshot_path(self.model_file)
+        report = MetricsReport.load_snapshot(path, model_version=self.model_version, data_hash=data_hash)
+        if report is None:
+            report = self.evaluate(frame)
+            report.save_snapshot(
+                path,
+                max_points=self.config.eval_curve_points,
+                model_version=self.model_version,
+                data_hash=data_hash,
+                scope="full",
+            )
+        self.report, self.data_hash = report, data_hash
+        return report
+
+    def evaluate_chunks(self, chunks: Iterable[pd.DataFrame]) -> MetricsReport:
+        """
+        逐塊推論並累積指標，適用於無法一次載入記憶體的大型評估集。
+        """
+        if not self.pipeline:
+            raise RuntimeError("模型尚未載入。")
+
+        evaluator = self.evaluator([str(label) for label in self.pipeline[-1].classes_])
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            labels, probs = self._infer(chunk[self.config.text_column])
+            evaluator.update(chunk[self.config.label_column], labels, probs[:, 1])
+        with REGISTRY.timer("evaluate"):
+            return evaluator.finalize()
+
+
+def _file_version(path: Path) -> str:
+    """
+    以模型檔內容雜湊作為版本，相同檔案在任何程序載入都得到相同版本。
+    """
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _store_version(path: Path, version: str) -> None:
+    stat = Path(path).stat()
+    update_metadata(path, file={"version": version, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+
+
+def _stored_version(path: Path) -> Optional[str]:
+    """
+    讀取存檔時記錄的版本；模型檔大小或修改時間不符（檔案被替換）時回傳 `None`，改為重新雜湊。
+    """
+    entry = read_metadata(path).get("file")
+    if not entry:
+        return None
+    stat = Path(path).stat()
+    if entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return entry.get("version")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from .cascade import Cascade
+from .config import AppConfig
+from .model import SpamClassifier
+from .threshold import load_operating_point
+
+_WORKER_CLASSIFIER: Optional[SpamClassifier] = None
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    將 `-1` 等非正值轉換為實際的工作程序數。
+    """
+    cpu_count = os.cpu_count() or 1
+    if n_jobs < 0:
+        return max(cpu_count + 1 + n_jobs, 1)
+    return max(n_jobs, 1)
+
+
+def _init_worker(model_path: str) -> None:
+    # 每個工作程序只載入一次模型；未壓縮的 NumPy 陣列以唯讀 mmap 共用頁面快取
+    global _WORKER_CLASSIFIER
+    pipeline = joblib.load(model_path, mmap_mode="r")
+    _WORKER_CLASSIFIER = SpamClassifier(
+        config=AppConfig(),
+        pipeline=pipeline,
+        operating_point=load_operating_point(model_path),
+        cascade=Cascade.load(model_path),
+    )
+
+
+def _predict_shard(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # 工作程序只做模型推論；快取、群集、漂移監控與指標由主程序處理
+    return _WORKER_CLASSIFIER._infer(texts)
+
+
+@dataclass(slots=True)
+class ParallelPredictor:
+    """
+    以多程序切分批次推論，結果依原始順序合併。
+
+    `predict` 只涵蓋模型本身（含串接與操作點）；推論快取、近似重複群集、漂移監控與
+    `REGISTRY` 指標都在主程序，請以 `SpamClassifier.predict(texts, infer=predictor.predict)` 呼叫。
+    建議以 `with` 使用，讓程序池在多次推論間重複利用；`cleanup` 目錄於關閉時刪除。
+    """
+
+    model_path: Path
+    n_jobs: int = -1
+    min_shard_size: int = 256
+    cleanup: Optional[Path] = None
+    _pool: Optional[ProcessPoolExecutor] = field(default=None, init=False)
+
+    def __enter__(self) -> "ParallelPredictor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=resolve_n_jobs(self.n_jobs),
+                initializer=_init_worker,
+                initargs=(str(self.model_path),),
+            )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.cleanup is not None:
+            shutil.rmtree(self.cleanup, ignore_errors=True)
+            self.cleanup = None
+
+    def _shards(self, text_inputs: Sequence[str]) -> List[List[str]]:
+        workers = resolve_n_jobs(self.n_jobs)
+        # 每個程序分配數個分片以平衡長短訊息造成的負載差異
+        count = min(workers * 4, max(len(text_inputs) // self.min_shard_size, 1))
+        bounds = np.linspace(0, len(text_inputs), count + 1, dtype=int)
+        return [list(text_inputs[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def predict(self, text_inputs: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        self.start()
+        results = list(self._pool.map(_predict_shard, self._shards(text_inputs)))
+        labels = np.concatenate([labels for labels, _ in results])
+        probabilities = np.vstack([probs for _, probs in results])
+        return labels, probabilities
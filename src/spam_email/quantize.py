@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+
+DTYPES = ("float32", "float16", "int8")
+
+
+def _deep_nbytes(value: Any, seen: set) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(np.empty(0))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(_deep_nbytes(key, seen) + _deep_nbytes(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_deep_nbytes(item, seen) for item in value)
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return size
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        size += _deep_nbytes(attributes, seen)
+    for slot in getattr(type(value), "__slots__", ()):
+        if hasattr(value, slot):
+            size += _deep_nbytes(getattr(value, slot), seen)
+    return size
+
+
+def model_nbytes(pipeline: Any) -> int:
+    """
+    估計管線物件的常駐記憶體：遞迴加總詞彙表字典與字串、停用詞集合及所有 NumPy 陣列。
+    """
+    return _deep_nbytes(pipeline, set())
+
+
+@dataclass(slots=True)
+class QuantizedLinearModel:
+    """
+    以量化權重保存的二元線性分類器，介面與 scikit-learn 的 `predict_proba` / `coef_` 相容。
+
+    `int8` 權重以 `scale = max|w| / 127` 對稱量化；`float16` / `float32` 直接轉型且 `scale` 為 1。
+    評分時才將權重還原為 float32，常駐的只有量化後的陣列。
+    """
+
+    classes_: np.ndarray
+    weights: np.ndarray
+    scale: float
+    intercept: float
+
+    @classmethod
+    def from_linear(cls, clf: Any, dtype: str, keep: Optional[np.ndarray] = None) -> "QuantizedLinearModel":
+        if dtype not in DTYPES:
+            raise ValueError(f"不支援的量化型別：{dtype}")
+        coef = np.asarray(clf.coef_, dtype=np.float64)
+        if coef.shape[0] != 1:
+            raise ValueError("量化僅支援二元線性分類模型。")
+        coef = coef[0] if keep is None else coef[0][keep]
+        scale = 1.0
+        if dtype == "int8":
+            peak = float(np.abs(coef).max()) if coef.size else 0.0
+            scale = peak / 127 if peak > 0 else 1.0
+            weights = np.clip(np.rint(coef / scale), -127, 127).astype(np.int8)
+        else:
+            weights = coef.astype(dtype)
+        return cls(
+            classes_=np.asarray(clf.classes_),
+            weights=weights,
+            scale=scale,
+            intercept=float(np.asarray(clf.intercept_).ravel()[0]),
+        )
+
+    @property
+    def coef_(self) -> np.ndarray:
+        return (self.weights.astype(np.float32) * np.float32(self.scale))[np.newaxis, :]
+
+    @property
+    def intercept_(self) -> np.ndarray:
+        return np.array([self.intercept])
+
+    def decision_function(self, features: Any) -> np.ndarray:
+        scores = np.asarray(features @ self.coef_[0], dtype=np.float64).ravel()
+        return scores + self.intercept
+
+    def predict_proba(self, features: Any) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(features)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, features: Any) -> np.ndarray:
+        return self.classes_[(self.decision_function(features) > 0).astype(np.intp)]
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """
+    剪枝與量化的結果：保留的特徵數、估計的記憶體用量與評估集上的準確率差異。
+    """
+
+    dtype: str
+    tolerance: float
+    features_before: int
+    features_after: int
+    bytes_before: int
+    bytes_after: int
+    pickled_before: int
+    pickled_after: int
+    accuracy_before: float = float("nan")
+    accuracy_after: float = float("nan")
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def accuracy_delta(self) -> float:
+        return self.accuracy_after - self.accuracy_before
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "bytes_saved": self.bytes_saved, "accuracy_delta": self.accuracy_delta}
+
+
+def compact_pipeline(pipeline: Pipeline, dtype: str = "float32", tolerance: float = 0.01) -> Pipeline:
+    """
+    回傳剪枝並量化後的新管線，不修改原管線。
+
+    絕對值低於 `tolerance * max|coef|` 的係數視為近零：TF-IDF 詞彙表引擎連同詞彙與 IDF 一併移除，
+    並捨棄只供檢視的 `stop_words_`；雜湊引擎沒有詞彙表，只將係數歸零。
+    IDF 依量化型別存為 float32（`float32`）或 float16（`float16` / `int8`）。
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"不支援的量化型別：{dtype}")
+    clf = pipeline[-1]
+    coef = np.asarray(clf.coef_, dtype=np.float64)
+    if coef.ndim != 2 or coef.shape[0] != 1:
+        raise ValueError("量化僅支援二元線性分類模型。")
+    magnitude = np.abs(coef[0])
+    keep = magnitude >= tolerance * magnitude.max() if magnitude.size else magnitude.astype(bool)
+    idf_dtype = np.float32 if dtype == "float32" else np.float16
+
+    steps = list(pipeline.steps[:-1])
+    name, vectorizer = steps[0]
+    if isinstance(vectorizer, TfidfVectorizer):
+        columns = np.flatnonzero(keep)
+        remap = np.full(len(keep), -1, dtype=np.intp)
+        remap[columns] = np.arange(len(columns))
+        pruned = clone(vectorizer)
+        pruned.vocabulary_ = {
+            term: int(remap[column]) for term, column in vectorizer.vocabulary_.items() if keep[column]
+        }
+        if vectorizer.use_idf:
+            pruned.idf_ = np.asarray(vectorizer.idf_)[columns].astype(idf_dtype)
+        steps[0] = (name, pruned)
+        quantized = QuantizedLinearModel.from_linear(clf, dtype, keep=columns)
+    else:
+        steps = copy.deepcopy(steps)
+        for _, step in steps:
+            if isinstance(step, TfidfTransformer) and hasattr(step, "idf_"):
+                step.idf_ = np.asarray(step.idf_).astype(idf_dtype)
+        quantized = QuantizedLinearModel.from_linear(clf, dtype)
+        quantized.weights[~keep] = 0
+    return Pipeline([*steps, (pipeline.steps[-1][0], quantized)])
+
+
+def compaction_report(before: Pipeline, after: Pipeline, dtype: str, tolerance: float) -> CompactionReport:
+    """
+    比較剪枝前後的特徵數與記憶體用量；準確率由呼叫端以評估集填入。
+    """
+    return CompactionReport(
+        dtype=dtype,
+        tolerance=tolerance,
+        features_before=int(np.count_nonzero(np.asarray(before[-1].coef_))),
+        features_after=int(np.count_nonzero(np.asarray(after[-1].coef_))),
+        bytes_before=model_nbytes(before),
+        bytes_after=model_nbytes(after),
+        pickled_before=len(pickle.dumps(before, protocol=pickle.HIGHEST_PROTOCOL)),
+        pickled_after=len(pickle.dumps(after, protocol=pickle.HIGHEST_PROTOCOL)),
+    )
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .config import AppConfig
+from .instrumentation import REGISTRY, logger
+
+if TYPE_CHECKING:
+    from .metrics import MetricsReport
+    from .model import SpamClassifier
+
+MODEL_FILE = "model.joblib"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+HISTORY_FILE = "history.json"
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    staging = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    staging.write_text(content, encoding="utf-8")
+    os.replace(staging, path)
+
+
+@dataclass(slots=True)
+class ModelVersion:
+    """
+    登錄庫中的單一模型版本；目錄建立後內容不再變動。
+    """
+
+    version: str
+    directory: Path
+    manifest: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def model_file(self) -> Path:
+        return self.directory / MODEL_FILE
+
+
+@dataclass(slots=True)
+class ModelRegistry:
+    """
+    本機模型登錄庫。
+
+    每個版本存於 `versions/<版本>/`，內含模型、附屬檔與 `manifest.json`（指標、訓練時間、
+    資料雜湊）。目前上線版本記錄在 `CURRENT`，推進與回復皆以原子改名更新，
+    讀取端只會看到完整的舊版或新版。
+    """
+
+    root: Path
+    keep: int = 10
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "ModelRegistry":
+        return cls(root=Path(config.registry_dir), keep=config.registry_keep)
+
+    @property
+    def versions_dir(self) -> Path:
+        return Path(self.root) / "versions"
+
+    def _history(self) -> List[str]:
+        path = Path(self.root) / HISTORY_FILE
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+    def register(
+        self,
+        classifier: "SpamClassifier",
+        report: Optional["MetricsReport"] = None,
+        data_hash: Optional[str] = None,
+        promote: bool = False,
+    ) -> ModelVersion:
+        """
+        將已訓練的模型寫入新版本目錄；先寫入暫存目錄再原子改名。
+
+        未指定 `report` 與 `data_hash` 時沿用分類器最近一次訓練的評估與資料雜湊。
+        """
+        report = report if report is not None else classifier.report
+        data_hash = data_hash if data_hash is not None else classifier.data_hash
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.versions_dir / f".tmp-{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            classifier.save(staging / MODEL_FILE)
+            version = f"{time.strftime('%Y%m%dT%H%M%S')}-{classifier.model_version[:8]}"
+            suffix = 1
+            while (self.versions_dir / version).exists():
+                suffix += 1
+                version = f"{version.split('.')[0]}.{suffix}"
+            manifest = {
+                "version": version,
+                "created_at": time.time(),
+                "model_version": classifier.model_version,
+                "feature_engine": classifier.config.feature_engine,
+                "data_hash": data_hash,
+                "metrics": report.summary() if report is not None else None,
+                "operating_point": (
+                    classifier.operating_point.to_dict() if classifier.operating_point is not None else None
+                ),
+                "cascade": classifier.cascade is not None,
+            }
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+            target = self.versions_dir / version
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        classifier.model_file = target / MODEL_FILE
+
+        registered = ModelVersion(version=version, directory=target, manifest=manifest)
+        if promote:
+            self.promote(version)
+        self.prune()
+        return registered
+
+    def get(self, version: str) -> ModelVersion:
+        directory = self.versions_dir / version
+        manifest_path = directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise KeyError(f"登錄庫中找不到版本：{version}")
+        return ModelVersion(
+            version=version,
+            directory=directory,
+            manifest=json.loads(manifest_path.read_text(encoding="utf-8")),
+        )
+
+    def versions(self) -> List[ModelVersion]:
+        """
+        依建立時間由舊至新列出所有版本。
+        """
+        if not self.versions_dir.exists():
+            return []
+        found = [
+            self.get(entry.name)
+            for entry in self.versions_dir.iterdir()
+            if not entry.name.startswith(".") and (entry / MANIFEST_FILE).exists()
+        ]
+        return sorted(found, key=lambda item: (item.manifest.get("created_at", 0.0), item.version))
+
+    def current_version(self) -> Optional[str]:
+        path = Path(self.root) / CURRENT_FILE
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8").strip() or None
+
+    def current(self) -> Optional[ModelVersion]:
+        version = self.current_version()
+        return self.get(version) if version else None
+
+    def promote(self, version: str) -> ModelVersion:
+        """
+        將指定版本設為上線版本，並記錄於推進歷史以便回復。
+        """
+        target = self.get(version)
+        previous = self.current_version()
+        if previous == version:
+            return target
+        history = self._history()
+        if previous:
+            history.append(previous)
+        _write_atomic(Path(self.root) / HISTORY_FILE, json.dumps(history))
+        _write_atomic(Path(self.root) / CURRENT_FILE, version)
+        logger.info("promote", extra={"event": {"version": version, "previous": previous}})
+        return target
+
+    def rollback(self) -> ModelVersion:
+        """
+        回復到前一個上線版本。
+        """
+        history = self._history()
+        while history:
+            version = history.pop()
+            if (self.versions_dir / version / MANIFEST_FILE).exists():
+                _write_atomic(Path(self.root) / HISTORY_FILE, json.dumps(history))
+                _write_atomic(Path(self.root) / CURRENT_FILE, version)
+                logger.info("rollback", extra={"event": {"version": version}})
+                return self.get(version)
+        raise RuntimeError("沒有可回復的先前版本。")
+
+    def prune(self) -> None:
+        """
+        只保留最新的 `keep` 個版本，上線版本與回復歷史中的版本一律保留。
+        """
+        if self.keep <= 0:
+            return
+        protected = set(self._history())
+        current = self.current_version()
+        if current:
+            protected.add(current)
+        versions = self.versions()
+        for stale in versions[: max(len(versions) - self.keep, 0)]:
+            if stale.version not in protected:
+                shutil.rmtree(stale.directory, ignore_errors=True)
+
+    def load(self, config: AppConfig, version: Optional[str] = None) -> "SpamClassifier":
+        """
+        載入指定版本（預設為上線版本）為新的分類器。
+        """
+        from .model import SpamClassifier
+
+        target = self.get(version) if version else self.current()
+        if target is None:
+            raise RuntimeError("登錄庫尚未有上線版本。")
+        classifier = SpamClassifier(config=config)
+        classifier.load(target.model_file)
+        return classifier
+
+
+@dataclass(slots=True)
+class RegistryWatcher:
+    """
+    於背景執行緒輪詢登錄庫的上線版本，變更時在背景載入新模型後呼叫 `on_swap`。
+
+    載入完成前請求仍由舊模型處理；替換只是一次參照指派，不會暫停服務。
+    """
+
+    registry: ModelRegistry
+    config: AppConfig
+    on_swap: Callable[["SpamClassifier"], None]
+    interval: float = 5.0
+    loaded_version: Optional[str] = None
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="spam-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> bool:
+        """
+        檢查一次上線版本，有變更時載入並替換，回傳是否已替換。
+        """
+        version = self.registry.current_version()
+        if version is None or version == self.loaded_version:
+            return False
+        with REGISTRY.timer("hot_swap", version=version):
+            classifier = self.registry.load(self.config, version)
+            self.on_swap(classifier)
+        self.loaded_version = version
+        REGISTRY.inc("model_swaps")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:  # noqa: BLE001
+                # 載入失敗時保留舊模型繼續服務，下次輪詢再試
+                logger.exception("registry_poll_failed")
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import AppConfig
+from .instrumentation import REGISTRY, logger
+from .model import SpamClassifier
+from .registry import ModelRegistry, RegistryWatcher
+
+ROUTES = ("/predict", "/healthz", "/stats", "/metrics")
+
+
+@dataclass(slots=True)
+class MicroBatcher:
+    """
+    將並行請求聚合為微批次，在大小或等待時間到達上限時一次推論。
+    """
+
+    classifier: SpamClassifier
+    max_batch_size: int = 64
+    max_wait_ms: float = 2.0
+    _queue: Optional[asyncio.Queue] = field(default=None, init=False)
+    _worker: Optional[asyncio.Task] = field(default=None, init=False)
+    _executor: Optional[ThreadPoolExecutor] = field(default=None, init=False)
+
+    def start(self) -> None:
+        """
+        於目前事件迴圈啟動批次工作者。
+        """
+        self._queue = asyncio.Queue()
+        # 單一執行緒執行推論，避免批次間互搶 GIL，並讓佇列在推論期間持續累積
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spam-infer")
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def submit(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        送出文字並等待所屬批次的推論結果。
+        """
+        if self._queue is None:
+            raise RuntimeError("批次工作者尚未啟動。")
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+        deadline = loop.time() + self.max_wait_ms / 1000
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            batch = [text for texts, _ in pending for text in texts]
+            try:
+                labels, probs = await loop.run_in_executor(
+                    self._executor, self.classifier.predict, batch
+                )
+            except Exception as exc:  # noqa: BLE001
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for texts, future in pending:
+                results = [
+                    {"label": str(labels[idx]), "spam_probability": float(probs[idx, 1])}
+                    for idx in range(offset, offset + len(texts))
+                ]
+                offset += len(texts)
+                if not future.done():
+                    future.set_result(results)
+
+
+@dataclass(slots=True)
+class InferenceServer:
+    """
+    常駐記憶體的 asyncio HTTP 推論服務。
+
+    - `POST /predict`：`{"text": "..."}` 或 `{"texts": ["...", ...]}`
+    - `GET /healthz`：健康檢查
+    - `GET /stats`：模型版本、推論快取命中率、串接各階段計數與最近一次漂移報告
+    - `GET /metrics`：Prometheus 文字格式的計時、計數與直方圖
+
+    請求本文超過 `max_body_bytes` 時回應 413；推論失敗時回應 500 與 JSON 錯誤訊息，連線維持可用。
+    """
+
+    classifier: SpamClassifier
+    host: str = "127.0.0.1"
+    port: int = 8000
+    max_batch_size: int = 64
+    max_wait_ms: float = 2.0
+    max_body_bytes: int = 10 * 1024**2
+    batcher: Optional[MicroBatcher] = field(default=None, init=False)
+    watcher: Optional[RegistryWatcher] = field(default=None, init=False)
+    _server: Optional[asyncio.Server] = field(default=None, init=False)
+
+    @classmethod
+    def from_config(cls, config: AppConfig, classifier: SpamClassifier) -> "InferenceServer":
+        return cls(
+            classifier=classifier,
+            host=config.serve_host,
+            port=config.serve_port,
+            max_batch_size=config.batch_max_size,
+            max_wait_ms=config.batch_max_wait_ms,
+            max_body_bytes=config.serve_max_body_bytes,
+        )
+
+    async def start(self) -> asyncio.Server:
+        """
+        啟動批次工作者與 HTTP 監聽，回傳底層 asyncio Server。
+        """
+        self.batcher = MicroBatcher(
+            classifier=self.classifier,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait_ms,
+        )
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self._server
+
+    def swap(self, classifier: SpamClassifier) -> None:
+        """
+        以新模型取代目前模型；進行中的批次沿用舊模型，下一個批次起使用新模型。
+        """
+        self.classifier = classifier
+        if self.batcher is not None:
+            self.batcher.classifier = classifier
+
+    def watch_registry(self, registry: ModelRegistry, config: AppConfig) -> RegistryWatcher:
+        """
+        在背景監看登錄庫的上線版本，推進或回復時熱替換模型。
+        """
+        self.watcher = RegistryWatcher(
+            registry=registry,
+            config=config,
+            on_swap=self.swap,
+            interval=config.registry_poll_seconds,
+            loaded_version=registry.current_version(),
+        )
+        self.watcher.start()
+        return self.watcher
+
+    async def stop(self) -> None:
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.batcher is not None:
+            await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        server = await self.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    # 單行超過 StreamReader 上限時 readline 拋出 ValueError（源自 LimitOverrunError）
+                    await self._reject(writer, "other", HTTPStatus.REQUEST_URI_TOO_LONG, "請求列過長")
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "無效的請求列"}, False)
+                    break
+                # 未知路徑統一歸為 other，避免任意路徑造成指標標籤爆增
+                route = target.split("?", 1)[0]
+                route = route if route in ROUTES else "other"
+
+                headers: Dict[str, str] = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    await self._reject(writer, route, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "標頭過長")
+                    break
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "無效的 Content-Length"}, False)
+                    break
+                if length > self.max_body_bytes:
+                    # 不讀取過大的本文，直接回應並關閉連線
+                    await self._reject(
+                        writer,
+                        route,
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        f"請求本文超過上限 {self.max_body_bytes} 位元組",
+                    )
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                start = time.perf_counter()
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("request failed", extra={"event": {"target": target}})
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"推論失敗：{exc}"}
+                REGISTRY.observe("request_seconds", time.perf_counter() - start, route=route)
+                REGISTRY.inc("requests", route=route, status=status.value)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _reject(self, writer: asyncio.StreamWriter, route: str, status: HTTPStatus, message: str) -> None:
+        """
+        回應無法處理的請求並記錄指標；呼叫端隨後關閉連線，不再讀取剩餘的請求內容。
+        """
+        REGISTRY.inc("requests", route=route, status=status.value)
+        await self._respond(writer, status, {"error": message}, False)
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Dict[str, Any] | str]:
+        path = target.split("?", 1)[0]
+        if path == "/healthz":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path == "/metrics":
+            return HTTPStatus.OK, REGISTRY.render_prometheus()
+        if path == "/stats":
+            cache = self.classifier.cache
+            cascade = self.classifier.cascade
+            campaigns = self.classifier.campaigns
+            monitor = self.classifier.monitor
+            return HTTPStatus.OK, {
+                "model_version": self.classifier.model_version,
+                "cache": cache.stats() if cache is not None else None,
+                "cascade": cascade.stats.stats() if cascade is not None else None,
+                "campaigns": campaigns.stats() if campaigns is not None else None,
+                "drift": monitor.stats() if monitor is not None else None,
+                "registry_version": self.watcher.loaded_version if self.watcher is not None else None,
+            }
+        if path != "/predict":
+            return HTTPStatus.NOT_FOUND, {"error": f"找不到路徑：{path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "僅支援 POST"}
+
+        try:
+            data = json.loads(body or b"{}")
+        except json.JSONDecodeError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": f"JSON 格式錯誤：{exc}"}
+
+        if isinstance(data, dict) and isinstance(data.get("text"), str):
+            results = await self.batcher.submit([data["text"]])
+            return HTTPStatus.OK, results[0]
+        if isinstance(data, dict) and isinstance(data.get("texts"), list):
+            texts = [str(text) for text in data["texts"]]
+            if not texts:
+                return HTTPStatus.OK, {"results": []}
+            return HTTPStatus.OK, {"results": await self.batcher.submit(texts)}
+        return HTTPStatus.BAD_REQUEST, {"error": "請提供 text 或 texts 欄位。"}
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Dict[str, Any] | str,
+        keep_alive: bool,
+    ) -> None:
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin1") + body)
+        await writer.drain()
+
+
+def serve(config: AppConfig, classifier: SpamClassifier, registry: Optional[ModelRegistry] = None) -> None:
+    """
+    以阻塞方式啟動推論服務，直到中斷為止；提供登錄庫時會監看並熱替換模型。
+    """
+    server = InferenceServer.from_config(config, classifier)
+    if registry is not None:
+        server.watch_registry(registry, config)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
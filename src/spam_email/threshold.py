@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .evaluation import cumulative_counts
+from .metadata import read_metadata, update_metadata
+
+STRATEGIES = ("argmax", "f1", "fpr")
+
+
+def _logit(probabilities: np.ndarray) -> np.ndarray:
+    clipped = np.clip(probabilities, 1e-12, 1 - 1e-12)
+    return np.log(clipped) - np.log1p(-clipped)
+
+
+def fit_platt(probabilities: np.ndarray, positive: np.ndarray) -> Tuple[float, float]:
+    """
+    以 Platt scaling 擬合 `sigmoid(a * logit(p) + b)`，回傳 `(a, b)`。
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    if positive.all() or not positive.any():
+        return 1.0, 0.0
+    model = LogisticRegression(C=1e6)
+    model.fit(_logit(probabilities).reshape(-1, 1), positive)
+    return float(model.coef_[0][0]), float(model.intercept_[0])
+
+
+@dataclass(slots=True)
+class OperatingPoint:
+    """
+    模型的決策門檻與選用的機率校正參數，隨模型以附屬 JSON 保存。
+
+    `threshold` 作用於（校正後的）垃圾郵件機率，分數不低於門檻即判為垃圾郵件。
+    """
+
+    threshold: float = 0.5
+    strategy: str = "argmax"
+    target_fpr: Optional[float] = None
+    calibration: Optional[Tuple[float, float]] = None
+    precision: Optional[float] = None
+    recall: Optional[float] = None
+    fpr: Optional[float] = None
+
+    def calibrate(self, probabilities: np.ndarray) -> np.ndarray:
+        if self.calibration is None:
+            return probabilities
+        slope, intercept = self.calibration
+        return 1.0 / (1.0 + np.exp(-(slope * _logit(probabilities) + intercept)))
+
+    def apply(self, probabilities: np.ndarray, classes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        對二欄機率矩陣套用校正與門檻，回傳 `(labels, probabilities)`。
+        """
+        positive = self.calibrate(probabilities[:, 1])
+        labels = np.where(positive >= self.threshold, classes[1], classes[0])
+        return labels, np.column_stack([1.0 - positive, positive])
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["calibration"] = list(self.calibration) if self.calibration else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OperatingPoint":
+        calibration = data.get("calibration")
+        return cls(**{**data, "calibration": tuple(calibration) if calibration else None})
+
+
+def save_operating_point(model_path: Path | str, point: Optional[OperatingPoint]) -> None:
+    """
+    將操作點寫入模型的中繼資料；`None` 會移除舊值，避免沿用過期門檻。
+    """
+    if point is None and not read_metadata(model_path):
+        return
+    update_metadata(model_path, operating_point=point.to_dict() if point else None)
+
+
+def load_operating_point(model_path: Path | str) -> Optional[OperatingPoint]:
+    data = read_metadata(model_path).get("operating_point")
+    return OperatingPoint.from_dict(data) if data else None
+
+
+def select_operating_point(
+    positive: np.ndarray,
+    probabilities: np.ndarray,
+    strategy: str = "f1",
+    target_fpr: float = 0.01,
+    calibrate: bool = False,
+) -> OperatingPoint:
+    """
+    以驗證集分數排序一次後，對所有相異門檻向量化掃描選出操作點。
+
+    `fpr` 策略在正常郵件誤判率不超過 `target_fpr` 的前提下取召回率最高的門檻；
+    `f1` 策略取 F1 最高的門檻；`argmax` 保留 0.5。
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"不支援的門檻策略：{strategy}")
+    positive = np.asarray(positive, dtype=bool)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    calibration = fit_platt(probabilities, positive) if calibrate else None
+    point = OperatingPoint(strategy=strategy, calibration=calibration)
+    scores = point.calibrate(probabilities)
+
+    tps, fps, thresholds = cumulative_counts(scores, positive)
+    n_positive, n_negative = int(positive.sum()), int((~positive).sum())
+    if strategy == "argmax" or len(thresholds) == 0 or not n_positive or not n_negative:
+        idx = None
+    elif strategy == "fpr":
+        point.target_fpr = target_fpr
+        allowed = np.flatnonzero(fps / n_negative <= target_fpr)
+        idx = int(allowed[-1]) if len(allowed) else None
+        if idx is None:
+            # 即使最高門檻也超過目標誤判率時，只有高於所有分數的門檻能達成
+            point.threshold = float(np.nextafter(thresholds[0], np.inf))
+    else:
+        idx = int(np.argmax(2 * tps / (tps + fps + n_positive)))
+
+    if idx is not None:
+        point.threshold = float(thresholds[idx])
+    flagged = scores >= point.threshold
+    true_positive = int((flagged & positive).sum())
+    point.precision = true_positive / int(flagged.sum()) if flagged.any() else 0.0
+    point.recall = true_positive / n_positive if n_positive else 0.0
+    point.fpr = int((flagged & ~positive).sum()) / n_negative if n_negative else 0.0
+    return point
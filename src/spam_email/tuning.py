@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn import metrics
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+from sklearn.pipeline import Pipeline
+
+from .config import AppConfig
+from .model import SpamClassifier
+
+DEFAULT_PARAM_GRID: Dict[str, List[Any]] = {
+    "vectorize__max_features": [5000, 10000, 20000],
+    "vectorize__ngram_range": [(1, 1), (1, 2)],
+    "clf__C": [0.25, 1.0, 4.0, 16.0],
+}
+SCORERS = ("f1", "roc_auc", "accuracy")
+
+
+def normalize_param_grid(grid: Mapping[str, Sequence[Any]]) -> Dict[str, List[Any]]:
+    """
+    將 JSON 讀入的串列參數（例如 `ngram_range`）轉回 scikit-learn 需要的 tuple。
+    """
+    return {
+        name: [tuple(value) if isinstance(value, list) else value for value in values]
+        for name, values in grid.items()
+    }
+
+
+@dataclass(slots=True)
+class CandidateResult:
+    """
+    單一參數組合的交叉驗證結果與耗時。
+    """
+
+    params: Dict[str, Any]
+    scores: List[float] = field(default_factory=list)
+    fit_seconds: float = 0.0
+    vectorize_seconds: float = 0.0
+
+    @property
+    def mean_score(self) -> float:
+        return float(np.mean(self.scores)) if self.scores else float("nan")
+
+    @property
+    def std_score(self) -> float:
+        return float(np.std(self.scores)) if self.scores else float("nan")
+
+    @property
+    def wall_seconds(self) -> float:
+        return self.fit_seconds + self.vectorize_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "params": {key: list(value) if isinstance(value, tuple) else value for key, value in self.params.items()},
+            "mean_score": self.mean_score,
+            "std_score": self.std_score,
+            "fit_seconds": self.fit_seconds,
+            "vectorize_seconds": self.vectorize_seconds,
+            "wall_seconds": self.wall_seconds,
+        }
+
+
+@dataclass(slots=True)
+class TuningResult:
+    """
+    超參數搜尋結果，依平均分數由高至低排序。
+    """
+
+    scoring: str
+    candidates: List[CandidateResult]
+    wall_seconds: float
+
+    @property
+    def best(self) -> CandidateResult:
+        return self.candidates[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scoring": self.scoring,
+            "wall_seconds": self.wall_seconds,
+            "best_params": self.best.to_dict()["params"],
+            "best_score": self.best.mean_score,
+            "candidates": [candidate.to_dict() for candidate in self.candidates],
+        }
+
+
+def _split_params(params: Mapping[str, Any]) -> Tuple[Tuple[Tuple[str, Any], ...], Dict[str, Any]]:
+    feature_params = tuple(sorted((key, value) for key, value in params.items() if not key.startswith("clf__")))
+    clf_params = {key[len("clf__"):]: value for key, value in params.items() if key.startswith("clf__")}
+    return feature_params, clf_params
+
+
+def _score(scoring: str, y_true: np.ndarray, clf: Any, features: Any, positive: str) -> float:
+    if scoring == "roc_auc":
+        column = list(clf.classes_).index(positive)
+        return float(metrics.roc_auc_score(y_true == positive, clf.predict_proba(features)[:, column]))
+    y_pred = clf.predict(features)
+    if scoring == "accuracy":
+        return float(metrics.accuracy_score(y_true, y_pred))
+    return float(metrics.f1_score(y_true, y_pred, pos_label=positive, zero_division=0))
+
+
+def _evaluate_group(
+    feature_template: Pipeline,
+    clf_template: Any,
+    feature_params: Tuple[Tuple[str, Any], ...],
+    clf_candidates: List[Tuple[int, Dict[str, Any]]],
+    texts: np.ndarray,
+    labels: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    scoring: str,
+    positive: str,
+) -> Tuple[float, List[Tuple[int, float, float]]]:
+    # 同一組特徵參數在此 fold 只向量化一次，所有分類器參數共用同一份稀疏矩陣
+    start = time.perf_counter()
+    features = clone(feature_template).set_params(**dict(feature_params))
+    x_train = features.fit_transform(texts[train_idx])
+    x_test = features.transform(texts[test_idx])
+    vectorize_seconds = time.perf_counter() - start
+
+    outcomes = []
+    for candidate_idx, clf_params in clf_candidates:
+        start = time.perf_counter()
+        clf = clone(clf_template).set_params(**clf_params)
+        clf.fit(x_train, labels[train_idx])
+        fit_seconds = time.perf_counter() - start
+        outcomes.append((candidate_idx, _score(scoring, labels[test_idx], clf, x_test, positive), fit_seconds))
+    return vectorize_seconds, outcomes
+
+
+def tune(
+    frame: pd.DataFrame,
+    config: AppConfig,
+    param_grid: Optional[Mapping[str, Sequence[Any]]] = None,
+    n_iter: Optional[int] = None,
+    folds: int = 5,
+    scoring: str = "f1",
+    n_jobs: Optional[int] = None,
+) -> TuningResult:
+    """
+    以 k-fold 交叉驗證進行網格或隨機搜尋，並以所有核心平行處理。
+
+    參數組合依特徵參數分組，每組在每個 fold 只向量化一次，
+    僅改變分類器參數的候選組合因此不會重新斷詞。
+    """
+    if scoring not in SCORERS:
+        raise ValueError(f"不支援的評分方式：{scoring}")
+    grid = normalize_param_grid(param_grid or DEFAULT_PARAM_GRID)
+    if n_iter:
+        candidates = list(ParameterSampler(grid, n_iter=n_iter, random_state=config.random_state))
+    else:
+        candidates = list(ParameterGrid(grid))
+
+    template = SpamClassifier(config=config).build_pipeline()
+    feature_template = Pipeline(template.steps[:-1])
+    clf_template = template.steps[-1][1]
+
+    groups: Dict[Tuple[Tuple[str, Any], ...], List[Tuple[int, Dict[str, Any]]]] = defaultdict(list)
+    for idx, params in enumerate(candidates):
+        feature_params, clf_params = _split_params(params)
+        groups[feature_params].append((idx, clf_params))
+
+    texts = frame[config.text_column].to_numpy()
+    labels = frame[config.label_column].to_numpy()
+    positive = sorted(np.unique(labels))[-1]
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=config.random_state)
+    splits = list(splitter.split(texts, labels))
+
+    start = time.perf_counter()
+    outputs = Parallel(n_jobs=config.n_jobs if n_jobs is None else n_jobs)(
+        delayed(_evaluate_group)(
+            feature_template,
+            clf_template,
+            feature_params,
+            clf_candidates,
+            texts,
+            labels,
+            train_idx,
+            test_idx,
+            scoring,
+            positive,
+        )
+        for feature_params, clf_candidates in groups.items()
+        for train_idx, test_idx in splits
+    )
+    wall_seconds = time.perf_counter() - start
+
+    results = [CandidateResult(params=params) for params in candidates]
+    group_sizes = {idx: len(group) for group in groups.values() for idx, _ in group}
+    for vectorize_seconds, outcomes in outputs:
+        for candidate_idx, score, fit_seconds in outcomes:
+            result = results[candidate_idx]
+            result.scores.append(score)
+            result.fit_seconds += fit_seconds
+            # 共用的向量化成本平均分攤到同組候選
+            result.vectorize_seconds += vectorize_seconds / group_sizes[candidate_idx]
+
+    results.sort(key=lambda item: item.mean_score, reverse=True)
+    return TuningResult(scoring=scoring, candidates=results, wall_seconds=wall_seconds)
@@ -9,7 +9,11 @@ import seaborn as sns
 from .metrics import MetricsReport
 
 
-plt.rcParams['font.family'] = 'Times New Roman'
+def apply_plot_style() -> None:
+    """
+    設定圖表字型；於首次建立圖表時才套用，匯入模組不修改 matplotlib 全域設定。
+    """
+    plt.rcParams['font.family'] = 'Times New Roman'
 
 
 @dataclass(slots=True)
@@ -18,6 +22,9 @@ class VisualizationBuilder:
 
     report: MetricsReport
 
+    def __post_init__(self) -> None:
+        apply_plot_style()
+
     def confusion_matrix_fig(self) -> plt.Figure:
         fig, ax = plt.subplots(figsize=(6, 4))
         sns.heatmap(
@@ -1,6 +1,5 @@
 ﻿from __future__ import annotations
 
-import io
 from pathlib import Path
 from typing import Optional
 
@@ -9,8 +8,10 @@ import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
+from src.spam_email.batch import score_chunk
 from src.spam_email.config import AppConfig
-from src.spam_email.data import DatasetLoader
+from src.spam_email.data import DatasetLoader, iter_csv_chunks
+from src.spam_email.feature_cache import frame_hash
 from src.spam_email.metrics import MetricsReport
 from src.spam_email.model import SpamClassifier
 from src.spam_email.visualization import VisualizationBuilder
@@ -21,7 +22,7 @@ st.set_page_config(
     page_icon="📧",
 )
 
-BASE_CONFIG = AppConfig()
+BASE_CONFIG = AppConfig(feature_cache_enabled=True)
 TAB_TITLES = ["資料概覽", "模型評估", "即時推論", "批次推論"]
 
 
@@ -40,54 +41,62 @@ def prepare_classifier(frame: pd.DataFrame) -> tuple[SpamClassifier, MetricsRepo
     return classifier, report
 
 
+@st.cache_resource(show_spinner=True)
+def load_trained_classifier(
+    model_mtime: float,
+    data_hash: str,
+    _frame: pd.DataFrame,
+) -> tuple[SpamClassifier, MetricsReport]:
+    """
+    載入已儲存的模型並讀取模型旁的評估快照，快照相符時不需重新評估整個資料集。
+    以模型檔修改時間與資料雜湊為快取鍵，重新訓練、替換模型或資料集變更後自動失效。
+    """
+    classifier = SpamClassifier(BASE_CONFIG)
+    classifier.load()
+    return classifier, classifier.evaluate_cached(_frame)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def render_evaluation(snapshot_key: str, _report: MetricsReport) -> tuple:
+    """
+    依模型與資料版本快取評估表格與圖表，重新執行頁面時不再重繪 Matplotlib 圖形。
+    """
+    builder = VisualizationBuilder(report=_report)
+    return (
+        builder.metrics_table(),
+        builder.confusion_matrix_fig(),
+        builder.roc_curve_fig(),
+        builder.pr_curve_fig(),
+    )
+
+
 def read_uploaded_csv(uploaded_file) -> pd.DataFrame:
     """
     Read an uploaded CSV and ensure a `text` column exists for inference.
     If missing, columns will be renamed with the last column treated as text.
+    The header is inspected once so the file is parsed a single time.
     """
 
-    content = uploaded_file.read()
+    chunks = list(iter_csv_chunks(uploaded_file, BASE_CONFIG.text_column, BASE_CONFIG.batch_chunk_size))
     uploaded_file.seek(0)
-
-    # Initial read to inspect structure
-    dataframe = pd.read_csv(io.BytesIO(content), encoding="latin1")
-
-    if BASE_CONFIG.text_column in dataframe.columns and len(dataframe.columns) >= 1:
-        dataframe[BASE_CONFIG.text_column] = dataframe[BASE_CONFIG.text_column].astype(str)
-        return dataframe
-
-    column_count = dataframe.shape[1]
-    if column_count == 0:
-        raise ValueError("CSV 檔案內沒有任何欄位。")
-
-    # Re-read treating the file as having no header so we can assign names explicitly
-    header_names = []
-    for idx in range(column_count):
-        if idx == column_count - 1:
-            header_names.append(BASE_CONFIG.text_column)
-        elif idx == 0:
-            header_names.append("label")
-        else:
-            header_names.append(f"col_{idx}")
-
-    dataframe = pd.read_csv(
-        io.BytesIO(content),
-        encoding="latin1",
-        names=header_names,
-        header=None,
-    )
-
-    dataframe[BASE_CONFIG.text_column] = dataframe[BASE_CONFIG.text_column].astype(str)
-    return dataframe
+    if not chunks:
+        raise ValueError("CSV 檔案內沒有任何資料。")
+    return pd.concat(chunks, ignore_index=True)
 
 
 def run_batch_prediction(classifier: SpamClassifier, dataframe: pd.DataFrame) -> pd.DataFrame:
-    labels, probs = classifier.predict(dataframe[BASE_CONFIG.text_column].astype(str).tolist())
+    scored = pd.concat(
+        [
+            score_chunk(classifier, dataframe.iloc[start : start + BASE_CONFIG.batch_chunk_size])
+            for start in range(0, len(dataframe), BASE_CONFIG.batch_chunk_size)
+        ],
+        ignore_index=True,
+    )
     return pd.DataFrame(
         {
-            "郵件內容": dataframe[BASE_CONFIG.text_column],
-            "預測標籤": labels,
-            "垃圾機率": probs[:, 1],
+            "郵件內容": scored[BASE_CONFIG.text_column],
+            "預測標籤": scored["predicted_label"],
+            "垃圾機率": scored["spam_probability"],
         }
     )
 
@@ -122,9 +131,11 @@ def main() -> None:
         classifier, report = prepare_classifier(frame)
     else:
         try:
-            classifier = SpamClassifier(BASE_CONFIG)
-            classifier.load()
-            report = classifier.evaluate(frame)
+            classifier, report = load_trained_classifier(
+                BASE_CONFIG.model_path.stat().st_mtime,
+                frame_hash(frame, [BASE_CONFIG.label_column, BASE_CONFIG.text_column]),
+                frame,
+            )
         except Exception:
             classifier, report = prepare_classifier(frame)
 
@@ -147,14 +158,17 @@ def main() -> None:
 
     with tabs[1]:
         st.subheader("模型評估")
-        builder = VisualizationBuilder(report=report)
-        st.dataframe(builder.metrics_table())
+        metrics_table, confusion_fig, roc_fig, pr_fig = render_evaluation(
+            f"{classifier.model_version}:{classifier.data_hash}",
+            report,
+        )
+        st.dataframe(metrics_table)
         col1, col2 = st.columns(2)
         with col1:
-            st.pyplot(builder.confusion_matrix_fig())
+            st.pyplot(confusion_fig)
         with col2:
-            st.pyplot(builder.roc_curve_fig())
-        st.pyplot(builder.pr_curve_fig())
+            st.pyplot(roc_fig)
+        st.pyplot(pr_fig)
 
     with tabs[2]:
         st.subheader("即時推論")
@@ -163,10 +177,11 @@ def main() -> None:
             if not single_text.strip():
                 st.warning("請先輸入郵件內容。")
             else:
-                labels, probs = classifier.predict([single_text.strip()])
+                explanation = classifier.explain([single_text.strip()])[0]
                 st.session_state["single_result"] = {
-                    "label": labels[0],
-                    "prob": float(probs[0][1]),
+                    "label": explanation.label,
+                    "prob": explanation.spam_probability,
+                    "terms": explanation.contributions,
                 }
                 st.session_state["target_tab"] = TAB_TITLES.index("即時推論")
                 st.rerun()
@@ -176,6 +191,9 @@ def main() -> None:
             st.success(
                 f"預測標籤：{result['label']}，垃圾郵件機率 **{result['prob']:.2%}**"
             )
+            if result.get("terms"):
+                st.caption("影響判斷最大的詞項（正值推向垃圾郵件）")
+                st.dataframe(pd.DataFrame(result["terms"], columns=["詞項", "貢獻"]))
 
     with tabs[3]:
         st.subheader("批次推論")
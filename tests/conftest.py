@@ -3,6 +3,25 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pandas as pd
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture()
+def sample_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"label": "ham", "text": "Hi there, let's catch up tomorrow."},
+            {"label": "spam", "text": "WIN a brand new car by clicking here!!!"},
+            {"label": "ham", "text": "Reminder: project meeting at 2pm."},
+            {"label": "spam", "text": "Exclusive offer!!! Limited time deal."},
+            {"label": "ham", "text": "Lunch plans for next week?"},
+            {"label": "spam", "text": "Get rich quick by subscribing now!!!"},
+            {"label": "ham", "text": "Team standup moved to 10am."},
+            {"label": "spam", "text": "Mega discount newsletter just for you."},
+        ]
+    )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.spam_email.artifact import CompactPredictor
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def test_compact_predictor_matches_pipeline(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    target = classifier.export_compact(tmp_path / "model.compact")
+
+    predictor = CompactPredictor.load(target)
+    texts = sample_frame["text"].tolist() + ["", "the and of", "Café OFFER offer offer!!! 10am"]
+    labels, probs = predictor.predict(texts)
+    expected_labels, expected_probs = classifier.predict(texts)
+
+    assert (labels == expected_labels).all()
+    assert np.allclose(probs, expected_probs)
+
+
+def test_compact_predictor_matches_cascade(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.cascade_enabled, config.cascade_low, config.cascade_high = True, 0.3, 0.7
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    predictor = CompactPredictor.load(classifier.export_compact(tmp_path / "model.compact"))
+    assert predictor.cascade_band == (0.3, 0.7)
+
+    texts = sample_frame["text"].tolist() + ["", "win win WIN", "lunch tomorrow?"]
+    labels, probs = predictor.predict(texts)
+    expected_labels, expected_probs = classifier.predict(texts)
+    stats = classifier.cascade.stats
+    assert 0 < stats.full_model < stats.total
+    assert (labels == expected_labels).all()
+    assert np.allclose(probs, expected_probs)
+
+
+def test_compact_export_rejects_hashing_engine(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(feature_engine="hashing")
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    with pytest.raises(ValueError):
+        classifier.export_compact(tmp_path / "model.compact")
+
+
+def test_lean_runtime_does_not_import_heavy_packages():
+    code = (
+        "import sys\n"
+        "from src.spam_email import CompactPredictor, AppConfig\n"
+        "heavy = [name for name in ('sklearn', 'pandas', 'matplotlib') if name in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.spam_email.batch import predict_file
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def test_predict_file_streams_csv_and_jsonl(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    _, expected = classifier.predict(sample_frame["text"].tolist())
+
+    headerless = tmp_path / "mail.csv"
+    sample_frame.to_csv(headerless, index=False, header=False)
+    csv_out = tmp_path / "scored.csv"
+    assert predict_file(classifier, headerless, csv_out, chunk_size=3) == len(sample_frame)
+
+    scored = pd.read_csv(csv_out)
+    assert list(scored["text"]) == list(sample_frame["text"])
+    assert np.allclose(scored["spam_probability"], expected[:, 1])
+
+    jsonl = tmp_path / "mail.jsonl"
+    sample_frame.to_json(jsonl, orient="records", lines=True)
+    jsonl_out = tmp_path / "scored.jsonl"
+    assert predict_file(classifier, jsonl, jsonl_out, chunk_size=3) == len(sample_frame)
+
+    records = [json.loads(line) for line in jsonl_out.read_text(encoding="utf-8").splitlines()]
+    assert [record["label"] for record in records] == list(sample_frame["label"])
+    assert np.allclose([record["spam_probability"] for record in records], expected[:, 1])
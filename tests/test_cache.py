@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.spam_email.cache import PredictionCache
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def test_cached_predictions_match_and_count_hits(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.prediction_cache_size = 100
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    texts = sample_frame["text"].tolist()
+    batch = texts + [text.upper() + "  " for text in texts]
+    labels, probs = classifier.predict(batch)
+    expected_labels, expected_probs = classifier._infer(batch)
+
+    assert (labels == expected_labels).all()
+    assert np.allclose(probs, expected_probs)
+    assert classifier.cache.misses == len(texts)
+    assert classifier.cache.hits == len(texts)
+
+    classifier.predict(texts[:2])
+    assert classifier.cache.hits == len(texts) + 2
+
+
+def test_cache_evicts_by_size_and_ttl():
+    cache = PredictionCache(max_size=2, ttl=None)
+    for idx in range(3):
+        cache.put(PredictionCache.make_key(f"mail {idx}", "v1"), "ham", np.array([1.0, 0.0]))
+    assert len(cache) == 2
+    assert cache.get(PredictionCache.make_key("mail 0", "v1")) is None
+    assert cache.get(PredictionCache.make_key("mail 2", "v2")) is None
+
+    expiring = PredictionCache(max_size=2, ttl=-1)
+    key = PredictionCache.make_key("mail", "v1")
+    expiring.put(key, "spam", np.array([0.0, 1.0]))
+    assert expiring.get(key) is None
+    assert expiring.evictions == 1
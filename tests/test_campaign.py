@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.spam_email.batch import predict_file
+from src.spam_email.campaign import CampaignIndex, MinHasher
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+TEMPLATES = (
+    "Congratulations {name}! You have won a $1000 gift card. Claim it at http://win.example/{ref} before Friday.",
+    "Hi {name}, your parcel {ref} is held at customs. Pay the release fee at www.parcel-{ref}.com today.",
+)
+NAMES = ("John", "Alice", "Mohammed", "Yuki")
+
+
+def _feed(copies: int = 20) -> list[str]:
+    return [
+        template.format(name=NAMES[idx % len(NAMES)], ref=1000 + idx)
+        for idx in range(copies)
+        for template in TEMPLATES
+    ]
+
+
+def _constant_score(calls: list):
+    def score(texts):
+        calls.append(list(texts))
+        return np.array(["spam"] * len(texts)), np.tile([0.2, 0.8], (len(texts), 1))
+
+    return score
+
+
+def test_signatures_estimate_similarity():
+    hasher = MinHasher()
+    first, variant, other = hasher.signatures(
+        [
+            "Congratulations John! You have won a $1000 gift card, call 0800 123 456 now",
+            "Congratulations Alice! You have won a $2500 gift card, call 0800 999 111 now",
+            "Are we still meeting for lunch tomorrow near the office?",
+        ]
+    )
+    assert np.mean(first == variant) >= 0.6
+    assert np.mean(first == other) < 0.2
+    assert hasher.signatures([]).shape == (0, hasher.num_perm)
+
+
+def test_batch_signatures_match_per_message():
+    hasher = MinHasher()
+    texts = ["Win a prize \x1e now", "", "hello hello world", "!!!", "Call 0800 123 456 for your gift"]
+    batch = hasher.signatures(texts)
+    # 郵件邊界由每封郵件的詞數決定，與批次內其他郵件的內容無關
+    for row, text in zip(batch, texts):
+        assert np.array_equal(row, hasher.signatures([text])[0])
+    assert not batch[1].any() and not batch[3].any()
+    assert (hasher.signatures(["", "..."]) == 0).all()
+
+
+def test_index_scores_one_representative_per_campaign():
+    index = CampaignIndex()
+    calls: list = []
+    texts = _feed() + ["Are we still meeting for lunch tomorrow?"]
+    labels, probs, campaign_ids = index.predict(texts, _constant_score(calls), model_version="v1")
+
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert len(labels) == len(texts) and probs.shape == (len(texts), 2)
+    assert len(set(campaign_ids[0:-1:2])) == 1 and len(set(campaign_ids[1:-1:2])) == 1
+    assert sorted(size for _, size in index.largest()) == [1, 20, 20]
+
+    # 後續批次的同一活動直接沿用結果，模型版本改變時重新分群
+    index.predict(_feed(5), _constant_score(calls), model_version="v1")
+    assert len(calls) == 1
+    assert index.stats()["scored"] == 3
+    index.predict(_feed(5), _constant_score(calls), model_version="v2")
+    assert len(calls) == 2 and len(calls[1]) == 2
+
+
+def test_index_evicts_oldest_campaigns():
+    index = CampaignIndex(max_clusters=1)
+    calls: list = []
+    index.predict(_feed(2), _constant_score(calls))
+    assert len(index.campaigns) == 1
+    index.predict(_feed(2), _constant_score(calls))
+    assert len(calls) == 2
+
+
+def test_predict_file_with_dedupe(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.dedupe_enabled = True
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    source = tmp_path / "feed.csv"
+    pd.DataFrame({"text": _feed()}).to_csv(source, index=False)
+    output = tmp_path / "scored.csv"
+    assert predict_file(classifier, source, output, chunk_size=7) == 40
+
+    scored = pd.read_csv(output)
+    assert scored["campaign_id"].nunique() == 2
+    assert classifier.campaigns.stats()["scored"] == 2
+    plain = SpamClassifier(config=AppConfig.from_env(model_path=str(tmp_path / "model.joblib")))
+    plain.pipeline = classifier.pipeline
+    expected, _ = plain.predict(_feed()[:2])
+    assert list(scored["predicted_label"][:2]) == list(expected)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.spam_email.cascade import prefilter_path
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.threshold import OperatingPoint
+
+
+def _train(sample_frame: pd.DataFrame, tmp_path, **overrides) -> SpamClassifier:
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    return classifier
+
+
+def test_cascade_routes_only_uncertain_band(sample_frame: pd.DataFrame, tmp_path):
+    texts = sample_frame["text"].tolist() * 3
+    full = _train(sample_frame, tmp_path)
+    expected_labels, expected_probs = full.predict(texts)
+
+    # 區間涵蓋全部機率時，所有郵件都交給完整模型，結果與未串接相同
+    passthrough = _train(sample_frame, tmp_path, cascade_enabled=True, cascade_low=0.0, cascade_high=1.0)
+    passthrough.cascade.stats.reset()
+    labels, probs = passthrough.predict(texts)
+    assert list(labels) == list(expected_labels)
+    assert np.allclose(probs, expected_probs)
+    assert passthrough.cascade.stats.full_model == len(texts)
+
+    eager = _train(sample_frame, tmp_path, cascade_enabled=True, cascade_low=0.45, cascade_high=0.55)
+    eager.cascade.stats.reset()
+    labels, _ = eager.predict(texts)
+    stats = eager.cascade.stats.stats()
+    assert stats["total"] == len(texts)
+    assert stats["early_ham"] + stats["early_spam"] + stats["full_model"] == len(texts)
+    assert stats["early_exit_rate"] > 0
+    assert set(labels) <= {"ham", "spam"}
+
+
+def test_cascade_persists_next_to_model(sample_frame: pd.DataFrame, tmp_path):
+    classifier = _train(sample_frame, tmp_path, cascade_enabled=True)
+    saved = classifier.save()
+    assert prefilter_path(saved).exists()
+
+    loaded = SpamClassifier(config=classifier.config)
+    loaded.load()
+    assert loaded.cascade is not None
+    assert loaded.cascade.low == classifier.config.cascade_low
+    texts = sample_frame["text"].tolist()
+    assert list(loaded.predict(texts)[0]) == list(classifier.predict(texts)[0])
+
+    _train(sample_frame, tmp_path).save()
+    assert not prefilter_path(saved).exists()
+    loaded.load()
+    assert loaded.cascade is None
+
+
+def test_cascade_early_exits_use_raw_stage1_band(sample_frame: pd.DataFrame, tmp_path):
+    classifier = _train(
+        sample_frame,
+        tmp_path,
+        cascade_enabled=True,
+        cascade_low=0.3,
+        cascade_high=0.7,
+        decision_strategy="f1",
+        calibrate_probabilities=True,
+    )
+    point = OperatingPoint(threshold=0.6, strategy="f1", calibration=(2.0, 0.4))
+    classifier.operating_point = point
+    classifier.cascade.low, classifier.cascade.high = 0.3, 0.7
+    texts = sample_frame["text"].tolist()
+    labels, probs = classifier.predict(texts)
+
+    stage1_probs = classifier.cascade.prefilter.predict_proba(texts)
+    full_labels, full_probs = classifier._classify(classifier._vectorize(texts))
+    early = (stage1_probs[:, 1] <= 0.3) | (stage1_probs[:, 1] >= 0.7)
+    assert early.any() and not early.all()
+    # 提前輸出的郵件回傳第一階段自身的機率，不套用完整模型的 Platt 校正
+    assert np.allclose(probs[early], stage1_probs[early])
+    assert list(labels[early]) == ["spam" if p >= 0.7 else "ham" for p in stage1_probs[early, 1]]
+    assert list(labels[~early]) == list(full_labels[~early])
+    assert np.allclose(probs[~early], full_probs[~early])
+    # 提前輸出的標籤與操作點門檻一致
+    assert ((probs[:, 1] >= point.threshold) == (labels == "spam"))[early].all()
+
+
+def test_cascade_band_widens_to_include_threshold(sample_frame: pd.DataFrame, tmp_path):
+    classifier = _train(sample_frame, tmp_path, cascade_enabled=True, cascade_low=0.6, cascade_high=0.9)
+    # argmax 門檻 0.5 落在區間外，訓練不報錯而是將 low 移到門檻與 0 的中點
+    assert (classifier.cascade.low, classifier.cascade.high) == (0.25, 0.9)
+    assert classifier.cascade.include_threshold(OperatingPoint(threshold=0.95, strategy="fpr"))
+    assert classifier.cascade.high == pytest.approx(0.975)
+    assert not classifier.cascade.include_threshold(OperatingPoint(threshold=0.5))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from src.spam_email.config import AppConfig
+from src.spam_email.data import DatasetLoader, text_dtype
+
+
+def test_load_builds_snapshot_and_reads_shards(sample_frame: pd.DataFrame, tmp_path):
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    sample_frame.iloc[:4].to_csv(shards / "part-0.csv", index=False, header=False)
+    sample_frame.iloc[4:].to_csv(shards / "part-1.csv", index=False)
+
+    config = AppConfig.from_env(cache_dir=str(tmp_path / "cache"))
+    loader = DatasetLoader(config=config)
+    frame = loader.load(shards)
+
+    assert list(frame["text"]) == list(sample_frame["text"])
+    assert isinstance(frame["label"].dtype, pd.CategoricalDtype)
+    assert list(frame["label"].cat.categories) == ["ham", "spam"]
+    assert frame["text"].dtype == text_dtype()
+    snapshots = sorted((tmp_path / "cache" / "datasets").glob("*.arrow"))
+    assert len(snapshots) == 2
+
+    mtimes = [path.stat().st_mtime_ns for path in snapshots]
+    reloaded = loader.load(shards / "part-*.csv")
+    assert [path.stat().st_mtime_ns for path in snapshots] == mtimes
+    assert reloaded["text"].tolist() == frame["text"].tolist()
+
+    # 來源更新後寫入新快照，同一來源的舊快照隨即移除
+    sample_frame.iloc[:3].to_csv(shards / "part-0.csv", index=False, header=False)
+    assert len(loader.load(shards)) == len(sample_frame) - 1
+    current = sorted((tmp_path / "cache" / "datasets").glob("*.arrow"))
+    assert len(current) == 2 and snapshots[0] not in current and snapshots[1] in current
+
+
+def test_load_without_snapshot_matches(sample_frame: pd.DataFrame, tmp_path):
+    source = tmp_path / "data.csv"
+    sample_frame.to_csv(source, index=False, header=False)
+    config = AppConfig.from_env(cache_dir=str(tmp_path / "cache"))
+    config.dataset_snapshot = False
+
+    frame = DatasetLoader(config=config).load(source)
+
+    assert list(frame["label"]) == list(sample_frame["label"])
+    assert isinstance(frame["label"].dtype, pd.CategoricalDtype)
+    assert frame["text"].dtype == text_dtype()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_load_rejects_headerless_single_column(tmp_path):
+    source = tmp_path / "texts.csv"
+    source.write_text("hello there\nwin a prize\n", encoding="latin1")
+    config = AppConfig.from_env(cache_dir=str(tmp_path / "cache"))
+    with pytest.raises(ValueError, match="label"):
+        DatasetLoader(config=config).load(source)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.spam_email.config import AppConfig
+from src.spam_email.data import DatasetLoader
+from src.spam_email.download import DatasetDownloadError, StreamingDownloader
+
+PAYLOAD = b"ham,hello there\nspam,win a free prize now\n" * 200
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    requests_seen: list = []
+    validators: dict = {"ETag": ETAG}
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        type(self).requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range") in self.validators.values():
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        else:
+            self.send_response(200)
+        body = PAYLOAD[start:]
+        for name, value in self.validators.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def http_url():
+    _RangeHandler.requests_seen = []
+    _RangeHandler.validators = {"ETag": ETAG}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/spam.csv"
+    server.shutdown()
+
+
+def test_download_resumes_and_refreshes_conditionally(http_url, tmp_path):
+    dest = tmp_path / "spam.csv"
+    partial = tmp_path / "spam.csv.part"
+    partial.write_bytes(PAYLOAD[:100])
+    (tmp_path / "spam.csv.part.meta.json").write_text('{"etag": "\\"v1\\""}', encoding="utf-8")
+
+    downloader = StreamingDownloader(url=http_url, sha256=hashlib.sha256(PAYLOAD).hexdigest(), chunk_size=64)
+    assert downloader.fetch(dest) == dest
+    assert dest.read_bytes() == PAYLOAD
+    assert not partial.exists()
+    assert _RangeHandler.requests_seen[0]["Range"] == "bytes=100-"
+
+    mtime = dest.stat().st_mtime_ns
+    downloader.fetch(dest, refresh=True)
+    assert _RangeHandler.requests_seen[-1]["If-None-Match"] == ETAG
+    assert dest.stat().st_mtime_ns == mtime
+
+
+def test_resume_falls_back_to_last_modified_or_restarts(http_url, tmp_path):
+    dest = tmp_path / "spam.csv"
+    partial = tmp_path / "spam.csv.part"
+    partial_meta = tmp_path / "spam.csv.part.meta.json"
+    downloader = StreamingDownloader(url=http_url, sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    # 遠端沒有 ETag 時以 Last-Modified 作為 If-Range
+    _RangeHandler.validators = {"Last-Modified": LAST_MODIFIED}
+    partial.write_bytes(PAYLOAD[:100])
+    partial_meta.write_text(json.dumps({"last_modified": LAST_MODIFIED}), encoding="utf-8")
+    downloader.fetch(dest)
+    assert _RangeHandler.requests_seen[-1]["If-Range"] == LAST_MODIFIED
+    assert _RangeHandler.requests_seen[-1]["Range"] == "bytes=100-"
+    assert dest.read_bytes() == PAYLOAD
+
+    # 沒有任何驗證值時捨棄暫存檔重新下載，而不是把新內容接在舊內容之後
+    _RangeHandler.validators = {}
+    dest.unlink()
+    partial.write_bytes(b"stale bytes from an older revision")
+    partial_meta.write_text("{}", encoding="utf-8")
+    downloader.fetch(dest)
+    assert "Range" not in _RangeHandler.requests_seen[-1]
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_keeps_destination_untouched(http_url, tmp_path):
+    dest = tmp_path / "spam.csv"
+    with pytest.raises(DatasetDownloadError):
+        StreamingDownloader(url=http_url, sha256="0" * 64).fetch(dest)
+    assert not dest.exists()
+    assert not (tmp_path / "spam.csv.part").exists()
+
+
+def test_loader_uses_mirror_and_file_url(tmp_path):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "spam.csv").write_bytes(PAYLOAD)
+
+    config = AppConfig(
+        data_url="http://unreachable.invalid/datasets/spam.csv",
+        local_data_path=tmp_path / "data" / "spam.csv",
+        cache_dir=tmp_path / "cache",
+        data_mirror_dir=mirror,
+        data_sha256=hashlib.sha256(PAYLOAD).hexdigest(),
+    )
+    assert DatasetLoader(config=config).ensure_local_copy().read_bytes() == PAYLOAD
+
+    dest = tmp_path / "copy.csv"
+    StreamingDownloader(url=(mirror / "spam.csv").as_uri()).fetch(dest)
+    assert dest.read_bytes() == PAYLOAD
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.spam_email.config import AppConfig
+from src.spam_email.drift import CountMinSketch, DriftBaseline, DriftMonitor, baseline_path, kl_divergence, psi
+from src.spam_email.instrumentation import REGISTRY
+from src.spam_email.model import SpamClassifier
+
+
+def test_divergences_and_sketch():
+    expected = np.array([50, 30, 20, 0])
+    assert psi(expected, expected * 3) == kl_divergence(expected, expected) == 0.0
+    assert psi(expected, np.array([20, 30, 50, 0])) > psi(expected, np.array([45, 30, 25, 0])) > 0
+
+    sketch = CountMinSketch(width=64, depth=3)
+    tokens = [f"token{idx}" for idx in range(200)]
+    sketch.add(tokens, list(range(200)))
+    sketch.add(["token199"])
+    estimates = sketch.estimate(tokens)
+    assert (estimates >= np.arange(200)).all() and estimates[-1] >= 200
+    assert sketch.total == sum(range(200)) + 1
+
+
+def test_baseline_is_saved_and_monitor_attached(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.drift_enabled = True
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    baseline = classifier.drift_baseline
+    assert isinstance(classifier.monitor, DriftMonitor)
+    assert baseline.messages == 2 and baseline.probability_counts.sum() == 2
+    assert "the" not in baseline.vocabulary and " " not in "".join(baseline.vocabulary)
+
+    target = classifier.save()
+    restored = SpamClassifier(config=config)
+    restored.load(target)
+    assert isinstance(restored.monitor, DriftMonitor)
+    for name in ("vocabulary", "token_counts", "probability_counts", "groups"):
+        assert np.array_equal(getattr(restored.drift_baseline, name), getattr(baseline, name))
+
+    restored.predict(sample_frame["text"].tolist())
+    assert restored.monitor.messages == len(sample_frame)
+
+    classifier.drift_baseline = None
+    classifier.save()
+    assert not baseline_path(target).exists()
+
+
+def test_baseline_built_once_and_only_when_enabled(sample_frame: pd.DataFrame, tmp_path, monkeypatch):
+    fitted = []
+    original = DriftBaseline.fit
+
+    def counting_fit(*args, **kwargs):
+        fitted.append(len(args[0]))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(DriftBaseline, "fit", counting_fit)
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.quantize_dtype = "int8"
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    assert fitted == [] and classifier.drift_baseline is None
+
+    # 量化會重建詞彙表，但訓練時基準只在最終模型上以驗證集建立一次
+    config.drift_enabled = True
+    classifier.train(sample_frame)
+    assert fitted == [2]
+    pruned = set(classifier.pipeline[0].vocabulary_)
+    assert set(classifier.drift_baseline.vocabulary) <= pruned
+
+
+def test_quantize_keeps_validation_baseline(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.drift_enabled = True
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    before = classifier.drift_baseline
+
+    # 量化以完整資料集量測準確率，基準仍只含驗證集計數與訓練集分組，剪掉的詞改計為 OOV
+    classifier.quantize(pd.concat([sample_frame] * 3, ignore_index=True), dtype="int8", tolerance=0.9)
+    after = classifier.drift_baseline
+    assert after is not before and isinstance(classifier.monitor, DriftMonitor)
+    assert after.messages == before.messages
+    assert np.array_equal(after.probability_counts, before.probability_counts)
+    assert set(after.vocabulary) <= set(classifier.pipeline[0].vocabulary_)
+    assert len(after.vocabulary) < len(before.vocabulary)
+    assert after.token_counts.sum() == before.token_counts.sum()
+    kept = np.isin(before.vocabulary, after.vocabulary)
+    assert np.array_equal(after.groups[:-1], before.groups[:-1][kept])
+
+
+def test_monitor_scores_shifted_traffic(sample_frame: pd.DataFrame):
+    texts = sample_frame["text"].tolist()
+    spam_probability = np.where(sample_frame["label"] == "spam", 0.9, 0.1)
+    vocabulary = sorted({token for text in texts for token in text.lower().replace("!", " ").split() if len(token) > 1})
+    baseline = DriftBaseline.fit(texts, spam_probability, vocabulary, stop_words=("a",), bins=10)
+    probabilities = np.column_stack([1 - spam_probability, spam_probability])
+
+    REGISTRY.reset()
+    monitor = DriftMonitor(baseline=baseline, window=len(texts), top_k=3)
+    assert monitor.observe(texts[:4], probabilities[:4]) is None
+    steady = monitor.observe(texts[4:], probabilities[4:])
+    assert steady is not None and monitor.window_messages == 0
+    assert steady.probability_psi < 1e-9 and steady.feature_psi < 1e-9 and not steady.drifted
+
+    shifted = ["Crypto giveaway crypto wallet airdrop"] * len(texts)
+    report = monitor.observe(shifted, np.tile([0.5, 0.5], (len(texts), 1)))
+    assert report.drifted and report.oov_rate == 1.0
+    assert report.top_oov[0] == ("crypto", 2 * len(texts))
+    exported = REGISTRY.render_prometheus()
+    assert "spam_drift_alert 1" in exported and 'spam_drift_psi{signal="features"}' in exported
+    assert monitor.stats()["last_report"]["drifted"] is True
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn import metrics
+
+from src.spam_email.config import AppConfig
+from src.spam_email.evaluation import StreamingEvaluator, downsample_pr_curve
+from src.spam_email.metrics import MetricsReport
+from src.spam_email.model import SpamClassifier
+
+
+def _synthetic(size: int = 3000):
+    rng = np.random.default_rng(0)
+    y_true = np.where(rng.random(size) < 0.3, "spam", "ham")
+    scores = np.round(np.clip(rng.normal(0.3 + 0.4 * (y_true == "spam"), 0.2), 0, 1), 3)
+    y_pred = np.where(scores >= 0.5, "spam", "ham")
+    return y_true, y_pred, scores
+
+
+def test_report_matches_sklearn():
+    y_true, y_pred, scores = _synthetic()
+    report = MetricsReport.from_predictions(
+        pd.Series(y_true), y_pred, np.column_stack([1 - scores, scores]), ["ham", "spam"]
+    )
+
+    positive = (y_true == "spam").astype(int)
+    expected = metrics.classification_report(y_true, y_pred, output_dict=True)
+    for label in ("ham", "spam"):
+        assert np.isclose(report.precision[label], expected[label]["precision"])
+        assert np.isclose(report.recall[label], expected[label]["recall"])
+        assert np.isclose(report.f1[label], expected[label]["f1-score"])
+        assert report.support[label] == expected[label]["support"]
+    assert np.isclose(report.roc_auc, metrics.roc_auc_score(positive, scores))
+    assert (report.confusion_matrix.to_numpy() == metrics.confusion_matrix(y_true, y_pred)).all()
+
+    fpr, tpr, _ = metrics.roc_curve(positive, scores, drop_intermediate=False)
+    assert np.allclose(report.roc_curve[0], fpr) and np.allclose(report.roc_curve[1], tpr)
+    precision, recall, thresholds = metrics.precision_recall_curve(positive, scores)
+    assert np.allclose(report.pr_curve[0], recall)
+    assert np.allclose(report.pr_curve[1], precision)
+    assert np.allclose(report.pr_curve[2], thresholds)
+
+
+def test_chunked_histogram_and_downsampling():
+    y_true, y_pred, scores = _synthetic()
+    exact = StreamingEvaluator(labels=["ham", "spam"])
+    binned = StreamingEvaluator(labels=["ham", "spam"], curve_points=50, histogram_bins=2000)
+    for start in range(0, len(y_true), 700):
+        part = slice(start, start + 700)
+        exact.update(y_true[part], y_pred[part], scores[part])
+        binned.update(y_true[part], y_pred[part], scores[part])
+
+    full, approx = exact.finalize(), binned.finalize()
+    assert np.isclose(full.roc_auc, metrics.roc_auc_score(y_true == "spam", scores))
+    assert abs(approx.roc_auc - full.roc_auc) < 1e-3
+    assert len(approx.roc_curve[0]) <= 50 and len(approx.pr_curve[0]) <= 50
+    assert approx.roc_curve[0][-1] == 1.0 and approx.roc_curve[1][-1] == 1.0
+    assert (approx.confusion_matrix.to_numpy() == full.confusion_matrix.to_numpy()).all()
+
+
+@pytest.mark.parametrize("max_points", [3, 7, 40])
+def test_downsampled_pr_thresholds_stay_aligned(max_points):
+    y_true, y_pred, scores = _synthetic()
+    positive = (y_true == "spam").astype(int)
+    precision, recall, thresholds = metrics.precision_recall_curve(positive, scores)
+    report = MetricsReport.from_predictions(
+        pd.Series(y_true), y_pred, np.column_stack([1 - scores, scores]), ["ham", "spam"], curve_points=max_points
+    )
+
+    recall_ds, precision_ds, thresholds_ds = report.pr_curve
+    assert len(recall_ds) == len(precision_ds) == len(thresholds_ds) + 1 <= max_points
+    assert recall_ds[-1] == 0.0 and precision_ds[-1] == 1.0
+    # 每個降採樣後的門檻仍對應 scikit-learn 在同一門檻下的 precision / recall
+    index = np.searchsorted(thresholds, thresholds_ds)
+    assert np.allclose(thresholds[index], thresholds_ds)
+    assert np.allclose(precision[index], precision_ds[:-1])
+    assert np.allclose(recall[index], recall_ds[:-1])
+    again = downsample_pr_curve(*report.pr_curve, max_points=max_points)
+    assert all(np.array_equal(a, b) for a, b in zip(again, report.pr_curve))
+
+
+def test_evaluate_chunks_matches_full_evaluation(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    full = classifier.evaluate(sample_frame)
+    chunked = classifier.evaluate_chunks(
+        sample_frame.iloc[idx : idx + 3] for idx in range(0, len(sample_frame), 3)
+    )
+    assert np.isclose(full.roc_auc, chunked.roc_auc)
+    assert full.f1 == chunked.f1
+
+
+def test_snapshot_round_trip_and_keys(tmp_path):
+    y_true, y_pred, scores = _synthetic()
+    report = MetricsReport.from_predictions(
+        pd.Series(y_true), y_pred, np.column_stack([1 - scores, scores]), ["ham", "spam"]
+    )
+    path = report.save_snapshot(tmp_path / "report.npz", max_points=50, model_version="m1", data_hash="d1")
+
+    loaded = MetricsReport.load_snapshot(path, model_version="m1", data_hash="d1")
+    assert loaded is not None
+    assert loaded.summary() == report.summary()
+    assert len(loaded.roc_curve[0]) <= 50
+    assert loaded.confusion_matrix.equals(report.confusion_matrix)
+    assert MetricsReport.load_snapshot(path, model_version="m2", data_hash="d1") is None
+    assert MetricsReport.load_snapshot(path, model_version="m1", data_hash=None) is None
+    assert MetricsReport.load_snapshot(tmp_path / "missing.npz") is None
+
+
+def test_saved_model_reuses_evaluation_snapshot(sample_frame: pd.DataFrame, tmp_path, monkeypatch):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    trained = SpamClassifier(config=config)
+    trained.train(sample_frame)
+    trained.save()
+
+    classifier = SpamClassifier(config=config)
+    classifier.load()
+    first = classifier.evaluate_cached(sample_frame)
+    # 訓練時寫入的驗證集快照與模型、資料版本相符，直接沿用
+    assert first.summary() == trained.report.summary()
+
+    def fail(self, frame):
+        raise AssertionError("快照相符時不應重新評估")
+
+    monkeypatch.setattr(SpamClassifier, "evaluate", fail)
+    reloaded = SpamClassifier(config=config)
+    reloaded.load()
+    assert reloaded.evaluate_cached(sample_frame).summary() == first.summary()
+
+    changed = sample_frame.iloc[::-1].reset_index(drop=True)
+    monkeypatch.undo()
+    assert reloaded.evaluate_cached(changed).roc_auc == pytest.approx(reloaded.evaluate(sample_frame).roc_auc)
+    assert reloaded.data_hash != trained.data_hash
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+
+
+def test_explain_matches_dense_contributions(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    texts = ["Win a free prize now", "See you at lunch tomorrow", ""]
+
+    explanations = classifier.explain(texts, top_k=3)
+    labels, probs = classifier.predict(texts)
+    assert [item.label for item in explanations] == list(labels)
+    assert np.allclose([item.spam_probability for item in explanations], probs[:, 1])
+
+    vectorizer, clf = classifier.pipeline[0], classifier.pipeline[-1]
+    dense = vectorizer.transform(texts[:1]).toarray()[0] * clf.coef_[0]
+    expected = np.argsort(-np.abs(dense))[: np.count_nonzero(dense)][:3]
+    names = vectorizer.get_feature_names_out()
+    assert [term for term, _ in explanations[0].contributions] == [names[idx] for idx in expected]
+    assert np.allclose([weight for _, weight in explanations[0].contributions], dense[expected])
+    assert explanations[2].contributions == []
+    assert classifier.linear_explainer.weight(names[expected[0]]) == clf.coef_[0][expected[0]]
+
+
+def test_explain_names_hashed_features(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"), feature_engine="hashing")
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    result = classifier.explain(["free prize"], top_k=5)[0]
+    assert result.contributions
+    assert all(term.startswith("hash:") for term, _ in result.contributions)
+
+
+def test_explain_follows_cascade_and_campaign_routing(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.cascade_enabled, config.cascade_low, config.cascade_high = True, 0.3, 0.7
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    texts = sample_frame["text"].tolist() + ["WIN a brand new car by clicking here!!! now"]
+
+    labels, probs = classifier.predict(texts)
+    explanations = classifier.explain(texts)
+    assert classifier.cascade.stats.early_exit_rate > 0
+    assert [item.label for item in explanations] == list(labels)
+    assert np.allclose([item.spam_probability for item in explanations], probs[:, 1])
+
+    config.dedupe_enabled = True
+    deduped = SpamClassifier(config=config, pipeline=classifier.pipeline, cascade=classifier.cascade)
+    labels, probs = deduped.predict(texts)
+    explanations = deduped.explain(texts)
+    assert [item.label for item in explanations] == list(labels)
+    assert np.allclose([item.spam_probability for item in explanations], probs[:, 1])
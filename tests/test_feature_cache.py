@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.spam_email.config import AppConfig
+from src.spam_email.feature_cache import FeatureCache
+from src.spam_email.model import SpamClassifier
+
+
+def test_training_and_evaluation_reuse_cached_features(sample_frame: pd.DataFrame, tmp_path, monkeypatch):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"), cache_dir=str(tmp_path / "cache"))
+    config.feature_cache_enabled = True
+    calls = []
+
+    def counting(name, method):
+        def wrapper(self, *args, **kwargs):
+            calls.append(name)
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(TfidfVectorizer, "fit_transform", counting("fit", TfidfVectorizer.fit_transform))
+    monkeypatch.setattr(TfidfVectorizer, "transform", counting("transform", TfidfVectorizer.transform))
+
+    _, first = SpamClassifier(config=config).train(sample_frame)
+    assert calls == ["fit", "transform"]
+    _, second = SpamClassifier(config=config).train(sample_frame)
+    assert calls == ["fit", "transform"]
+    assert first.roc_auc == second.roc_auc
+
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    classifier.save()
+    classifier.load()
+    calls.clear()
+    report = classifier.evaluate(sample_frame)
+    assert classifier.evaluate(sample_frame).roc_auc == report.roc_auc
+    assert calls == ["transform"]
+
+
+def test_feature_cache_evicts_oldest_entries(tmp_path):
+    cache = FeatureCache(directory=tmp_path, max_bytes=1)
+    matrix = sparse.random(5, 5, density=0.5, format="csr", random_state=0)
+    cache.put("a", {"matrix": matrix})
+    assert cache.get("a") is None
+
+    cache = FeatureCache(directory=tmp_path)
+    cache.put("b", {"matrix": matrix})
+    assert np.allclose(cache.get("b")["matrix"].toarray(), matrix.toarray())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import logging
+
+import pandas as pd
+
+from src.spam_email.config import AppConfig
+from src.spam_email.instrumentation import REGISTRY, MetricsRegistry, configure_json_logging, logger
+from src.spam_email.model import SpamClassifier
+from src.spam_email.server import InferenceServer
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.inc("predictions", 3)
+    registry.set_gauge("model_load_seconds", 0.25)
+    with registry.timer("vectorize"):
+        pass
+    registry.observe("stage_seconds", 2.0, stage="vectorize")
+
+    text = registry.render_prometheus()
+    assert "# TYPE spam_predictions_total counter" in text
+    assert "spam_predictions_total 3" in text
+    assert "spam_model_load_seconds 0.25" in text
+    assert 'spam_stage_seconds_bucket{stage="vectorize",le="+Inf"} 2' in text
+    assert 'spam_stage_seconds_bucket{stage="vectorize",le="1"} 1' in text
+    assert 'spam_stage_seconds_count{stage="vectorize"} 2' in text
+
+
+def test_predict_records_stage_timings_and_json_logs(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.prediction_cache_size = 16
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    classifier.save()
+    classifier.load()
+
+    stream = io.StringIO()
+    handler = configure_json_logging(stream=stream)
+    REGISTRY.reset()
+    try:
+        classifier.predict(["free prize", "free prize", "lunch?"])
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+
+    snapshot = REGISTRY.snapshot()
+    assert snapshot["counters"]["predictions"][0]["value"] == 3
+    assert snapshot["counters"]["prediction_cache_hits"][0]["value"] == 1
+    stages = {item["labels"]["stage"] for item in snapshot["histograms"]["stage_seconds"]}
+    assert {"predict", "vectorize", "classify"} <= stages
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert {"predict", "vectorize", "classify"} <= {event["stage"] for event in events}
+
+
+def test_server_exposes_metrics_endpoint(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    async def scenario() -> bytes:
+        server = InferenceServer(classifier=classifier, port=0)
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+            return raw
+        finally:
+            await server.stop()
+
+    head, _, body = asyncio.run(scenario()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert b"text/plain" in head
+    assert b"spam_stage_seconds_bucket" in body
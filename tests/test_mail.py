@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from email.message import EmailMessage
+from pathlib import Path
+
+import pandas as pd
+
+from src.spam_email.batch import predict_file
+from src.spam_email.config import AppConfig
+from src.spam_email.mail import MailIngestor, count_messages, iter_mbox, iter_raw_messages, parse_message
+from src.spam_email.model import SpamClassifier
+
+
+def _message(subject: str, body: str, html: str | None = None, sender: str = "Promo <deals@shop.example>") -> bytes:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = sender
+    message["Message-ID"] = f"<{abs(hash(subject))}@example>"
+    message.set_content(body)
+    if html is not None:
+        message.add_alternative(html, subtype="html")
+    return bytes(message)
+
+
+def _mailboxes(root: Path, frame: pd.DataFrame) -> Path:
+    # 同一份語料分散為 mbox、Maildir 與 .eml 三種格式
+    rows = list(frame.itertuples(index=False))
+    raw = [_message(f"Message {idx}", row.text) for idx, row in enumerate(rows)]
+    root.mkdir()
+    (root / "archive.mbox").write_bytes(
+        b"".join(b"From sender@example Thu Jan  1 00:00:00 2025\n" + item + b"\n" for item in raw[:2])
+    )
+    for folder in ("cur", "new", "tmp"):
+        (root / "Maildir" / folder).mkdir(parents=True)
+    (root / "Maildir" / "cur" / "1:2,S").write_bytes(raw[2])
+    (root / "Maildir" / "new" / "2").write_bytes(raw[3])
+    (root / "Maildir" / "tmp" / "partial").write_bytes(b"Subject: half")
+    for idx, item in enumerate(raw[4:], start=4):
+        (root / f"{idx}.eml").write_bytes(item)
+    (root / "notes.txt").write_text("not an email")
+    return root
+
+
+def test_parse_message_decodes_mime_and_strips_html():
+    message = EmailMessage()
+    message["Subject"] = "Gewinnen Sie jetzt – 100 % gratis"
+    message["From"] = "Müller <win@prize.example>"
+    message.set_content("<p>ignored because HTML only</p>", subtype="html")
+    message.add_attachment(b"%PDF secret attachment text", maintype="application", subtype="pdf", filename="a.pdf")
+    html_only = EmailMessage()
+    html_only["Subject"] = "=?iso-8859-1?q?Caf=E9_offer?="
+    html_only.set_content(
+        "<html><head><title>x</title><style>p {color: red}</style></head>"
+        "<body><p>Claim&nbsp;your <b>free</b> prize &amp; more</p><script>track()</script></body></html>",
+        subtype="html",
+        charset="iso-8859-1",
+    )
+
+    parsed = parse_message("a", bytes(message), include_sender=True)
+    assert parsed.subject == "Gewinnen Sie jetzt – 100 % gratis"
+    assert parsed.sender == "Müller <win@prize.example>"
+    assert parsed.text.splitlines() == [parsed.subject, parsed.sender, "ignored because HTML only"]
+
+    parsed = parse_message("b", bytes(html_only), include_subject=False)
+    assert parsed.subject == "Café offer"
+    assert parsed.text == "Claim your free prize & more"
+
+    latin = "Subject: Prix\nContent-Type: text/plain; charset=iso-8859-1\n\nR\xe9duction imm\xe9diate".encode("latin-1")
+    assert parse_message("c", latin).text == "Prix\nRéduction immédiate"
+    alternative = _message("Alt", "plain wins", html="<p>html loses</p>")
+    assert parse_message("d", alternative, include_subject=False).text == "plain wins"
+
+
+def test_ingestor_reads_mbox_maildir_and_eml(sample_frame: pd.DataFrame, tmp_path):
+    root = _mailboxes(tmp_path / "mail", sample_frame)
+    sources = [source for source, _ in iter_raw_messages(root)]
+    assert len(sources) == len(sample_frame)
+    assert sum("archive.mbox#" in source for source in sources) == 2
+    assert not any("Maildir/tmp" in source or "notes" in source for source in sources)
+
+    serial = MailIngestor(n_jobs=1).load(root)
+    chunks = list(MailIngestor(n_jobs=2, batch_size=2).iter_chunks(root, chunk_size=3, label="spam"))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    parallel = pd.concat(chunks, ignore_index=True)
+    assert (parallel["label"] == "spam").all()
+    assert parallel["source"].tolist() == serial["source"].tolist() == sources
+    assert parallel["text"].tolist() == serial["text"].tolist()
+    assert set(serial["text"].str.split("\n").str[1]) == set(sample_frame["text"])
+
+
+def test_train_and_predict_from_mailbox(sample_frame: pd.DataFrame, tmp_path):
+    ingestor = MailIngestor(n_jobs=1)
+    frames = []
+    for label in ("ham", "spam"):
+        root = _mailboxes(tmp_path / label, sample_frame[sample_frame["label"] == label])
+        frames.append(ingestor.load(root, label=label))
+    classifier = SpamClassifier(config=AppConfig.from_env(model_path=str(tmp_path / "model.joblib")))
+    classifier.train(pd.concat(frames, ignore_index=True))
+
+    output = tmp_path / "scored.csv"
+    assert predict_file(classifier, tmp_path / "spam", output) == 4
+    scored = pd.read_csv(output)
+    assert {"predicted_label", "spam_probability", "subject", "sender", "message_id"} <= set(scored.columns)
+    assert scored["sender"].str.contains("deals@shop.example").all()
+
+
+def test_labelled_chunks_interleave_sources_in_proportion(sample_frame: pd.DataFrame, tmp_path):
+    sources = [
+        ("ham", _mailboxes(tmp_path / "ham", sample_frame)),
+        ("spam", _mailboxes(tmp_path / "spam", sample_frame.iloc[:4])),
+    ]
+    assert [count_messages(path) for _, path in sources] == [8, 4]
+    ingestor = MailIngestor(n_jobs=2, batch_size=2)
+
+    chunks = list(ingestor.iter_labelled_chunks(sources, chunk_size=3, random_state=0))
+    # 依 2:1 的比例取信，直到最後一塊都同時含有兩種標籤
+    assert [chunk["label"].value_counts().to_dict() for chunk in chunks] == [{"ham": 2, "spam": 1}] * 4
+    again = list(ingestor.iter_labelled_chunks(sources, chunk_size=3, random_state=0))
+    assert all(chunk["source"].tolist() == other["source"].tolist() for chunk, other in zip(chunks, again))
+
+
+def test_mbox_ignores_unquoted_body_from_lines_and_unescapes_mboxrd(tmp_path):
+    path = tmp_path / "archive.mbox"
+    path.write_bytes(
+        b"From a@example Thu Jan  1 00:00:00 2025\n"
+        b"Subject: first\n\n"
+        b"Quoted below:\n"
+        b"From the desk of the CEO\n"
+        b">From here on\n"
+        b">>From deeper\n"
+        b"\n"
+        b"From b@example Thu Jan  1 00:00:01 2025\n"
+        b"Subject: second\n\nbody\n"
+    )
+    first, second = iter_mbox(path)
+    assert b"From the desk of the CEO\nFrom here on\n>From deeper\n" in first
+    assert second.startswith(b"Subject: second")
@@ -1,25 +1,12 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import pytest
 from src.spam_email.config import AppConfig
+from src.spam_email.data import DatasetLoader
 from src.spam_email.model import SpamClassifier
-
-
-@pytest.fixture()
-def sample_frame() -> pd.DataFrame:
-    return pd.DataFrame(
-        [
-            {"label": "ham", "text": "Hi there, let's catch up tomorrow."},
-            {"label": "spam", "text": "WIN a brand new car by clicking here!!!"},
-            {"label": "ham", "text": "Reminder: project meeting at 2pm."},
-            {"label": "spam", "text": "Exclusive offer!!! Limited time deal."},
-            {"label": "ham", "text": "Lunch plans for next week?"},
-            {"label": "spam", "text": "Get rich quick by subscribing now!!!"},
-            {"label": "ham", "text": "Team standup moved to 10am."},
-            {"label": "spam", "text": "Mega discount newsletter just for you."},
-        ]
-    )
+from src.spam_email.threshold import OperatingPoint
 
 
 def test_training_and_prediction(sample_frame: pd.DataFrame, tmp_path):
@@ -43,3 +30,122 @@ def test_training_and_prediction(sample_frame: pd.DataFrame, tmp_path):
 
     assert labels.shape == (1,)
     assert probs.shape == (1, 2)
+
+
+def test_predict_matches_pipeline_outputs(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    pipeline, _ = classifier.train(sample_frame)
+
+    texts = sample_frame["text"].tolist()
+    labels, probs = classifier.predict(texts)
+
+    assert (labels == pipeline.predict(texts)).all()
+    assert np.allclose(probs, pipeline.predict_proba(texts))
+
+
+def test_parallel_predict_preserves_order(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    classifier.save()
+
+    texts = sample_frame["text"].tolist() * 50
+    labels, probs = classifier.predict(texts)
+    with classifier.parallel_predictor(n_jobs=2) as predictor:
+        predictor.min_shard_size = 16
+        parallel_labels, parallel_probs = predictor.predict(texts)
+
+    assert (parallel_labels == labels).all()
+    assert np.allclose(parallel_probs, probs)
+
+
+def test_parallel_predict_keeps_caller_state_and_cache(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"), cache_dir=str(tmp_path / "cache"))
+    config.prediction_cache_size = 100
+    config.drift_enabled = True
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    version = classifier.model_version
+
+    texts = sample_frame["text"].tolist() * 50
+    labels, probs = classifier.predict_parallel(texts, n_jobs=2)
+    # 未存檔的模型只寫入暫存目錄，呼叫端的檔案與版本不變，暫存目錄於結束後刪除
+    assert classifier.model_file is None and classifier.model_version == version
+    assert not list((tmp_path / "cache").glob("parallel-*"))
+    # 快取與漂移監控仍在主程序套用
+    assert classifier.cache.hits == len(texts) - len(set(texts))
+    assert classifier.monitor.messages == len(texts)
+    expected_labels, expected_probs = classifier.predict(texts)
+    assert (labels == expected_labels).all() and np.allclose(probs, expected_probs)
+
+
+def test_hashing_engine_has_no_vocabulary(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"), feature_engine="hashing")
+    classifier = SpamClassifier(config=config)
+    pipeline, _ = classifier.train(sample_frame)
+
+    assert not hasattr(pipeline.named_steps["vectorize"], "vocabulary_")
+    classifier.save()
+    classifier.load()
+    labels, probs = classifier.predict(["Exclusive deal, subscribe now!!!"])
+    assert labels.shape == (1,)
+    assert probs.shape == (1, 2)
+
+
+def test_incremental_training_and_update(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    data_path = tmp_path / "data.csv"
+    sample_frame.to_csv(data_path, index=False, header=False)
+
+    loader = DatasetLoader(config=config)
+    classifier = SpamClassifier(config=config)
+    _, report = classifier.train_incremental(loader.iter_chunks(data_path, chunk_size=4))
+    assert classifier.supports_incremental
+    assert report is not None and sum(report.support.values()) == 4
+
+    classifier.save()
+    reloaded = SpamClassifier(config=config)
+    reloaded.load()
+    before = reloaded.pipeline[-1].coef_.copy()
+    reloaded.operating_point = OperatingPoint(threshold=0.9, strategy="f1")
+    reloaded.update(sample_frame.iloc[:2])
+    assert not np.allclose(before, reloaded.pipeline[-1].coef_)
+    # 更新後分數分布已改變，舊的操作點與漂移基準不可沿用
+    assert reloaded.operating_point is None and reloaded.drift_baseline is None
+    assert list(reloaded.pipeline[-1].classes_) == ["ham", "spam"]
+
+    labels, probs = reloaded.predict(["Mega discount, subscribe now!!!"])
+    assert labels.shape == (1,)
+    assert probs.shape == (1, 2)
+
+
+def test_update_rejects_vocabulary_models(sample_frame: pd.DataFrame, tmp_path):
+    classifier = SpamClassifier(config=AppConfig.from_env(model_path=str(tmp_path / "model.joblib")))
+    classifier.train(sample_frame)
+    with pytest.raises(RuntimeError):
+        classifier.update(sample_frame)
+
+
+def test_load_reads_version_from_metadata(sample_frame: pd.DataFrame, tmp_path, monkeypatch):
+    from src.spam_email import model as model_module
+
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    trained = SpamClassifier(config=config)
+    trained.train(sample_frame)
+    target = trained.save()
+    file_version = model_module._file_version
+
+    def fail(path):
+        raise AssertionError("中繼資料記錄的版本相符時不應重新雜湊模型檔")
+
+    monkeypatch.setattr(model_module, "_file_version", fail)
+    reloaded = SpamClassifier(config=config)
+    reloaded.load()
+    assert reloaded.model_version == trained.model_version
+
+    # 模型檔被直接替換時，大小或修改時間不符，改為重新雜湊
+    monkeypatch.setattr(model_module, "_file_version", file_version)
+    target.write_bytes(target.read_bytes() + b"\0")
+    reloaded.load()
+    assert reloaded.model_version == file_version(target) != trained.model_version
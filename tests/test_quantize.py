@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.spam_email.artifact import CompactPredictor
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.quantize import QuantizedLinearModel, compact_pipeline, compaction_report
+
+
+def _trained(sample_frame: pd.DataFrame, tmp_path, **overrides) -> SpamClassifier:
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"), **overrides)
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    return classifier
+
+
+def test_compact_pipeline_prunes_vocabulary(sample_frame: pd.DataFrame, tmp_path):
+    # 重複出現的郵件讓係數大小拉開差距
+    frame = pd.concat([sample_frame, sample_frame.iloc[:2], sample_frame.iloc[:2]], ignore_index=True)
+    pipeline = _trained(frame, tmp_path).pipeline
+    coef = pipeline[-1].coef_[0]
+    tolerance = 0.5
+    compact = compact_pipeline(pipeline, "float32", tolerance)
+
+    kept = np.abs(coef) >= tolerance * np.abs(coef).max()
+    assert len(compact[0].vocabulary_) == kept.sum() < len(pipeline[0].vocabulary_)
+    assert compact[0].idf_.dtype == np.float32
+    assert len(pipeline[0].vocabulary_) == len(coef)  # 原管線不受影響
+
+    report = compaction_report(pipeline, compact, "float32", tolerance)
+    assert report.features_after == kept.sum()
+    assert report.bytes_saved > 0 and report.pickled_after < report.pickled_before
+
+    with pytest.raises(ValueError):
+        compact_pipeline(pipeline, "int4")
+
+
+def test_int8_weights_track_original_probabilities(sample_frame: pd.DataFrame, tmp_path):
+    clf = _trained(sample_frame, tmp_path).pipeline[-1]
+    quantized = QuantizedLinearModel.from_linear(clf, "int8")
+
+    assert quantized.weights.dtype == np.int8
+    assert np.abs(quantized.weights).max() == 127
+    assert quantized.scale == pytest.approx(np.abs(clf.coef_).max() / 127)
+
+    features = np.random.default_rng(0).random((5, clf.coef_.shape[1]))
+    assert np.allclose(quantized.predict_proba(features), clf.predict_proba(features), atol=0.01)
+    assert list(quantized.predict(features)) == list(clf.predict(features))
+
+
+@pytest.mark.parametrize("engine", ["tfidf", "hashing"])
+def test_quantized_model_round_trip(sample_frame: pd.DataFrame, tmp_path, engine: str):
+    classifier = _trained(sample_frame, tmp_path, feature_engine=engine)
+    expected, _ = classifier.predict(sample_frame["text"].tolist())
+    report = classifier.quantize(sample_frame, dtype="int8", tolerance=0.0)
+
+    assert report.accuracy_delta == 0.0
+    assert isinstance(classifier.pipeline[-1], QuantizedLinearModel)
+    target = classifier.save(tmp_path / "model.int8.joblib")
+    assert isinstance(joblib.load(target)[-1], QuantizedLinearModel)
+
+    restored = SpamClassifier(config=classifier.config)
+    restored.load(target)
+    labels, _ = restored.predict(sample_frame["text"].tolist())
+    assert list(labels) == list(expected)
+    assert restored.explain(["WIN a brand new car"], top_k=3)[0].contributions
+
+
+def test_train_with_float32_features_and_quantization(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.feature_dtype = "float32"
+    config.quantize_dtype = "float16"
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+
+    assert classifier.compaction is not None and classifier.compaction.dtype == "float16"
+    assert classifier.pipeline[-1].weights.dtype == np.float16
+    assert classifier._vectorize(sample_frame["text"]).dtype == np.float32
+
+    predictor = CompactPredictor.load(classifier.export_compact(tmp_path / "model.compact"))
+    texts = sample_frame["text"].tolist()
+    assert list(predictor.predict(texts)[0]) == list(classifier.predict(texts)[0])
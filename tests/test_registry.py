@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.registry import ModelRegistry, RegistryWatcher
+from src.spam_email.server import InferenceServer
+
+
+def _train(sample_frame: pd.DataFrame, tmp_path, **overrides) -> SpamClassifier:
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    return classifier
+
+
+def test_register_promote_and_rollback(sample_frame: pd.DataFrame, tmp_path):
+    registry = ModelRegistry(root=tmp_path / "registry", keep=2)
+    first = _train(sample_frame, tmp_path)
+    _, report = first.train(sample_frame)
+    v1 = registry.register(first, report, data_hash="abc", promote=True)
+    assert registry.current_version() == v1.version
+    assert v1.model_file.exists()
+    assert v1.manifest["data_hash"] == "abc"
+    assert v1.manifest["metrics"]["roc_auc"] == pytest.approx(report.roc_auc)
+
+    second = _train(sample_frame, tmp_path)
+    v2 = registry.register(second)
+    assert registry.current_version() == v1.version
+    registry.promote(v2.version)
+    assert registry.current_version() == v2.version
+
+    assert registry.rollback().version == v1.version
+    assert registry.current_version() == v1.version
+    with pytest.raises(RuntimeError):
+        registry.rollback()
+
+    loaded = registry.load(first.config)
+    texts = sample_frame["text"].tolist()
+    assert list(loaded.predict(texts)[0]) == list(first.predict(texts)[0])
+
+
+def test_prune_keeps_current_version(sample_frame: pd.DataFrame, tmp_path):
+    registry = ModelRegistry(root=tmp_path / "registry", keep=1)
+    classifier = _train(sample_frame, tmp_path)
+    kept = registry.register(classifier, promote=True)
+    for _ in range(2):
+        registry.register(classifier)
+    versions = [item.version for item in registry.versions()]
+    assert kept.version in versions
+    assert len(versions) == 2
+    assert not list(registry.versions_dir.glob(".tmp-*"))
+
+
+def test_watcher_swaps_server_model(sample_frame: pd.DataFrame, tmp_path):
+    registry = ModelRegistry(root=tmp_path / "registry")
+    first = _train(sample_frame, tmp_path)
+    v1 = registry.register(first, promote=True)
+    server = InferenceServer(classifier=first, port=0)
+
+    watcher = RegistryWatcher(registry=registry, config=first.config, on_swap=server.swap, loaded_version=v1.version)
+    assert not watcher.poll()
+
+    second = _train(sample_frame, tmp_path)
+    v2 = registry.register(second, promote=True)
+    assert watcher.poll()
+    assert watcher.loaded_version == v2.version
+    assert server.classifier is not first
+    assert server.classifier.model_file == v2.model_file
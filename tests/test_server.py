@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pandas as pd
+
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.server import InferenceServer
+
+
+async def _request(port: int, payload: dict, length: int | None = None) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        b"POST /predict HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        + f"Content-Length: {len(body) if length is None else length}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, content = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+async def _raw(port: int, data: bytes) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, content = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+async def _post(port: int, payload: dict) -> dict:
+    status, content = await _request(port, payload)
+    assert status == 200
+    return content
+
+
+def test_server_batches_concurrent_requests(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    texts = sample_frame["text"].tolist()
+    expected_labels, expected_probs = classifier.predict(texts)
+
+    async def scenario():
+        server = InferenceServer(classifier=classifier, port=0, max_batch_size=4, max_wait_ms=20)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            single = await asyncio.gather(*(_post(port, {"text": text}) for text in texts))
+            multi = await _post(port, {"texts": texts})
+        finally:
+            await server.stop()
+        return single, multi
+
+    single, multi = asyncio.run(scenario())
+
+    assert [item["label"] for item in single] == list(expected_labels)
+    assert [item["spam_probability"] for item in multi["results"]] == list(expected_probs[:, 1])
+
+
+def test_server_rejects_large_bodies_and_reports_failures(sample_frame: pd.DataFrame, tmp_path):
+    classifier = SpamClassifier(config=AppConfig.from_env(model_path=str(tmp_path / "model.joblib")))
+    classifier.train(sample_frame)
+
+    async def scenario():
+        server = InferenceServer(classifier=classifier, port=0, max_body_bytes=64)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            too_large = await _request(port, {"text": "x"}, length=65)
+            # 超過 StreamReader 單行上限（預設 64 KiB）的標頭與請求列
+            long_header = await _raw(port, b"POST /predict HTTP/1.1\r\nX-Pad: " + b"a" * 70_000 + b"\r\n\r\n")
+            long_target = await _raw(port, b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n")
+            server.swap(SpamClassifier(config=classifier.config))
+            failed = await _request(port, {"text": "win a prize"})
+        finally:
+            await server.stop()
+        return too_large, long_header, long_target, failed
+
+    (large_status, large_body), long_header, long_target, (failed_status, failed_body) = asyncio.run(scenario())
+    assert large_status == 413 and "64" in large_body["error"]
+    assert long_header[0] == 431 and long_target[0] == 414
+    assert failed_status == 500 and "尚未訓練" in failed_body["error"]
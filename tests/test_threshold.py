@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.spam_email.artifact import CompactPredictor
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.threshold import select_operating_point
+
+
+def _scores(size: int = 2000):
+    rng = np.random.default_rng(1)
+    positive = rng.random(size) < 0.3
+    scores = np.clip(rng.normal(0.35 + 0.3 * positive, 0.15), 0, 1)
+    return positive, scores
+
+
+def test_fpr_strategy_respects_target_and_maximizes_recall():
+    positive, scores = _scores()
+    point = select_operating_point(positive, scores, strategy="fpr", target_fpr=0.02)
+
+    assert point.fpr <= 0.02
+    lower = scores[scores < point.threshold].max()
+    assert ((scores >= lower) & ~positive).sum() / (~positive).sum() > 0.02
+
+
+def test_f1_strategy_matches_brute_force():
+    positive, scores = _scores()
+    point = select_operating_point(positive, scores, strategy="f1")
+
+    def f1(threshold):
+        flagged = scores >= threshold
+        tp = (flagged & positive).sum()
+        return 2 * tp / (flagged.sum() + positive.sum())
+
+    assert np.isclose(f1(point.threshold), max(f1(value) for value in np.unique(scores)))
+
+
+def test_threshold_persists_and_applies(sample_frame: pd.DataFrame, tmp_path):
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.test_size = 0.5
+    config.decision_strategy = "f1"
+    config.calibrate_probabilities = True
+    classifier = SpamClassifier(config=config)
+    classifier.train(sample_frame)
+    classifier.save()
+    assert (tmp_path / "model.joblib.meta.json").exists()
+
+    loaded = SpamClassifier(config=config)
+    loaded.load()
+    point = loaded.operating_point
+    assert point is not None and point.calibration is not None
+
+    texts = sample_frame["text"].tolist()
+    labels, probs = loaded.predict(texts)
+    assert list(labels) == list(np.where(probs[:, 1] >= point.threshold, "spam", "ham"))
+
+    compact = CompactPredictor.load(loaded.export_compact(tmp_path / "compact"))
+    compact_labels, compact_probs = compact.predict(texts)
+    assert list(compact_labels) == list(labels)
+    assert np.allclose(compact_probs, probs, atol=1e-6)
+
+    config.decision_strategy = "argmax"
+    config.calibrate_probabilities = False
+    retrained = SpamClassifier(config=config)
+    retrained.train(sample_frame)
+    retrained.save()
+    loaded.load()
+    assert loaded.operating_point is None
+
+
+def test_operating_point_uses_separate_calibration_split(sample_frame: pd.DataFrame, tmp_path, monkeypatch):
+    frame = pd.concat([sample_frame] * 5, ignore_index=True)
+    config = AppConfig.from_env(model_path=str(tmp_path / "model.joblib"))
+    config.decision_strategy = "f1"
+    seen = {}
+    original = SpamClassifier._select_operating_point
+
+    def capture(self, y_true, probabilities):
+        seen["index"] = set(y_true.index)
+        return original(self, y_true, probabilities)
+
+    monkeypatch.setattr(SpamClassifier, "_select_operating_point", capture)
+    SpamClassifier(config=config).train(frame)
+
+    _, holdout = train_test_split(
+        frame, test_size=config.test_size, random_state=config.random_state, stratify=frame["label"]
+    )
+    # 門檻在訓練集切出的校正集上選擇，與回報指標的驗證集不重疊
+    assert len(seen["index"]) == int(np.ceil(config.calibration_size * (len(frame) - len(holdout))))
+    assert not seen["index"] & set(holdout.index)
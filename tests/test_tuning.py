@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.spam_email.config import AppConfig
+from src.spam_email.model import SpamClassifier
+from src.spam_email.tuning import tune
+
+
+def test_tune_vectorizes_once_per_feature_group(sample_frame: pd.DataFrame, monkeypatch):
+    config = AppConfig()
+    calls = []
+    original = TfidfVectorizer.fit_transform
+
+    def counting_fit_transform(self, *args, **kwargs):
+        calls.append(self.ngram_range)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(TfidfVectorizer, "fit_transform", counting_fit_transform)
+
+    grid = {
+        "vectorize__ngram_range": [[1, 1], [1, 2]],
+        "clf__C": [0.5, 1.0, 2.0],
+    }
+    result = tune(sample_frame, config, grid, folds=2, scoring="accuracy", n_jobs=1)
+
+    assert len(result.candidates) == 6
+    assert len(calls) == 4  # 2 組特徵參數 x 2 folds
+    assert all(len(candidate.scores) == 2 for candidate in result.candidates)
+    assert result.best.mean_score == max(candidate.mean_score for candidate in result.candidates)
+    assert result.best.params["vectorize__ngram_range"] in {(1, 1), (1, 2)}
+    assert all(candidate.vectorize_seconds > 0 for candidate in result.candidates)
+
+    config.pipeline_params = dict(result.best.params)
+    pipeline = SpamClassifier(config=config).build_pipeline()
+    assert pipeline.get_params()["clf__C"] == result.best.params["clf__C"]